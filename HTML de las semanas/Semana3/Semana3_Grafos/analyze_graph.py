@@ -4,50 +4,336 @@ Análisis de Grafos - Semana 3
 Carga y analiza grafos desde archivos generados por C#
 """
 
+from array import array
+from bisect import bisect_left
 from collections import defaultdict
-from typing import Dict, List, Tuple
+import heapq
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 import os
 
-def load_graph(file_path: str, is_directed: bool = True) -> Dict[str, List[Tuple[str, float]]]:
+from components import structure_summary
+from csr_graph import CSRBuilder, CSRGraph, UndirectedCSRGraph
+from graph_cache import load_cached_graph
+from graph_report import ReportWriter, TextReportWriter, open_report, page_bounds
+from instrumentation import count, phase, timed_phase
+from matrix_graph import MATRIX_MEMORY_RATIO, MatrixGraph, matrix_fits
+
+# Cualquier grafo que se comporte como la lista de adyacencia (dict o CSRGraph)
+Graph = Mapping[str, Sequence[Tuple[str, float]]]
+
+# Categorías de diagnóstico del parser
+MISSING_VERTICES = "missing_vertices"
+BAD_WEIGHT = "bad_weight"
+DUPLICATE = "duplicate"
+SELF_LOOP = "self_loop"
+MISSING_EDGE = "missing_edge"
+PROBLEM_NAMES = {
+    MISSING_VERTICES: "faltan vértices",
+    BAD_WEIGHT: "peso inválido",
+    DUPLICATE: "aristas duplicadas",
+    SELF_LOOP: "lazos",
+    MISSING_EDGE: "aristas inexistentes",
+}
+# Categorías que dependen del modo (report_problem); el resto solo se cuenta
+REPORTED_PROBLEMS = (MISSING_VERTICES, BAD_WEIGHT, MISSING_EDGE)
+
+PARSE_MODES = ("strict", "lenient", "silent")
+DEFAULT_MAX_SAMPLES = 20
+
+class GraphParseError(ValueError):
+    """Línea mal formada en modo estricto."""
+    
+    def __init__(self, line_num: int, category: str, line: str):
+        super().__init__(f"Línea {line_num}: {describe_problem(category, line)}")
+        self.line_num = line_num
+        self.category = category
+        self.line = line
+
+def describe_problem(category: str, line: str) -> str:
+    """Mensaje legible para un problema de parseo."""
+    if category == MISSING_VERTICES:
+        return f"'{line}' ignorada (faltan vértices)"
+    if category == BAD_WEIGHT:
+        return "peso inválido, usando 1.0"
+    if category == DUPLICATE:
+        return f"arista duplicada '{line}'"
+    if category == MISSING_EDGE:
+        return f"arista '{line}' no existe"
+    return f"lazo '{line}'"
+
+class ParseDiagnostics:
+    """
+    Resumen acotado de los problemas encontrados al parsear un archivo.
+    
+    Cuenta los problemas por categoría y guarda solo una muestra de
+    max_samples líneas con su número. El modo decide qué pasa con una línea
+    mal formada (faltan vértices, peso inválido o, en un archivo de cambios,
+    una arista que no existe):
+        strict:  lanza GraphParseError en la primera
+        lenient: imprime las primeras max_samples y un resumen del resto
+        silent:  no imprime nada
+    Con track_edges también se cuentan lazos y aristas duplicadas; es
+    opcional porque detectar duplicadas guarda un hash de 64 bits por
+    arista, memoria del orden del propio grafo compacto.
+    """
+    
+    def __init__(self, mode: str = "lenient", max_samples: int = DEFAULT_MAX_SAMPLES,
+                 track_edges: bool = False):
+        if mode not in PARSE_MODES:
+            raise ValueError(f"Modo '{mode}' inválido; use uno de {PARSE_MODES}")
+        self.mode = mode
+        self.max_samples = max_samples
+        self.track_edges = track_edges
+        self.lines_read = 0
+        self.edges_parsed = 0
+        self.counts: Dict[str, int] = {category: 0 for category in PROBLEM_NAMES}
+        self.samples: List[Tuple[int, str, str]] = []
+        # Error de lectura que cortó el parseo (el grafo quedó incompleto)
+        self.read_error: Optional[str] = None
+        self._printed = 0
+        self._seen_edges = set()
+    
+    def _sample(self, category: str, line_num: int, line: str):
+        self.counts[category] += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append((line_num, category, line))
+    
+    def report_problem(self, category: str, line_num: int, line: str):
+        """Registra una línea mal formada según el modo."""
+        if self.mode == "strict":
+            raise GraphParseError(line_num, category, line)
+        self._sample(category, line_num, line)
+        self._announce(category, line_num, line)
+    
+    def _announce(self, category: str, line_num: int, line: str):
+        if self.mode == "lenient" and self._printed < self.max_samples:
+            self._printed += 1
+            print(f"⚠️  Línea {line_num}: {describe_problem(category, line)}")
+    
+    def observe_edge(self, from_vertex: str, to_vertex: str, weight: float, line_num: int):
+        """Cuenta una arista válida y detecta lazos y duplicadas."""
+        self.edges_parsed += 1
+        if not self.track_edges:
+            return
+        if from_vertex == to_vertex:
+            self._sample(SELF_LOOP, line_num, f"{from_vertex} {to_vertex} {weight:g}")
+        key = hash((from_vertex, to_vertex))
+        if key in self._seen_edges:
+            self._sample(DUPLICATE, line_num, f"{from_vertex} {to_vertex} {weight:g}")
+        else:
+            self._seen_edges.add(key)
+    
+    def record_problem(self, category: str, line_num: int, line: str):
+        """Cuenta un problema que no depende del modo (arista duplicada o lazo)."""
+        self._sample(category, line_num, line)
+    
+    def merge(self, other: 'ParseDiagnostics', line_offset: int = 0,
+              malformed: Iterable[Tuple[int, str, str]] = ()):
+        """
+        Suma los diagnósticos de un bloque parseado por separado.
+        
+        Los números de línea del bloque se desplazan en line_offset. Como el
+        bloque se parseó sin imprimir, ``malformed`` trae sus primeras líneas
+        mal formadas (línea, categoría, texto): con ellas strict lanza y
+        lenient imprime igual que en una pasada secuencial.
+        """
+        for line_num, category, line in malformed:
+            if self.mode == "strict":
+                raise GraphParseError(line_offset + line_num, category, line)
+            self._announce(category, line_offset + line_num, line)
+        self.lines_read += other.lines_read
+        self.edges_parsed += other.edges_parsed
+        for line_num, category, line in other.samples:
+            if len(self.samples) >= self.max_samples:
+                break
+            self.samples.append((line_offset + line_num, category, line))
+        for category, count in other.counts.items():
+            self.counts[category] += count
+    
+    def finish(self):
+        """Cierra el parseo: libera memoria e imprime los avisos omitidos."""
+        self._seen_edges = set()
+        hidden = self.malformed_lines - self._printed
+        if self.mode == "lenient" and hidden > 0:
+            print(f"⚠️  ... {hidden} avisos más no mostrados "
+                  f"({self.malformed_lines} líneas con problemas en total)")
+    
+    @property
+    def malformed_lines(self) -> int:
+        """Líneas con vértices faltantes, peso inválido o arista inexistente."""
+        return sum(self.counts[category] for category in REPORTED_PROBLEMS)
+    
+    @property
+    def total_problems(self) -> int:
+        return sum(self.counts.values())
+    
+    def summary(self) -> Dict[str, object]:
+        """Resumen estructurado (serializable a JSON)."""
+        return {
+            "mode": self.mode,
+            "lines_read": self.lines_read,
+            "edges_parsed": self.edges_parsed,
+            "counts": dict(self.counts),
+            "samples": [{"line": line_num, "category": category, "text": line}
+                        for line_num, category, line in self.samples],
+        }
+    
+    def print_summary(self):
+        """Muestra los contadores por categoría."""
+        print(f"📋 Diagnóstico: {self.lines_read} líneas, {self.edges_parsed} aristas")
+        for category, name in PROBLEM_NAMES.items():
+            if self.counts[category]:
+                print(f"   • {name}: {self.counts[category]}")
+    
+    def __repr__(self) -> str:
+        problems = ", ".join(f"{category}={count}" for category, count in self.counts.items())
+        return f"ParseDiagnostics(lines={self.lines_read}, edges={self.edges_parsed}, {problems})"
+
+def parse_edge_line(line: str) -> Tuple[Optional[Tuple[str, str, float]], Optional[str]]:
+    """
+    Interpreta una línea del formato edges_*.txt.
+    
+    Returns:
+        (arista, problema): la arista (origen, destino, peso) o None si la
+        línea se ignora, y la categoría del problema (MISSING_VERTICES o
+        BAD_WEIGHT) si la línea estaba mal formada
+    """
+    line = line.strip()
+    
+    # Ignorar líneas vacías y comentarios
+    if not line or line.startswith('#'):
+        return None, None
+    
+    parts = line.split()
+    if len(parts) < 2:
+        return None, MISSING_VERTICES
+    
+    # Procesar peso con validación
+    try:
+        weight = float(parts[2]) if len(parts) > 2 else 1.0
+    except (ValueError, IndexError):
+        return (parts[0], parts[1], 1.0), BAD_WEIGHT
+    
+    return (parts[0], parts[1], weight), None
+
+def iter_edges(file_path: str,
+               diagnostics: Optional[ParseDiagnostics] = None) -> Iterator[Tuple[str, str, float]]:
+    """
+    Recorre las aristas de un archivo de texto sin materializar el grafo.
+    
+    Aplica las reglas del formato edges_*.txt: ignora líneas vacías y
+    comentarios, registra las líneas sin vértices y usa 1.0 como peso por
+    defecto o cuando el peso es inválido.
+    
+    Args:
+        file_path: Ruta al archivo de aristas
+        diagnostics: Dónde acumular los problemas (por defecto, modo lenient)
+    
+    Yields:
+        Tuplas (origen, destino, peso) tal como aparecen en el archivo
+    """
+    if diagnostics is None:
+        diagnostics = ParseDiagnostics()
+    
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line_num, line in enumerate(file, 1):
+            diagnostics.lines_read += 1
+            edge, problem = parse_edge_line(line)
+            if problem is not None:
+                diagnostics.report_problem(problem, line_num, line.strip())
+            if edge is not None:
+                diagnostics.observe_edge(*edge, line_num)
+                yield edge
+    
+    diagnostics.finish()
+
+@timed_phase("load_graph")
+def load_graph(file_path: str, is_directed: bool = True, compact: bool = False,
+               cache: bool = False, mode: str = "lenient",
+               diagnostics: Optional[ParseDiagnostics] = None,
+               single_copy: bool = False, matrix: Union[bool, str] = False,
+               matrix_ratio: float = MATRIX_MEMORY_RATIO) -> Graph:
     """
     Carga un grafo desde un archivo de texto con manejo robusto de errores.
     
     Args:
         file_path: Ruta al archivo de aristas
         is_directed: True para grafo dirigido, False para no dirigido
+        compact: True para devolver un CSRGraph en arreglos tipados
+        cache: True para usar la caché binaria (<archivo>.d.csr / .u.csr),
+            que se abre con mmap y se reconstruye si el archivo cambia.
+            Implica compact=True.
+        mode: 'strict', 'lenient' o 'silent' (ver ParseDiagnostics)
+        diagnostics: Objeto donde acumular los diagnósticos del parseo; si
+            se usa la caché y está vigente no se parsea nada
+        single_copy: Con is_directed=False, guarda cada arista una sola vez
+            en un UndirectedCSRGraph (la mitad de memoria que compact, y
+            grados y peso total sin duplicar)
+        matrix: True para devolver una MatrixGraph (matriz de bits y de
+            pesos), o 'auto' para elegirla solo si ocupa a lo sumo
+            matrix_ratio veces la memoria del CSR y no funde aristas
+            repetidas; si no, se devuelve el CSRGraph
+        matrix_ratio: Fracción de la memoria del CSR que puede ocupar la
+            matriz con 'auto'
     
     Returns:
-        Diccionario con lista de adyacencia
+        Diccionario con lista de adyacencia, CSRGraph si compact o cache,
+        UndirectedCSRGraph si single_copy, o MatrixGraph según matrix
+    
+    Raises:
+        GraphParseError: en modo 'strict', ante la primera línea mal formada
     """
+    if diagnostics is None:
+        diagnostics = ParseDiagnostics(mode)
+    
+    if matrix:
+        if matrix not in (True, "auto"):
+            raise ValueError(f"matrix debe ser True, False o 'auto', no {matrix!r}")
+        if single_copy:
+            raise ValueError("single_copy y matrix no se pueden combinar")
+        # Se carga en CSR para medir la memoria antes de reservar V² celdas
+        csr = load_graph(file_path, is_directed, compact=True, cache=cache, diagnostics=diagnostics)
+        if matrix == "auto" and not matrix_fits(csr, matrix_ratio):
+            return csr
+        with phase("matrix"):
+            graph = MatrixGraph.from_csr(csr)
+        # La matriz no puede guardar aristas repetidas: con 'auto' no se pierden
+        if matrix == "auto" and graph.merged_edges:
+            return csr
+        return graph
+    
+    if single_copy:
+        if is_directed:
+            raise ValueError("single_copy solo aplica a grafos no dirigidos")
+        # Las aristas se guardan tal como están en el archivo; con cache se
+        # comparte el snapshot dirigido (.d.csr) del mismo archivo
+        stored = load_graph(file_path, True, compact=True, cache=cache, diagnostics=diagnostics)
+        return UndirectedCSRGraph(stored)
+    
+    if cache:
+        with phase("cache"):
+            return load_cached_graph(file_path, is_directed,
+                                     lambda: load_graph(file_path, is_directed, compact=True,
+                                                        diagnostics=diagnostics),
+                                     complete=lambda: diagnostics.read_error is None)
+    
     adjacency_list = defaultdict(list)
+    builder = CSRBuilder(is_directed) if compact else None
     
     if not os.path.exists(file_path):
         print(f"❌ Error: El archivo '{file_path}' no existe.")
-        return adjacency_list
+        diagnostics.read_error = "no existe"
+        return builder.build() if builder is not None else adjacency_list
     
+    lines_before, edges_before = diagnostics.lines_read, diagnostics.edges_parsed
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            for line_num, line in enumerate(file, 1):
-                line = line.strip()
-                
-                # Ignorar líneas vacías y comentarios
-                if not line or line.startswith('#'):
-                    continue
-                
-                parts = line.split()
-                if len(parts) < 2:
-                    print(f"⚠️  Línea {line_num}: '{line}' ignorada (faltan vértices)")
+        with phase("parse"):
+            for from_vertex, to_vertex, weight in iter_edges(file_path, diagnostics):
+                if builder is not None:
+                    builder.add_edge(from_vertex, to_vertex, weight)
                     continue
                 
-                from_vertex, to_vertex = parts[0], parts[1]
-                
-                # Procesar peso con validación
-                try:
-                    weight = float(parts[2]) if len(parts) > 2 else 1.0
-                except (ValueError, IndexError):
-                    print(f"⚠️  Línea {line_num}: peso inválido, usando 1.0")
-                    weight = 1.0
-                
                 # Agregar arista
                 adjacency_list[from_vertex].append((to_vertex, weight))
                 
@@ -55,93 +341,544 @@ def load_graph(file_path: str, is_directed: bool = True) -> Dict[str, List[Tuple
                 if not is_directed:
                     adjacency_list[to_vertex].append((from_vertex, weight))
                     
+    except GraphParseError:
+        raise
     except FileNotFoundError:
         print(f"❌ Error: No se encontró el archivo '{file_path}'")
+        diagnostics.read_error = "no se encontró"
     except Exception as e:
         print(f"❌ Error inesperado al leer '{file_path}': {e}")
+        diagnostics.read_error = str(e)
+    
+    count("lines_parsed", diagnostics.lines_read - lines_before)
+    count("edges_added", (diagnostics.edges_parsed - edges_before) * (1 if is_directed else 2))
+    
+    with phase("build"):
+        if builder is not None:
+            return builder.build()
+        return dict(adjacency_list)
+
+def load_graph_with_diagnostics(file_path: str, is_directed: bool = True,
+                                mode: str = "lenient", max_samples: int = DEFAULT_MAX_SAMPLES,
+                                track_edges: bool = False,
+                                **options) -> Tuple[Graph, ParseDiagnostics]:
+    """
+    Igual que load_graph, pero devuelve también el resumen de diagnósticos.
+    
+    Con track_edges=True se cuentan además lazos y aristas duplicadas.
     
-    return dict(adjacency_list)
+    Returns:
+        (grafo, ParseDiagnostics)
+    """
+    diagnostics = ParseDiagnostics(mode, max_samples, track_edges)
+    graph = load_graph(file_path, is_directed, diagnostics=diagnostics, **options)
+    return graph, diagnostics
 
-def get_neighbors(graph: Dict[str, List[Tuple[str, float]]], vertex: str) -> List[Tuple[str, float]]:
+def get_neighbors(graph: Graph, vertex: str) -> List[Tuple[str, float]]:
     """Obtiene la lista de vecinos de un vértice."""
     return graph.get(vertex, [])
 
-def has_edge(graph: Dict[str, List[Tuple[str, float]]], from_vertex: str, to_vertex: str) -> bool:
+def has_edge(graph: Graph, from_vertex: str, to_vertex: str,
+             index: Optional['EdgeIndex'] = None) -> bool:
     """
     Verifica si existe una arista de from_vertex a to_vertex.
+    
+    Con un EdgeIndex (pasado o ya guardado en el grafo) o una MatrixGraph,
+    que es su propio índice, la consulta es O(1); si no, recorre los vecinos
+    de from_vertex.
     """
+    if index is None:
+        index = getattr(graph, '_edge_index', None)
+    if index is not None:
+        return index.contains(from_vertex, to_vertex)
+    
     neighbors = graph.get(from_vertex, [])
     return any(neighbor == to_vertex for neighbor, _ in neighbors)
 
-def get_out_degree(graph: Dict[str, List[Tuple[str, float]]], vertex: str) -> int:
+def has_edges(graph: Graph, pairs: Iterable[Tuple[str, str]],
+              index: Optional['EdgeIndex'] = None) -> List[bool]:
+    """
+    Verifica en lote muchas aristas (origen, destino).
+    
+    Construye el índice de aristas una sola vez (o usa el indicado) y
+    devuelve un booleano por par, en el mismo orden.
+    """
+    if index is None:
+        index = build_edge_index(graph)
+    return index.contains_many(pairs)
+
+class DegreeIndex:
+    """
+    Grados de entrada y salida de todos los vértices.
+    
+    Se construye en una sola pasada O(V + E) sobre las aristas, de modo que
+    cada consulta posterior cuesta O(1) en lugar de recorrer todo el grafo.
+    """
+    
+    def __init__(self, out_degrees: Dict[str, int], in_degrees: Dict[str, int], num_edges: int):
+        self.out_degrees = out_degrees
+        self.in_degrees = in_degrees
+        self.num_edges = num_edges
+    
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'DegreeIndex':
+        """Cuenta los grados recorriendo cada arista exactamente una vez."""
+        if isinstance(graph, UndirectedCSRGraph):
+            return UndirectedDegreeIndex.from_undirected(graph)
+        if isinstance(graph, MatrixGraph):
+            out_counts, in_counts = graph.degree_arrays()
+            labels = graph.labels
+            out_degrees = {labels[vid]: count for vid, count in enumerate(out_counts) if count}
+            in_degrees = {labels[vid]: count for vid, count in enumerate(in_counts) if count}
+            return cls(out_degrees, in_degrees, sum(out_counts))
+        if isinstance(graph, CSRGraph):
+            counts = array('q', bytes(8 * graph.num_vertices))
+            for target in graph.targets:
+                counts[target] += 1
+            labels = graph.labels
+            out_degrees = {labels[vid]: graph.out_degree_of(vid)
+                           for vid in range(graph.num_vertices) if graph.out_degree_of(vid)}
+            in_degrees = {labels[vid]: count for vid, count in enumerate(counts) if count}
+            return cls(out_degrees, in_degrees, graph.num_edges)
+        
+        out_degrees = {}
+        in_degrees = defaultdict(int)
+        for vertex, neighbors in graph.items():
+            out_degrees[vertex] = len(neighbors)
+            for neighbor, _ in neighbors:
+                in_degrees[neighbor] += 1
+        return cls(out_degrees, dict(in_degrees), sum(out_degrees.values()))
+    
+    def out_degree(self, vertex: str) -> int:
+        """Grado de salida de un vértice (0 si no existe)."""
+        return self.out_degrees.get(vertex, 0)
+    
+    def in_degree(self, vertex: str) -> int:
+        """Grado de entrada de un vértice (0 si no existe)."""
+        return self.in_degrees.get(vertex, 0)
+    
+    def total_degree(self, vertex: str) -> int:
+        """Grado total (entrada + salida) de un vértice."""
+        return self.out_degree(vertex) + self.in_degree(vertex)
+    
+    def vertices(self) -> List[str]:
+        """Todos los vértices con algún grado, incluidos los que solo reciben aristas."""
+        return list(self.out_degrees.keys() | self.in_degrees.keys())
+
+class UndirectedDegreeIndex(DegreeIndex):
+    """
+    Grados de un grafo no dirigido con cada arista contada una vez.
+    
+    Toda arista es a la vez de entrada y de salida, así que out_degree,
+    in_degree y total_degree son el mismo grado, y num_edges cuenta
+    aristas no dirigidas.
+    """
+    
+    def __init__(self, degrees: Dict[str, int], num_edges: int):
+        super().__init__(degrees, degrees, num_edges)
+    
+    @classmethod
+    def from_undirected(cls, graph: UndirectedCSRGraph) -> 'UndirectedDegreeIndex':
+        labels = graph.labels
+        degrees = {labels[vid]: degree for vid, degree in enumerate(graph.degrees) if degree}
+        return cls(degrees, graph.num_edges)
+    
+    def total_degree(self, vertex: str) -> int:
+        return self.out_degree(vertex)
+    
+    def vertices(self) -> List[str]:
+        return list(self.out_degrees)
+
+class EdgeIndex:
+    """
+    Destinos ordenados por vértice para verificar aristas en O(log grado).
+    
+    Reutiliza los ``offsets`` del CSR y guarda una copia de ``targets`` con
+    cada tramo ordenado: unos 4 bytes por arista almacenada, frente a los
+    ~70 bytes por arista de un conjunto hash de enteros de Python. Los
+    grafos no dirigidos de una sola copia se consultan sobre su copia
+    simétrica (``to_csr``), y los diccionarios se compactan primero.
+    """
+    
+    def __init__(self, graph: Graph):
+        if isinstance(graph, UndirectedCSRGraph):
+            graph = graph.to_csr()
+        if isinstance(graph, CSRGraph):
+            self._ids = graph.id_map()
+            offsets, targets = graph.offsets, graph.targets
+        else:
+            self._ids, offsets, targets = self._compact(graph)
+        
+        sorted_targets = array(targets.typecode)
+        for vid in range(len(offsets) - 1):
+            sorted_targets.extend(sorted(targets[offsets[vid]:offsets[vid + 1]]))
+        self._offsets = offsets
+        self._targets = sorted_targets
+    
+    @staticmethod
+    def _compact(graph: Graph) -> Tuple[Dict[str, int], array, array]:
+        """Ids, offsets y destinos de un diccionario de adyacencia."""
+        ids: Dict[str, int] = {vertex: vid for vid, vertex in enumerate(graph)}
+        offsets = array('q', [0])
+        targets = array('i')
+        for neighbors in graph.values():
+            targets.extend(ids.setdefault(neighbor, len(ids)) for neighbor, _ in neighbors)
+            offsets.append(len(targets))
+        offsets.extend([len(targets)] * (len(ids) + 1 - len(offsets)))
+        return ids, offsets, targets
+    
+    def __len__(self) -> int:
+        """Número de aristas almacenadas (las repetidas cuentan cada vez)."""
+        return len(self._targets)
+    
+    def _has(self, u: Optional[int], v: Optional[int]) -> bool:
+        if u is None or v is None:
+            return False
+        low, high = self._offsets[u], self._offsets[u + 1]
+        position = bisect_left(self._targets, v, low, high)
+        return position < high and self._targets[position] == v
+    
+    def contains(self, from_vertex: str, to_vertex: str) -> bool:
+        """Indica si existe la arista from_vertex -> to_vertex."""
+        return self._has(self._ids.get(from_vertex), self._ids.get(to_vertex))
+    
+    def contains_many(self, pairs: Iterable[Tuple[str, str]]) -> List[bool]:
+        """Verifica muchas aristas (origen, destino) de una vez, en el mismo orden."""
+        ids, has = self._ids, self._has
+        return [has(ids.get(from_vertex), ids.get(to_vertex)) for from_vertex, to_vertex in pairs]
+
+def _cached_index(graph: Graph, attribute: str, factory):
+    """
+    Devuelve un índice guardado en el grafo o lo construye.
+    
+    Los grafos CSR son inmutables, así que el índice se guarda en el propio
+    grafo la primera vez que se pide; los diccionarios se indexan de nuevo
+    en cada llamada porque pueden haber cambiado.
+    """
+    cached = getattr(graph, attribute, None)
+    if cached is not None:
+        return cached
+    
+    index = factory(graph)
+    if isinstance(graph, (CSRGraph, UndirectedCSRGraph, MatrixGraph)):
+        setattr(graph, attribute, index)
+    return index
+
+def build_degree_index(graph: Graph) -> DegreeIndex:
+    """Construye (o reutiliza) el índice de grados de un grafo."""
+    return _cached_index(graph, '_degree_index', DegreeIndex.from_graph)
+
+def build_edge_index(graph: Graph) -> EdgeIndex:
+    """Construye (o reutiliza) el índice de existencia de aristas de un grafo."""
+    return _cached_index(graph, '_edge_index', EdgeIndex)
+
+def get_out_degree(graph: Graph, vertex: str) -> int:
     """Calcula el grado de salida de un vértice."""
+    if isinstance(graph, (CSRGraph, MatrixGraph)):
+        vid = graph.vertex_id(vertex)
+        return graph.out_degree_of(vid) if vid >= 0 else 0
+    if isinstance(graph, UndirectedCSRGraph):
+        return graph.degree(vertex)
     return len(graph.get(vertex, []))
 
-def get_in_degree(graph: Dict[str, List[Tuple[str, float]]], vertex: str) -> int:
-    """Calcula el grado de entrada de un vértice."""
+def get_in_degree(graph: Graph, vertex: str, index: Optional[DegreeIndex] = None) -> int:
+    """
+    Calcula el grado de entrada de un vértice.
+    
+    Usa el índice de grados si se pasa o si el grafo ya tiene uno; si no,
+    recorre todas las listas de adyacencia (O(E) por llamada).
+    """
+    if index is None:
+        index = getattr(graph, '_degree_index', None)
+    if index is not None:
+        return index.in_degree(vertex)
+    
     in_degree = 0
-    for neighbors in graph.values():
-        in_degree += sum(1 for neighbor, _ in neighbors if neighbor == vertex)
+    with phase("get_in_degree_scan"):
+        for neighbors in graph.values():
+            in_degree += sum(1 for neighbor, _ in neighbors if neighbor == vertex)
     return in_degree
 
-def analyze_graph(graph: Dict[str, List[Tuple[str, float]]], graph_type: str):
-    """Analiza y muestra estadísticas detalladas del grafo."""
-    print(f"\n{'='*60}")
-    print(f"🔍 Análisis del Grafo {graph_type}")
-    print(f"{'='*60}")
+def _format_sizes(sizes: List[int], limit: int = 10) -> str:
+    shown = ", ".join(str(size) for size in sizes[:limit])
+    return f"(tamaños: {shown}{', …' if len(sizes) > limit else ''})"
+
+REPORT_MODES = ("full", "summary", "top", "paged")
+
+@timed_phase("analyze_graph")
+def analyze_graph(graph: Graph, graph_type: str, is_directed: Optional[bool] = None,
+                  mode: str = "full", fmt: str = "text",
+                  output: Union[str, TextIO, None] = None,
+                  top_n: int = 10, criterion: str = "total",
+                  page: int = 1, page_size: int = 50):
+    """
+    Analiza y muestra estadísticas detalladas del grafo.
+    
+    El reporte se escribe en bloques a través de un ReportWriter, y su costo
+    depende del detalle pedido: 'summary' solo imprime estadísticas
+    generales y estructura, 'top' agrega los top_n vértices según criterion,
+    'paged' muestra una página de vértices y 'full' los muestra todos.
+    
+    Args:
+        graph: Grafo cargado con load_graph
+        graph_type: Nombre del grafo para el encabezado
+        is_directed: Tipo de grafo para componentes y ciclos; por defecto se
+            toma del grafo (CSRGraph) o se asume dirigido
+        mode: 'full', 'summary', 'top' o 'paged'
+        fmt: 'text', 'jsonl' o 'csv'
+        output: Ruta o stream de salida (por defecto sys.stdout)
+        top_n: Vértices a mostrar en modo 'top'
+        criterion: Criterio de grado para el modo 'top'
+        page: Página a mostrar en modo 'paged' (desde 1)
+        page_size: Vértices por página en modo 'paged'
+    """
+    if mode not in REPORT_MODES:
+        raise ValueError(f"Modo '{mode}' inválido; use uno de {REPORT_MODES}")
+    
+    with open_report(fmt, output) as report:
+        _write_report(report, graph, graph_type, is_directed, mode,
+                      top_n, criterion, page, page_size)
+
+def _write_report(report: ReportWriter, graph: Graph, graph_type: str,
+                  is_directed: Optional[bool], mode: str, top_n: int,
+                  criterion: str, page: int, page_size: int):
+    report.text(f"\n{'='*60}")
+    report.text(f"🔍 Análisis del Grafo {graph_type}")
+    report.text(f"{'='*60}")
     
     if not graph:
-        print("⚠️  El grafo está vacío")
+        report.text("⚠️  El grafo está vacío")
+        report.record("summary", {"graph": graph_type, "vertices": 0, "edges": 0})
         return
     
-    vertices = sorted(graph.keys())
-    total_edges = sum(len(neighbors) for neighbors in graph.values())
+    with phase("degrees"):
+        index = build_degree_index(graph)
+    if is_directed is None:
+        is_directed = getattr(graph, 'is_directed', True)
+    num_vertices = len(graph)
+    total_edges = count_edges(graph, is_directed, index)
     
-    print(f"📊 Estadísticas generales:")
-    print(f"   • Vértices: {len(vertices)}")
-    print(f"   • Aristas: {total_edges}")
+    report.text(f"📊 Estadísticas generales:")
+    report.text(f"   • Vértices: {num_vertices}")
+    report.text(f"   • Aristas: {total_edges}")
+    summary = {"graph": graph_type, "vertices": num_vertices, "edges": total_edges}
     
-    # Calcular densidad (para grafos dirigidos)
-    max_possible_edges = len(vertices) * (len(vertices) - 1)
+    # Calcular densidad; cada arista no dirigida se cuenta una vez
+    max_possible_edges = num_vertices * (num_vertices - 1)
+    if not is_directed:
+        max_possible_edges //= 2
     if max_possible_edges > 0:
         density = total_edges / max_possible_edges
-        print(f"   • Densidad: {density:.3f}")
-        print(f"   • Tipo: {'Denso' if density > 0.5 else 'Disperso'}")
-    
-    print(f"\n🔍 Detalles por vértice:")
-    for vertex in vertices:
-        out_deg = get_out_degree(graph, vertex)
-        in_deg = get_in_degree(graph, vertex)
-        neighbors = get_neighbors(graph, vertex)
-        
-        neighbor_str = ", ".join([f"{neighbor}({weight:.1f}km)" for neighbor, weight in neighbors])
-        
-        print(f"   {vertex}: Out-degree={out_deg}, In-degree={in_deg}")
-        if neighbor_str:
-            print(f"      └─ Vecinos: [{neighbor_str}]")
+        report.text(f"   • Densidad: {density:.3f}")
+        report.text(f"   • Tipo: {'Denso' if density > 0.5 else 'Disperso'}")
+        summary["density"] = density
+    report.record("summary", summary)
+    
+    # Estructura: componentes y ciclos en O(V + E)
+    with phase("structure"):
+        structure = structure_summary(graph, is_directed)
+    report.text(f"\n🧩 Estructura:")
+    if is_directed:
+        scc = structure["scc"]
+        report.text(f"   • Componentes fuertemente conexas: {scc.count} {_format_sizes(scc.sizes)}")
+    wcc = structure["wcc"]
+    report.text(f"   • Componentes {'débilmente conexas' if is_directed else 'conexas'}: "
+                f"{wcc.count} {_format_sizes(wcc.sizes)}")
+    report.text(f"   • Ciclos: {'Sí' if structure['has_cycle'] else 'No'}")
+    details = {"weak_components": wcc.count, "largest_weak_component": wcc.largest,
+               "has_cycle": structure["has_cycle"]}
+    if is_directed:
+        details["strong_components"] = scc.count
+        details["largest_strong_component"] = scc.largest
+    report.record("structure", details)
+    
+    if mode == "summary":
+        return
+    
+    if mode == "top":
+        report.text(f"\n🏆 Top {top_n} vértices por grado '{criterion}':")
+        top = top_k_vertices(graph, top_n, criterion, index, is_directed)
+        for rank, (vertex, degree) in enumerate(top, 1):
+            report.text(f"   {rank}. {vertex}: {degree:g}")
+            report.record("top", {"vertex": vertex, "metric": criterion, "value": degree})
+        return
+    
+    vertices = sorted(graph.keys())
+    if mode == "paged":
+        bounds = page_bounds(len(vertices), page, page_size)
+        pages = (len(vertices) + page_size - 1) // page_size
+        report.text(f"\n🔍 Detalles por vértice (página {page} de {pages}):")
+        vertices = [vertices[position] for position in bounds] if bounds else []
+        if not vertices:
+            report.text("   (sin vértices en esta página)")
+    else:
+        report.text(f"\n🔍 Detalles por vértice:")
+    
+    single_copy = isinstance(index, UndirectedDegreeIndex)
+    with phase("vertices"):
+        for vertex in vertices:
+            out_deg = index.out_degree(vertex)
+            in_deg = index.in_degree(vertex)
+            neighbors = get_neighbors(graph, vertex)
+            if not isinstance(report, TextReportWriter):
+                report.record("vertex", {"vertex": vertex, "out_degree": out_deg,
+                                         "in_degree": in_deg,
+                                         "neighbors": [list(pair) for pair in neighbors]})
+                continue
+            
+            neighbor_str = ", ".join([f"{neighbor}({weight:.1f}km)" for neighbor, weight in neighbors])
+            
+            if single_copy:
+                report.text(f"   {vertex}: Grado={out_deg}")
+            else:
+                report.text(f"   {vertex}: Out-degree={out_deg}, In-degree={in_deg}")
+            if neighbor_str:
+                report.text(f"      └─ Vecinos: [{neighbor_str}]")
+    count("vertices_reported", len(vertices))
 
-def find_most_connected_vertex(graph: Dict[str, List[Tuple[str, float]]]) -> str:
-    """Encuentra el vértice con mayor grado total (entrada + salida)."""
-    if not graph:
-        return ""
+DEGREE_CRITERIA = ("in", "out", "total", "weighted")
+
+def _weighted_degrees(graph: Graph, is_directed: bool) -> Dict[str, float]:
+    """
+    Suma de pesos de las aristas incidentes de cada vértice, en O(V + E).
+    
+    En no dirigidos cada arista incidente cuenta una vez y un lazo dos
+    veces, igual que en el grado, esté guardado una vez o en ambos sentidos.
+    """
+    weighted = defaultdict(float)
+    if isinstance(graph, UndirectedCSRGraph):
+        labels, targets, weights = graph.labels, graph.targets, graph.weights
+        for vid in range(graph.num_vertices):
+            for i in graph.edge_range(vid):
+                weighted[labels[vid]] += weights[i]
+                weighted[labels[targets[i]]] += weights[i]
+        return weighted
     
-    max_degree = 0
-    most_connected = ""
+    for vertex, neighbors in graph.items():
+        for neighbor, weight in neighbors:
+            weighted[vertex] += weight
+            if is_directed:
+                weighted[neighbor] += weight
+    if not is_directed and isinstance(graph, MatrixGraph):
+        for vid in _matrix_loops(graph):
+            weighted[graph.labels[vid]] += graph.weight_of(vid, vid)
+    return weighted
+
+def _undirected_degree(graph: Graph, index: DegreeIndex):
+    """
+    Grado no dirigido (aristas incidentes, un lazo cuenta dos veces) a
+    partir del índice de un grafo guardado en ambos sentidos, donde cada
+    copia saliente es una arista incidente.
+    """
+    if isinstance(index, UndirectedDegreeIndex):
+        return index.total_degree
+    if not isinstance(graph, MatrixGraph):
+        return index.out_degree
+    # La matriz simétrica guarda los lazos en una sola celda
+    loops = {graph.labels[vid] for vid in _matrix_loops(graph)}
+    return lambda vertex: index.out_degree(vertex) + (vertex in loops)
+
+@timed_phase("top_k_vertices")
+def top_k_vertices(graph: Graph, k: int = 10, criterion: str = "total",
+                   index: Optional[DegreeIndex] = None,
+                   is_directed: Optional[bool] = None) -> List[Tuple[str, float]]:
+    """
+    Los k vértices con mayor grado según un criterio, en O(V log k).
     
-    for vertex in graph.keys():
-        total_degree = get_out_degree(graph, vertex) + get_in_degree(graph, vertex)
-        if total_degree > max_degree:
-            max_degree = total_degree
-            most_connected = vertex
+    Usa un heap acotado a k elementos en una sola pasada. Los empates se
+    resuelven por etiqueta ascendente, así el ranking es determinista. En
+    un grafo no dirigido los cuatro criterios usan el grado no dirigido
+    (aristas incidentes, cada una contada una vez), sea cual sea la
+    representación.
     
-    return most_connected
+    Args:
+        graph: Grafo cargado
+        k: Número de vértices a devolver
+        criterion: 'in', 'out', 'total' o 'weighted' (suma de pesos incidentes)
+        index: Índice de grados ya construido (opcional)
+        is_directed: Por defecto se toma del grafo (CSRGraph) o se asume dirigido
+    
+    Returns:
+        Lista de (vértice, grado) de mayor a menor
+    """
+    if criterion not in DEGREE_CRITERIA:
+        raise ValueError(f"Criterio '{criterion}' inválido; use uno de {DEGREE_CRITERIA}")
+    if k <= 0 or not graph:
+        return []
+    if is_directed is None:
+        is_directed = getattr(graph, 'is_directed', True)
+    
+    if criterion == "weighted":
+        scores = _weighted_degrees(graph, is_directed)
+        candidates = scores.items()
+    else:
+        if index is None:
+            index = build_degree_index(graph)
+        if is_directed:
+            degree_of = {"in": index.in_degree, "out": index.out_degree,
+                         "total": index.total_degree}[criterion]
+        else:
+            degree_of = _undirected_degree(graph, index)
+        candidates = ((vertex, degree_of(vertex)) for vertex in index.vertices())
+    
+    return heapq.nsmallest(k, candidates, key=lambda item: (-item[1], item[0]))
+
+@timed_phase("find_most_connected_vertex")
+def find_most_connected_vertex(graph: Graph, is_directed: Optional[bool] = None) -> str:
+    """
+    Encuentra el vértice con mayor grado total (entrada + salida, o el
+    grado no dirigido).
+    
+    En caso de empate devuelve el de menor etiqueta.
+    """
+    top = top_k_vertices(graph, 1, "total", is_directed=is_directed)
+    return top[0][0] if top else ""
 
-def calculate_total_weight(graph: Dict[str, List[Tuple[str, float]]]) -> float:
-    """Calcula el peso total de todas las aristas."""
+@timed_phase("calculate_total_weight")
+def calculate_total_weight(graph: Graph, is_directed: Optional[bool] = None) -> float:
+    """
+    Calcula el peso total de todas las aristas.
+    
+    En un grafo no dirigido cada arista cuenta una vez, esté guardada una
+    sola vez (UndirectedCSRGraph) o en ambos sentidos (dict, CSRGraph o
+    MatrixGraph simétrica).
+    
+    Args:
+        graph: Grafo cargado
+        is_directed: Por defecto se toma del grafo (CSRGraph) o se asume dirigido
+    """
+    if isinstance(graph, UndirectedCSRGraph):
+        return graph.total_weight()
     total = 0.0
     for neighbors in graph.values():
         total += sum(weight for _, weight in neighbors)
-    return total
+    if is_directed is None:
+        is_directed = getattr(graph, 'is_directed', True)
+    if is_directed:
+        return total
+    if isinstance(graph, MatrixGraph):
+        # La matriz simétrica guarda los lazos en una sola celda
+        total += sum(graph.weight_of(vid, vid) for vid in _matrix_loops(graph))
+    return total / 2
+
+def count_edges(graph: Graph, is_directed: Optional[bool] = None,
+                index: Optional[DegreeIndex] = None) -> int:
+    """
+    Número de aristas, contando una vez cada arista no dirigida (mismo
+    criterio que calculate_total_weight).
+    """
+    if index is None:
+        index = build_degree_index(graph)
+    if is_directed is None:
+        is_directed = getattr(graph, 'is_directed', True)
+    if is_directed or isinstance(index, UndirectedDegreeIndex):
+        return index.num_edges
+    if isinstance(graph, MatrixGraph):
+        return (index.num_edges + len(_matrix_loops(graph))) // 2
+    return index.num_edges // 2
+
+def _matrix_loops(graph: MatrixGraph) -> List[int]:
+    return [vid for vid in range(graph.num_vertices) if graph.has_edge_ids(vid, vid)]
 
 # Programa principal
 def main():
@@ -152,15 +889,14 @@ def main():
     print("\n" + "="*60)
     print("📂 Cargando grafo NO DIRIGIDO...")
     print("="*60)
-    undirected = load_graph("edges_undirected.txt", is_directed=False)
+    undirected = load_graph("edges_undirected.txt", is_directed=False, single_copy=True)
     
     if undirected:
-        analyze_graph(undirected, "NO DIRIGIDO")
+        analyze_graph(undirected, "NO DIRIGIDO", is_directed=False)
         
         most_connected = find_most_connected_vertex(undirected)
         if most_connected:
-            total_deg = get_out_degree(undirected, most_connected) + get_in_degree(undirected, most_connected)
-            print(f"\n🏆 Vértice más conectado: {most_connected} (grado total: {total_deg})")
+            print(f"\n🏆 Vértice más conectado: {most_connected} (grado: {get_out_degree(undirected, most_connected)})")
         
         total_weight = calculate_total_weight(undirected)
         print(f"📏 Distancia total de calles: {total_weight:.1f} km")
@@ -172,7 +908,7 @@ def main():
     directed = load_graph("edges_directed.txt", is_directed=True)
     
     if directed:
-        analyze_graph(directed, "DIRIGIDO")
+        analyze_graph(directed, "DIRIGIDO", is_directed=True)
         
         most_connected = find_most_connected_vertex(directed)
         if most_connected:
@@ -190,10 +926,11 @@ def main():
     
     if undirected and directed:
         print("\n📊 Matriz vs Lista de Adyacencia:")
+        num_edges = build_degree_index(directed).num_edges
         print(f"   Para este grafo con {len(directed)} vértices:")
         print(f"   • Matriz: {len(directed)**2} espacios (O(n²))")
-        print(f"   • Lista: {sum(len(neighbors) for neighbors in directed.values())} conexiones (O(n+m))")
-        print(f"   • Ahorro de memoria: ~{((len(directed)**2 - sum(len(neighbors) for neighbors in directed.values())) / len(directed)**2 * 100):.1f}%")
+        print(f"   • Lista: {num_edges} conexiones (O(n+m))")
+        print(f"   • Ahorro de memoria: ~{((len(directed)**2 - num_edges) / len(directed)**2 * 100):.1f}%")
     
     print("\n🎉 ¡Análisis completado exitosamente!")
 
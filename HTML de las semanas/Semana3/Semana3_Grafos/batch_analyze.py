@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Análisis por lotes - Semana 3
+Carga y analiza muchos archivos de aristas en paralelo con límite de tiempo
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from analyze_graph import (PROBLEM_NAMES, REPORT_MODES, analyze_graph, build_degree_index,
+                           calculate_total_weight, count_edges, load_graph_with_diagnostics,
+                           top_k_vertices)
+from components import structure_summary
+from graph_report import REPORT_FORMATS
+
+# (archivo, dirigido)
+Job = Tuple[str, bool]
+
+REPORT_EXTENSIONS = {"text": "txt", "jsonl": "jsonl", "csv": "csv"}
+
+
+def expand_patterns(patterns: Sequence[str], is_directed: bool) -> List[Job]:
+    """Expande archivos y patrones glob ('regiones/**/*.txt') en trabajos."""
+    jobs: List[Job] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        if not matches:
+            print(f"⚠️  '{pattern}' no coincide con ningún archivo")
+        jobs.extend((path, is_directed) for path in matches if os.path.isfile(path))
+    return jobs
+
+
+def analyze_file(file_path: str, is_directed: bool = True, compact: bool = True,
+                 report_path: Optional[str] = None, mode: str = "summary",
+                 fmt: str = "text") -> Dict[str, object]:
+    """
+    Carga y analiza un archivo, devolviendo un resumen pequeño y serializable.
+
+    Args:
+        file_path: Archivo de aristas
+        is_directed: True para grafo dirigido, False para no dirigido
+        compact: True para cargar como CSRGraph, o UndirectedCSRGraph si el
+            grafo es no dirigido (menos memoria por proceso)
+        report_path: Si se indica, escribe ahí el reporte de analyze_graph
+        mode: Modo del reporte ('summary', 'top', 'paged' o 'full')
+        fmt: Formato del reporte ('text', 'jsonl' o 'csv')
+
+    Raises:
+        OSError: si el archivo no se pudo leer completo (load_graph lo
+            registra en diagnostics.read_error y devuelve lo leído)
+    """
+    started = time.perf_counter()
+    graph, diagnostics = load_graph_with_diagnostics(file_path, is_directed, mode="silent",
+                                                     compact=compact,
+                                                     single_copy=compact and not is_directed)
+    if diagnostics.read_error is not None:
+        raise OSError(f"No se pudo leer '{file_path}': {diagnostics.read_error}")
+    loaded = time.perf_counter()
+
+    index = build_degree_index(graph)
+    num_vertices = len(graph)
+    num_edges = count_edges(graph, is_directed, index)
+    # Misma densidad que el reporte de analyze_graph
+    max_possible_edges = num_vertices * (num_vertices - 1)
+    if not is_directed:
+        max_possible_edges //= 2
+    structure = structure_summary(graph, is_directed)
+    top = top_k_vertices(graph, 1, "total", index, is_directed)
+    summary = {
+        "vertices": num_vertices,
+        "edges": num_edges,
+        "density": num_edges / max_possible_edges if max_possible_edges > 0 else 0.0,
+        "total_weight": calculate_total_weight(graph, is_directed),
+        "most_connected": top[0][0] if top else "",
+        "weak_components": structure["wcc"].count,
+        "has_cycle": structure["has_cycle"],
+        "parse_problems": diagnostics.total_problems,
+        "parse_counts": dict(diagnostics.counts),
+    }
+    if is_directed:
+        summary["strong_components"] = structure["scc"].count
+
+    if report_path is not None:
+        analyze_graph(graph, os.path.basename(file_path), is_directed=is_directed,
+                      mode=mode, fmt=fmt, output=report_path)
+
+    summary["load_seconds"] = loaded - started
+    summary["analyze_seconds"] = time.perf_counter() - loaded
+    return summary
+
+
+def _run_job(connection, job: Job, options: Dict[str, object]):
+    """Cuerpo de cada proceso: analiza un archivo y envía el resultado por el pipe."""
+    file_path, is_directed = job
+    captured = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(captured):
+            result = {"status": "ok", **analyze_file(file_path, is_directed, **options)}
+    except Exception as e:
+        result = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+    messages = captured.getvalue().strip().splitlines()
+    if messages:
+        result["messages"] = messages[-5:]
+    connection.send(result)
+    connection.close()
+
+
+def _report_path(report_dir: Optional[str], file_path: str, fmt: str) -> Optional[str]:
+    if report_dir is None:
+        return None
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(report_dir, f"{name}.report.{REPORT_EXTENSIONS[fmt]}")
+
+
+def run_batch(jobs: Sequence[Job], workers: Optional[int] = None,
+              timeout: Optional[float] = None, compact: bool = True,
+              report_dir: Optional[str] = None, mode: str = "summary",
+              fmt: str = "text", verbose: bool = True) -> List[Dict[str, object]]:
+    """
+    Analiza los archivos en paralelo, con a lo sumo ``workers`` procesos a la vez.
+
+    Cada archivo corre en su propio proceso del pool, así un archivo que supera
+    ``timeout`` segundos se puede terminar sin afectar a los demás, y un fallo
+    (memoria, archivo corrupto) queda registrado solo para ese archivo.
+
+    Returns:
+        Un resultado por trabajo, en el orden de entrada, con 'file',
+        'directed', 'status' ('ok', 'error' o 'timeout') y 'seconds'
+    """
+    workers = workers or os.cpu_count() or 1
+    if report_dir is not None:
+        os.makedirs(report_dir, exist_ok=True)
+
+    context = multiprocessing.get_context()
+    pending = deque(enumerate(jobs))
+    running: Dict[object, Tuple[multiprocessing.Process, int, float]] = {}
+    results: List[Optional[Dict[str, object]]] = [None] * len(jobs)
+
+    def finish(position: int, started: float, result: Dict[str, object]):
+        file_path, is_directed = jobs[position]
+        result = {"file": file_path, "directed": is_directed,
+                  "seconds": time.monotonic() - started, **result}
+        results[position] = result
+        if verbose:
+            icon = {"ok": "✅", "timeout": "⏰"}.get(result["status"], "❌")
+            detail = f" {result['error']}" if "error" in result else ""
+            done = sum(1 for item in results if item is not None)
+            print(f"{icon} [{done}/{len(jobs)}] {file_path} ({result['seconds']:.1f}s){detail}")
+
+    while pending or running:
+        while pending and len(running) < workers:
+            position, job = pending.popleft()
+            options = {"compact": compact, "mode": mode, "fmt": fmt,
+                       "report_path": _report_path(report_dir, job[0], fmt)}
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_run_job, args=(sender, job, options), daemon=True)
+            process.start()
+            sender.close()
+            running[receiver] = (process, position, time.monotonic())
+
+        wait_time = None
+        if timeout is not None:
+            nearest = min(started for _, _, started in running.values()) + timeout
+            wait_time = max(0.0, nearest - time.monotonic())
+
+        for receiver in wait(list(running), timeout=wait_time):
+            process, position, started = running.pop(receiver)
+            try:
+                result = receiver.recv()
+            except EOFError:
+                result = None
+            receiver.close()
+            process.join()
+            if result is None:
+                result = {"status": "error",
+                          "error": f"el proceso terminó sin resultado (código {process.exitcode})"}
+            finish(position, started, result)
+
+        if timeout is not None:
+            now = time.monotonic()
+            for receiver, (process, position, started) in list(running.items()):
+                if now - started >= timeout:
+                    process.terminate()
+                    process.join()
+                    receiver.close()
+                    del running[receiver]
+                    finish(position, started, {"status": "timeout",
+                                               "error": f"superó {timeout:g}s"})
+
+    return results
+
+
+def aggregate_results(results: Sequence[Dict[str, object]],
+                      wall_seconds: float) -> Dict[str, object]:
+    """Totales del lote: estados, vértices, aristas, tiempos y archivos más lentos."""
+    completed = [result for result in results if result["status"] == "ok"]
+    statuses: Dict[str, int] = {}
+    for result in results:
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+    slowest = sorted(results, key=lambda result: result["seconds"], reverse=True)[:5]
+    parse_counts = {category: sum(result["parse_counts"][category] for result in completed)
+                    for category in PROBLEM_NAMES}
+    return {
+        "files": len(results),
+        "statuses": statuses,
+        "vertices": sum(result["vertices"] for result in completed),
+        "edges": sum(result["edges"] for result in completed),
+        "total_weight": sum(result["total_weight"] for result in completed),
+        "parse_problems": sum(result["parse_problems"] for result in completed),
+        "parse_counts": parse_counts,
+        "cyclic_graphs": sum(1 for result in completed if result["has_cycle"]),
+        "wall_seconds": wall_seconds,
+        "job_seconds": sum(result["seconds"] for result in results),
+        "slowest": [{"file": result["file"], "seconds": result["seconds"]} for result in slowest],
+        "failed": [{"file": result["file"], "status": result["status"],
+                    "error": result.get("error", "")}
+                   for result in results if result["status"] != "ok"],
+    }
+
+
+def print_aggregate(summary: Dict[str, object]):
+    """Muestra el resumen agregado del lote."""
+    print(f"\n{'='*60}")
+    print(f"📦 Resumen del lote")
+    print(f"{'='*60}")
+    statuses = summary["statuses"]
+    print(f"📊 Archivos: {summary['files']} (✅ {statuses.get('ok', 0)}, "
+          f"❌ {statuses.get('error', 0)}, ⏰ {statuses.get('timeout', 0)})")
+    print(f"   • Vértices: {summary['vertices']}")
+    print(f"   • Aristas: {summary['edges']}")
+    print(f"   • Peso total: {summary['total_weight']:.1f} km")
+    print(f"   • Grafos con ciclos: {summary['cyclic_graphs']}")
+    print(f"   • Líneas con problemas: {summary['parse_problems']}")
+    for category, name in PROBLEM_NAMES.items():
+        if summary["parse_counts"][category]:
+            print(f"      └─ {name}: {summary['parse_counts'][category]}")
+    speedup = summary['job_seconds'] / summary['wall_seconds'] if summary['wall_seconds'] else 0.0
+    print(f"⏱️  Tiempo total: {summary['wall_seconds']:.1f}s "
+          f"(suma por archivo {summary['job_seconds']:.1f}s, {speedup:.1f}x)")
+    if summary["slowest"]:
+        print(f"🐢 Más lentos:")
+        for item in summary["slowest"]:
+            print(f"   • {item['file']}: {item['seconds']:.1f}s")
+    for item in summary["failed"]:
+        print(f"❌ {item['file']}: {item['status']} {item['error']}")
+
+
+def main():
+    """Punto de entrada para analizar lotes de archivos de aristas."""
+    parser = argparse.ArgumentParser(description="Análisis de grafos por lotes")
+    parser.add_argument("files", nargs="*", help="Archivos o patrones glob de grafos dirigidos")
+    parser.add_argument("-d", "--directed", action="append", default=[], metavar="PATRÓN",
+                        help="Archivos o patrones de grafos dirigidos (repetible)")
+    parser.add_argument("-u", "--undirected", action="append", default=[], metavar="PATRÓN",
+                        help="Archivos o patrones de grafos no dirigidos (repetible)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Procesos simultáneos (por defecto, os.cpu_count())")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Segundos máximos por archivo")
+    parser.add_argument("--dict", action="store_true",
+                        help="Cargar como diccionario en lugar de CSRGraph")
+    parser.add_argument("--report-dir", help="Carpeta para el reporte de cada archivo")
+    parser.add_argument("--mode", choices=REPORT_MODES, default="summary",
+                        help="Detalle de los reportes por archivo")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="text",
+                        help="Formato de los reportes por archivo")
+    parser.add_argument("--summary-json", help="Archivo JSON con resultados y resumen")
+    args = parser.parse_args()
+
+    jobs = expand_patterns(args.files + args.directed, True)
+    jobs += expand_patterns(args.undirected, False)
+    jobs = list(dict.fromkeys(jobs))
+    if not jobs:
+        parser.error("no hay archivos para analizar")
+
+    print(f"🚀 Analizando {len(jobs)} archivos...")
+    started = time.monotonic()
+    results = run_batch(jobs, args.workers, args.timeout, compact=not args.dict,
+                        report_dir=args.report_dir, mode=args.mode, fmt=args.format)
+    summary = aggregate_results(results, time.monotonic() - started)
+    print_aggregate(summary)
+
+    if args.summary_json:
+        with open(args.summary_json, 'w', encoding='utf-8') as out:
+            json.dump({"summary": summary, "results": results}, out, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados guardados en '{args.summary_json}'")
+
+    raise SystemExit(0 if summary["statuses"].get("ok", 0) == len(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
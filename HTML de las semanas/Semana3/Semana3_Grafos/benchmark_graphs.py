@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks de grafos - Semana 3
+Genera grafos sintéticos en formato edges_*.txt y mide las operaciones principales
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from itertools import accumulate
+from typing import Callable, Dict, List
+
+from analyze_graph import (analyze_graph, find_most_connected_vertex, get_in_degree,
+                           load_graph)
+
+# Tamaños estándar de la suite (número de aristas)
+BENCHMARK_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_MAX_EDGES = 100_000
+
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+
+# Líneas que se acumulan antes de cada escritura al generar archivos
+WRITE_CHUNK_LINES = 65_536
+
+
+# --- Generadores sintéticos ---
+
+def _write_edges(file_path: str, edges):
+    """Escribe tuplas (origen, destino, peso) como 'vO vD peso' por línea."""
+    chunk: List[str] = []
+    with open(file_path, 'w', encoding='utf-8') as out:
+        out.write("# Grafo sintético generado por benchmark_graphs.py\n")
+        for u, v, weight in edges:
+            chunk.append(f"v{u} v{v} {weight:.2f}")
+            if len(chunk) >= WRITE_CHUNK_LINES:
+                out.write("\n".join(chunk) + "\n")
+                chunk.clear()
+        if chunk:
+            out.write("\n".join(chunk) + "\n")
+
+
+def erdos_renyi_edges(num_edges: int, average_degree: float = 8.0, seed: int = 0):
+    """
+    Grafo aleatorio G(n, m): m aristas entre pares uniformes, sin lazos.
+
+    n se elige para que el grado medio sea ``average_degree``.
+    """
+    rng = random.Random(seed)
+    num_vertices = max(2, int(num_edges / average_degree))
+    for _ in range(num_edges):
+        u = rng.randrange(num_vertices)
+        v = rng.randrange(num_vertices - 1)
+        if v >= u:
+            v += 1
+        yield u, v, rng.uniform(0.5, 10.0)
+
+
+def power_law_edges(num_edges: int, average_degree: float = 8.0, exponent: float = 2.5,
+                    seed: int = 0):
+    """
+    Grafo de Chung-Lu con grados esperados en ley de potencia.
+
+    El vértice i tiene peso (i + 1)^(-1 / (exponent - 1)) y cada extremo de
+    arista se sortea proporcionalmente a ese peso, así que unos pocos hubs
+    concentran gran parte de las aristas.
+    """
+    rng = random.Random(seed)
+    num_vertices = max(2, int(num_edges / average_degree))
+    cumulative = list(accumulate((i + 1) ** (-1.0 / (exponent - 1.0))
+                                 for i in range(num_vertices)))
+    population = range(num_vertices)
+    remaining = num_edges
+    while remaining > 0:
+        batch = min(remaining, WRITE_CHUNK_LINES)
+        sources = rng.choices(population, cum_weights=cumulative, k=batch)
+        targets = rng.choices(population, cum_weights=cumulative, k=batch)
+        for u, v in zip(sources, targets):
+            yield u, v, rng.uniform(0.5, 10.0)
+        remaining -= batch
+
+
+def grid_edges(num_edges: int, seed: int = 0):
+    """
+    Grafo tipo red vial: cuadrícula con calles horizontales y verticales.
+
+    Cada vértice se une a su vecino de la derecha y al de abajo con un peso
+    en km; es el caso de grado bajo y diámetro grande (usar no dirigido).
+    """
+    rng = random.Random(seed)
+    side = max(2, int((num_edges / 2) ** 0.5) + 1)
+    # Una cuadrícula de side x side tiene 2·side·(side - 1) aristas
+    while 2 * side * (side - 1) < num_edges:
+        side += 1
+    written = 0
+    for row in range(side):
+        for col in range(side):
+            vid = row * side + col
+            for neighbor, valid in ((vid + 1, col + 1 < side), (vid + side, row + 1 < side)):
+                if valid and written < num_edges:
+                    yield vid, neighbor, rng.uniform(0.1, 2.0)
+                    written += 1
+            if written >= num_edges:
+                return
+
+
+# nombre -> (generador, dirigido)
+GENERATORS: Dict[str, tuple] = {
+    "erdos_renyi": (erdos_renyi_edges, True),
+    "power_law": (power_law_edges, True),
+    "grid": (grid_edges, False),
+}
+
+
+def generate_graph_file(kind: str, num_edges: int, directory: str, seed: int = 0) -> str:
+    """
+    Genera (o reutiliza) el archivo de aristas de un grafo sintético.
+
+    Returns:
+        Ruta del archivo, con nombre '<tipo>_<aristas>_s<semilla>.txt'
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Generador '{kind}' inválido; use uno de {tuple(GENERATORS)}")
+    os.makedirs(directory, exist_ok=True)
+    file_path = os.path.join(directory, f"{kind}_{num_edges}_s{seed}.txt")
+    if not os.path.exists(file_path):
+        generator, _ = GENERATORS[kind]
+        tmp_path = f"{file_path}.tmp{os.getpid()}"
+        _write_edges(tmp_path, generator(num_edges, seed=seed))
+        os.replace(tmp_path, file_path)
+    return file_path
+
+
+# --- Medición ---
+
+def time_operation(operation: Callable[[], object], repeat: int = DEFAULT_REPEAT,
+                   warmup: int = DEFAULT_WARMUP, measure_memory: bool = True) -> Dict[str, float]:
+    """
+    Mide una operación: ``warmup`` ejecuciones descartadas, ``repeat`` medidas.
+
+    El pico de memoria se mide en una ejecución aparte con tracemalloc, porque
+    tracemalloc hace más lentas las asignaciones y falsearía los tiempos.
+
+    Returns:
+        Tiempos en segundos (min, median, mean, max) y peak_bytes
+    """
+    for _ in range(warmup):
+        operation()
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        operation()
+        times.append(time.perf_counter() - start)
+
+    result = {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "max": max(times),
+        "repeat": repeat,
+    }
+    if measure_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            operation()
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def benchmark_file(file_path: str, is_directed: bool, compact: bool = False,
+                   repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP,
+                   measure_memory: bool = True) -> Dict[str, Dict[str, float]]:
+    """
+    Mide load_graph, get_in_degree, find_most_connected_vertex y analyze_graph.
+
+    get_in_degree se mide sobre el vértice más conectado; con compact=True el
+    índice de grados queda guardado en el grafo tras la primera llamada, como
+    pasa en un uso real.
+    """
+    def load():
+        return load_graph(file_path, is_directed, compact=compact, mode="silent")
+
+    results = {"load_graph": time_operation(load, repeat, warmup, measure_memory)}
+    graph = load()
+    vertex = find_most_connected_vertex(graph)
+
+    results["get_in_degree"] = time_operation(
+        lambda: get_in_degree(graph, vertex), repeat, warmup, measure_memory)
+    results["find_most_connected_vertex"] = time_operation(
+        lambda: find_most_connected_vertex(graph), repeat, warmup, measure_memory)
+
+    with open(os.devnull, 'w', encoding='utf-8') as sink:
+        results["analyze_graph"] = time_operation(
+            lambda: analyze_graph(graph, "BENCHMARK", is_directed=is_directed, output=sink),
+            repeat, warmup, measure_memory)
+    return results
+
+
+def environment_info() -> Dict[str, str]:
+    """Datos del entorno para poder comparar resultados entre versiones."""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def run_suite(sizes=BENCHMARK_SIZES, kinds=tuple(GENERATORS), directory: str = "benchmark_data",
+              compact: bool = False, repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP,
+              measure_memory: bool = True, seed: int = 0) -> Dict[str, object]:
+    """
+    Ejecuta la suite completa: genera cada grafo y mide sus operaciones.
+
+    Returns:
+        Diccionario serializable a JSON con 'environment', 'settings' y 'results'
+    """
+    results = []
+    for kind in kinds:
+        _, is_directed = GENERATORS[kind]
+        for num_edges in sizes:
+            file_path = generate_graph_file(kind, num_edges, directory, seed)
+            print(f"⏱️  {kind} con {num_edges:,} aristas...")
+            timings = benchmark_file(file_path, is_directed, compact, repeat, warmup,
+                                     measure_memory)
+            for operation, timing in timings.items():
+                results.append({"generator": kind, "edges": num_edges,
+                                "directed": is_directed, "operation": operation, **timing})
+    return {
+        "environment": environment_info(),
+        "settings": {"compact": compact, "repeat": repeat, "warmup": warmup, "seed": seed},
+        "results": results,
+    }
+
+
+def print_results(suite: Dict[str, object]):
+    """Tabla con la mediana de tiempo y el pico de memoria de cada medición."""
+    print(f"\n{'generador':<12} {'aristas':>11} {'operación':<27} {'mediana':>10} {'pico':>10}")
+    for row in suite["results"]:
+        peak = row.get("peak_bytes")
+        peak_text = f"{peak / 2**20:.1f}MB" if peak is not None else "-"
+        print(f"{row['generator']:<12} {row['edges']:>11,} {row['operation']:<27} "
+              f"{row['median'] * 1000:>8.2f}ms {peak_text:>10}")
+
+
+def compare_results(baseline: Dict[str, object], current: Dict[str, object]):
+    """Muestra la razón de medianas actual/base de las mediciones comunes."""
+    def key(row):
+        return row["generator"], row["edges"], row["operation"]
+
+    previous = {key(row): row for row in baseline["results"]}
+    print(f"\n{'generador':<12} {'aristas':>11} {'operación':<27} {'base':>10} {'actual':>10} {'razón':>7}")
+    for row in current["results"]:
+        old = previous.get(key(row))
+        if old is None:
+            continue
+        ratio = row["median"] / old["median"] if old["median"] else float('inf')
+        marker = " 🐢" if ratio > 1.1 else (" 🚀" if ratio < 0.9 else "")
+        print(f"{row['generator']:<12} {row['edges']:>11,} {row['operation']:<27} "
+              f"{old['median'] * 1000:>8.2f}ms {row['median'] * 1000:>8.2f}ms {ratio:>6.2f}x{marker}")
+
+
+def main():
+    """Punto de entrada de la suite de benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmarks de carga y análisis de grafos")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        help=f"Aristas por grafo (por defecto {BENCHMARK_SIZES} hasta --max-edges)")
+    parser.add_argument("--max-edges", type=int, default=DEFAULT_MAX_EDGES,
+                        help="Tamaño máximo de la suite estándar (10_000_000 para la completa)")
+    parser.add_argument("--generators", nargs="+", choices=tuple(GENERATORS),
+                        default=list(GENERATORS), help="Tipos de grafo a generar")
+    parser.add_argument("--data-dir", default="benchmark_data",
+                        help="Carpeta para los archivos generados (se reutilizan)")
+    parser.add_argument("--compact", action="store_true", help="Cargar como CSRGraph")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--no-memory", action="store_true", help="No medir picos de memoria")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args()
+
+    sizes = args.sizes or [size for size in BENCHMARK_SIZES if size <= args.max_edges]
+    suite = run_suite(sizes, args.generators, args.data_dir, args.compact, args.repeat,
+                      args.warmup, not args.no_memory, args.seed)
+    print_results(suite)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            json.dump(suite, out, indent=2)
+        print(f"\n💾 Resultados guardados en '{args.output}'")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline:
+            compare_results(json.load(baseline), suite)
+
+
+if __name__ == "__main__":
+    main()
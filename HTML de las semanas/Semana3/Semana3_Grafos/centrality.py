@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Centralidad aproximada - Semana 3
+Intermediación y cercanía por muestreo de orígenes, en paralelo sobre memoria compartida
+"""
+
+import argparse
+import heapq
+import math
+import random
+from array import array
+from operator import add
+from typing import Dict, List, Optional, Tuple
+
+from analyze_graph import Graph, load_graph
+from shared_graph import SharedAnalytics, SharedArrays, worker_graph
+
+INFINITY = float('inf')
+
+DEFAULT_EPSILON = 0.05
+DEFAULT_DELTA = 0.1
+CENTRALITY_MEASURES = ("betweenness", "closeness")
+
+
+def sample_size(num_vertices: int, epsilon: float = DEFAULT_EPSILON,
+                delta: float = DEFAULT_DELTA) -> int:
+    """
+    Orígenes necesarios para que la intermediación normalizada de todos los
+    vértices tenga error menor que epsilon con probabilidad 1 - delta.
+
+    Cada origen aporta a lo sumo n - 2 de dependencia por vértice, así que
+    Hoeffding más una cota de unión sobre los n vértices da
+    k = ln(2n / delta) / (2 epsilon²). Nunca pasa de n: con k = n el
+    cálculo es exacto.
+    """
+    if num_vertices <= 0:
+        return 0
+    needed = math.ceil(math.log(2 * num_vertices / delta) / (2 * epsilon * epsilon))
+    return min(num_vertices, needed)
+
+
+def _brandes_task(task) -> None:
+    """
+    Brandes ponderado desde cada origen del lote (se ejecuta en un worker).
+
+    Escribe la suma de dependencias y la suma de 1 / distancia por vértice
+    sobre los orígenes del lote en su fila de ``partial_betweenness`` y
+    ``partial_harmonic``. Los arreglos de trabajo se reutilizan entre
+    orígenes y solo se reinician los vértices tocados.
+    """
+    sources, row, handle = task
+    graph = worker_graph()
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    num_vertices = graph.num_vertices
+    betweenness = array('d', bytes(8 * num_vertices))
+    harmonic = array('d', bytes(8 * num_vertices))
+    dist = array('d', [INFINITY]) * num_vertices
+    sigma = array('d', bytes(8 * num_vertices))
+    dependency = array('d', bytes(8 * num_vertices))
+    settled = bytearray(num_vertices)
+
+    for source in sources:
+        predecessors: Dict[int, List[int]] = {}
+        order: List[int] = []
+        touched = [source]
+        dist[source] = 0.0
+        sigma[source] = 1.0
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if settled[u]:
+                continue
+            settled[u] = 1
+            order.append(u)
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                candidate = d + weights[i]
+                if candidate < dist[v]:
+                    if dist[v] == INFINITY:
+                        touched.append(v)
+                    dist[v] = candidate
+                    sigma[v] = sigma[u]
+                    predecessors[v] = [u]
+                    heapq.heappush(heap, (candidate, v))
+                elif candidate == dist[v] and not settled[v]:
+                    sigma[v] += sigma[u]
+                    predecessors[v].append(u)
+
+        # Acumulación de dependencias en orden inverso de distancia
+        for w in reversed(order):
+            coefficient = (1.0 + dependency[w]) / sigma[w]
+            for p in predecessors.get(w, ()):
+                dependency[p] += sigma[p] * coefficient
+            if w != source:
+                betweenness[w] += dependency[w]
+                if dist[w] > 0:
+                    harmonic[w] += 1.0 / dist[w]
+
+        for vid in touched:
+            dist[vid] = INFINITY
+            sigma[vid] = 0.0
+            dependency[vid] = 0.0
+            settled[vid] = 0
+
+    out = SharedArrays.attach(*handle)
+    base = row * num_vertices
+    out["partial_betweenness"][base:base + num_vertices] = memoryview(betweenness)
+    out["partial_harmonic"][base:base + num_vertices] = memoryview(harmonic)
+    out.close()
+
+
+def _sum_rows(rows: memoryview, count: int, num_vertices: int, start: int, end: int,
+              factor: float) -> array:
+    """Suma el tramo [start, end) de las filas y lo escala, con operaciones en bloque."""
+    total = array('d', bytes(8 * (end - start)))
+    for row in range(count):
+        base = row * num_vertices
+        total = array('d', map(add, total, rows[base + start:base + end]))
+    return array('d', map(factor.__mul__, total))
+
+
+def _reduce_task(task) -> None:
+    """Reduce: suma y normaliza las filas parciales de un rango de vértices."""
+    (start, end), rows, betweenness_factor, closeness_factor, handle = task
+    num_vertices = worker_graph().num_vertices
+    out = SharedArrays.attach(*handle)
+    out["betweenness"][start:end] = memoryview(_sum_rows(
+        out["partial_betweenness"], rows, num_vertices, start, end, betweenness_factor))
+    out["closeness"][start:end] = memoryview(_sum_rows(
+        out["partial_harmonic"], rows, num_vertices, start, end, closeness_factor))
+    out.close()
+
+
+class CentralityResult:
+    """
+    Intermediación y cercanía estimadas de todos los vértices.
+
+    ``betweenness`` está normalizada por (n - 1)(n - 2) pares ordenados, así
+    que queda entre 0 y 1 en dirigidos y no dirigidos. ``closeness`` es la
+    cercanía armónica (promedio de 1 / distancia, con 0 para los no
+    alcanzables), medida desde los demás vértices hacia cada vértice.
+    """
+
+    def __init__(self, labels, betweenness: array, closeness: array, samples: int,
+                 epsilon: float, delta: float):
+        self.labels = labels
+        self.betweenness_values = betweenness
+        self.closeness_values = closeness
+        self.samples = samples
+        self.epsilon = epsilon
+        self.delta = delta
+        self._ids: Optional[Dict[str, int]] = None
+
+    @property
+    def exact(self) -> bool:
+        """True si se usaron todos los vértices como orígenes."""
+        return self.samples == len(self.labels)
+
+    def _vid(self, vertex: str) -> int:
+        if self._ids is None:
+            self._ids = {label: vid for vid, label in enumerate(self.labels)}
+        vid = self._ids.get(vertex)
+        if vid is None:
+            raise KeyError(f"El vértice '{vertex}' no existe en el grafo")
+        return vid
+
+    def betweenness(self, vertex: str) -> float:
+        return self.betweenness_values[self._vid(vertex)]
+
+    def closeness(self, vertex: str) -> float:
+        return self.closeness_values[self._vid(vertex)]
+
+    def top_k(self, k: int = 10, measure: str = "betweenness") -> List[Tuple[str, float]]:
+        """Los k vértices de mayor centralidad; empates por etiqueta, como top_k_vertices."""
+        if measure not in CENTRALITY_MEASURES:
+            raise ValueError(f"Medida '{measure}' inválida; use una de {CENTRALITY_MEASURES}")
+        values = self.betweenness_values if measure == "betweenness" else self.closeness_values
+        labels = self.labels
+        return heapq.nsmallest(k, ((labels[vid], value) for vid, value in enumerate(values)),
+                               key=lambda item: (-item[1], item[0]))
+
+
+def approximate_centrality(graph: Graph, is_directed: Optional[bool] = None,
+                           epsilon: float = DEFAULT_EPSILON, delta: float = DEFAULT_DELTA,
+                           max_samples: Optional[int] = None, workers: Optional[int] = None,
+                           seed: int = 0) -> CentralityResult:
+    """
+    Estima intermediación y cercanía ponderadas muestreando orígenes.
+
+    Se eligen k orígenes al azar (k según sample_size, o todos si el grafo es
+    chico) y desde cada uno se corre Brandes con Dijkstra; la suma de
+    dependencias escalada por n / k estima la intermediación y la suma de
+    1 / distancia estima la cercanía armónica. Los orígenes se reparten
+    entre los procesos de SharedAnalytics, que leen el grafo desde memoria
+    compartida y dejan sus sumas parciales en filas de otro segmento; luego
+    cada proceso suma y normaliza un rango de vértices.
+
+    Args:
+        graph: Grafo cargado (dict, CSRGraph o UndirectedCSRGraph)
+        is_directed: Si es None se toma del grafo
+        epsilon: Error máximo de la intermediación normalizada
+        delta: Probabilidad de superar ese error
+        max_samples: Tope de orígenes (si se alcanza, la cota de error ya no vale)
+        workers: Número de procesos (por defecto, os.cpu_count())
+        seed: Semilla del muestreo, para resultados reproducibles
+
+    Raises:
+        ValueError: si el grafo tiene pesos negativos
+    """
+    with SharedAnalytics(graph, is_directed, workers) as analytics:
+        csr = analytics.csr
+        num_vertices = csr.num_vertices
+        if any(weight < 0 for weight in csr.weights):
+            raise ValueError("La centralidad ponderada no admite pesos negativos")
+
+        samples = sample_size(num_vertices, epsilon, delta)
+        if max_samples is not None:
+            samples = min(samples, max_samples)
+        sources = random.Random(seed).sample(range(num_vertices), samples)
+        chunks = [sources[i::analytics.workers] for i in range(analytics.workers)
+                  if sources[i::analytics.workers]]
+
+        pairs = (num_vertices - 1) * (num_vertices - 2)
+        scale = num_vertices / samples if samples else 0.0
+        betweenness_factor = scale / pairs if pairs > 0 else 0.0
+        closeness_factor = scale / (num_vertices - 1) if num_vertices > 1 else 0.0
+
+        rows = len(chunks)
+        block = SharedArrays.create([
+            ("partial_betweenness", 'd', rows * num_vertices),
+            ("partial_harmonic", 'd', rows * num_vertices),
+            ("betweenness", 'd', num_vertices),
+            ("closeness", 'd', num_vertices),
+        ])
+        try:
+            handle = block.handle()
+            list(analytics.map(_brandes_task, [(chunk, row, handle)
+                                               for row, chunk in enumerate(chunks)]))
+            list(analytics.map(_reduce_task, [(span, rows, betweenness_factor, closeness_factor,
+                                               handle) for span in analytics.ranges()]))
+            betweenness = array('d', block["betweenness"])
+            closeness = array('d', block["closeness"])
+        finally:
+            block.unlink()
+        labels = list(csr.labels)
+
+    return CentralityResult(labels, betweenness, closeness, samples, epsilon, delta)
+
+
+def print_centrality(result: CentralityResult, graph_type: str, top_n: int = 10):
+    """Muestra los rankings de intermediación y cercanía con el formato de analyze_graph."""
+    print(f"\n{'='*60}")
+    print(f"🌉 Centralidad del Grafo {graph_type}")
+    print(f"{'='*60}")
+    if result.exact:
+        print(f"📊 Cálculo exacto ({result.samples} orígenes)")
+    else:
+        print(f"📊 {result.samples} orígenes muestreados "
+              f"(error ≤ {result.epsilon:g} con probabilidad {1 - result.delta:g})")
+
+    print(f"\n🏆 Top {top_n} por intermediación:")
+    for rank, (vertex, value) in enumerate(result.top_k(top_n, "betweenness"), 1):
+        print(f"   {rank}. {vertex}: {value:.4f}")
+    print(f"\n🎯 Top {top_n} por cercanía:")
+    for rank, (vertex, value) in enumerate(result.top_k(top_n, "closeness"), 1):
+        print(f"   {rank}. {vertex}: {value:.4f}")
+
+
+def main():
+    """Punto de entrada para estimar la centralidad de un archivo de aristas."""
+    parser = argparse.ArgumentParser(description="Centralidad aproximada por muestreo")
+    parser.add_argument("file", help="Archivo de aristas (formato edges_*.txt)")
+    parser.add_argument("--undirected", action="store_true", help="Tratar el grafo como no dirigido")
+    parser.add_argument("--epsilon", type=float, default=DEFAULT_EPSILON,
+                        help="Error máximo de la intermediación normalizada")
+    parser.add_argument("--delta", type=float, default=DEFAULT_DELTA,
+                        help="Probabilidad de superar el error")
+    parser.add_argument("--max-samples", type=int, default=None,
+                        help="Tope de orígenes (anula la garantía de error)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Procesos (por defecto, os.cpu_count())")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del muestreo")
+    parser.add_argument("--top", type=int, default=10, help="Vértices a mostrar en cada ranking")
+    args = parser.parse_args()
+
+    is_directed = not args.undirected
+    graph = load_graph(args.file, is_directed, compact=True)
+    result = approximate_centrality(graph, is_directed, args.epsilon, args.delta,
+                                    args.max_samples, args.workers, args.seed)
+    print_centrality(result, "DIRIGIDO" if is_directed else "NO DIRIGIDO", args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Componentes y ciclos - Semana 3
+Tarjan iterativo (SCC), union-find (componentes débiles) y detección de ciclos
+"""
+
+from array import array
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Union
+
+from csr_graph import CSRGraph, UndirectedCSRGraph, as_csr
+
+
+class Components:
+    """Asignación de cada vértice a una componente, con sus tamaños."""
+
+    def __init__(self, graph: CSRGraph, component_ids: array, count: int):
+        self.graph = graph
+        self.component_ids = component_ids
+        self.count = count
+        sizes = array('q', bytes(8 * count))
+        for component in component_ids:
+            sizes[component] += 1
+        self._sizes = sizes
+
+    @property
+    def sizes(self) -> List[int]:
+        """Tamaños de las componentes, de mayor a menor."""
+        return sorted(self._sizes, reverse=True)
+
+    @property
+    def largest(self) -> int:
+        return max(self._sizes, default=0)
+
+    def component_of(self, vertex: str) -> int:
+        """Id de la componente de un vértice (-1 si no existe)."""
+        vid = self.graph.vertex_id(vertex)
+        return self.component_ids[vid] if vid >= 0 else -1
+
+    def members(self) -> List[List[str]]:
+        """Vértices de cada componente, agrupados por id de componente."""
+        groups: List[List[str]] = [[] for _ in range(self.count)]
+        for vid, component in enumerate(self.component_ids):
+            groups[component].append(self.graph.labels[vid])
+        return groups
+
+
+def strongly_connected_components(graph: Mapping) -> Components:
+    """
+    Componentes fuertemente conexas con Tarjan iterativo en O(V + E).
+
+    La recursión se reemplaza por una pila explícita de (vértice, posición de
+    la siguiente arista), con índices, lowlinks y marcas en arreglos tipados.
+    """
+    graph = as_csr(graph)
+    num_vertices = graph.num_vertices
+    offsets, targets = graph.offsets, graph.targets
+
+    index = array('i', [-1]) * num_vertices
+    lowlink = array('i', bytes(4 * num_vertices))
+    on_stack = bytearray(num_vertices)
+    component_ids = array('i', [-1]) * num_vertices
+    scc_stack = array('i')
+    call_vertices = array('i')
+    call_positions = array('q')
+    next_index = 0
+    count = 0
+
+    for root in range(num_vertices):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = next_index
+        next_index += 1
+        scc_stack.append(root)
+        on_stack[root] = 1
+        call_vertices.append(root)
+        call_positions.append(offsets[root])
+
+        while call_vertices:
+            v = call_vertices[-1]
+            position = call_positions[-1]
+            if position < offsets[v + 1]:
+                call_positions[-1] = position + 1
+                w = targets[position]
+                if index[w] == -1:
+                    index[w] = lowlink[w] = next_index
+                    next_index += 1
+                    scc_stack.append(w)
+                    on_stack[w] = 1
+                    call_vertices.append(w)
+                    call_positions.append(offsets[w])
+                elif on_stack[w] and index[w] < lowlink[v]:
+                    lowlink[v] = index[w]
+                continue
+
+            call_vertices.pop()
+            call_positions.pop()
+            if lowlink[v] == index[v]:
+                while True:
+                    w = scc_stack.pop()
+                    on_stack[w] = 0
+                    component_ids[w] = count
+                    if w == v:
+                        break
+                count += 1
+            if call_vertices:
+                parent = call_vertices[-1]
+                if lowlink[v] < lowlink[parent]:
+                    lowlink[parent] = lowlink[v]
+
+    return Components(graph, component_ids, count)
+
+
+def _find(parent: array, vid: int) -> int:
+    while parent[vid] != vid:
+        parent[vid] = parent[parent[vid]]  # compresión por mitades
+        vid = parent[vid]
+    return vid
+
+
+def _union_find(graph: Union[CSRGraph, UndirectedCSRGraph], mirrored: bool = False,
+                stop_on_cycle: bool = False) -> Optional[Components]:
+    """
+    Une los extremos de cada arista; con stop_on_cycle devuelve None en
+    cuanto una arista une dos vértices que ya estaban conectados.
+
+    Si el grafo es no dirigido (mirrored) cada arista está guardada en ambos
+    sentidos y solo se procesa la copia con u <= v. Un UndirectedCSRGraph
+    ya guarda cada arista una vez y se recorre directamente.
+    """
+    num_vertices = graph.num_vertices
+    targets = graph.targets
+    parent = array('i', range(num_vertices))
+    size = array('i', [1]) * num_vertices
+
+    for u in range(num_vertices):
+        for i in graph.edge_range(u):
+            v = targets[i]
+            if mirrored and u > v:
+                continue
+            root_u, root_v = _find(parent, u), _find(parent, v)
+            if root_u == root_v:
+                if stop_on_cycle:
+                    return None
+                continue
+            if size[root_u] < size[root_v]:
+                root_u, root_v = root_v, root_u
+            parent[root_v] = root_u
+            size[root_u] += size[root_v]
+
+    roots: Dict[int, int] = {}
+    component_ids = array('i', bytes(4 * num_vertices))
+    for vid in range(num_vertices):
+        component_ids[vid] = roots.setdefault(_find(parent, vid), len(roots))
+    return Components(graph, component_ids, len(roots))
+
+
+def weakly_connected_components(graph: Mapping) -> Components:
+    """
+    Componentes débilmente conexas (conexas si el grafo es no dirigido)
+    con union-find en O((V + E) α(V)).
+    """
+    if isinstance(graph, UndirectedCSRGraph):
+        return _union_find(graph)
+    return _union_find(as_csr(graph))
+
+
+def has_cycle(graph: Mapping, is_directed: Optional[bool] = None) -> bool:
+    """
+    Indica si el grafo tiene ciclos, sin recursión.
+
+    Dirigido: hay ciclo si alguna SCC tiene más de un vértice o hay un lazo.
+    No dirigido: hay ciclo si alguna arista une vértices ya conectados
+    (un lazo o una arista repetida cuentan como ciclo).
+
+    Args:
+        is_directed: Por defecto se toma del grafo (CSRGraph) o se asume dirigido
+    """
+    if is_directed is None:
+        is_directed = getattr(graph, 'is_directed', True)
+    if isinstance(graph, UndirectedCSRGraph):
+        return _union_find(graph, stop_on_cycle=True) is None
+    graph = as_csr(graph, is_directed)
+    if not is_directed:
+        return _union_find(graph, mirrored=True, stop_on_cycle=True) is None
+    return _has_self_loop(graph) or strongly_connected_components(graph).largest > 1
+
+
+def _has_self_loop(graph: CSRGraph) -> bool:
+    targets = graph.targets
+    return any(targets[i] == u for u in range(graph.num_vertices) for i in graph.edge_range(u))
+
+
+def structure_summary(graph: Mapping, is_directed: bool = True) -> Dict[str, object]:
+    """
+    Componentes y ciclos del grafo calculando cada estructura una sola vez.
+
+    Returns:
+        Diccionario con 'scc' (solo dirigidos), 'wcc' y 'has_cycle'
+    """
+    if isinstance(graph, UndirectedCSRGraph):
+        return {"wcc": _union_find(graph),
+                "has_cycle": _union_find(graph, stop_on_cycle=True) is None}
+    graph = as_csr(graph, is_directed)
+    summary: Dict[str, object] = {"wcc": weakly_connected_components(graph)}
+    if is_directed:
+        scc = strongly_connected_components(graph)
+        summary["scc"] = scc
+        summary["has_cycle"] = scc.largest > 1 or _has_self_loop(graph)
+    else:
+        summary["has_cycle"] = _union_find(graph, mirrored=True, stop_on_cycle=True) is None
+    return summary
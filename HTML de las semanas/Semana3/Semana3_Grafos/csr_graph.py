@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+"""
+Representación compacta CSR (Compressed Sparse Row) - Semana 3
+Grafo en arreglos tipados con etiquetas internadas a ids enteros
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class CSRGraph(Mapping):
+    """
+    Grafo dirigido almacenado en formato CSR.
+
+    Cada vértice tiene un id entero (orden de primera aparición). Las aristas
+    del vértice ``v`` ocupan ``targets[offsets[v]:offsets[v + 1]]`` y sus
+    pesos ``weights[offsets[v]:offsets[v + 1]]``. Cuesta ~12 bytes por arista
+    en lugar de una tupla y un float por arista.
+
+    Se comporta como el diccionario que devuelve ``load_graph``: las claves
+    son los vértices con al menos una arista de salida y ``graph[v]`` es la
+    lista de tuplas ``(vecino, peso)``, así que las funciones de
+    ``analyze_graph`` lo aceptan sin cambios.
+    """
+
+    def __init__(self, labels: List[str], offsets: Sequence[int],
+                 targets: Sequence[int], weights: Sequence[float],
+                 is_directed: bool = True):
+        """
+        Args:
+            labels: Etiqueta de cada vértice, indexada por id
+            offsets: Arreglo de len(labels) + 1 posiciones de inicio
+            targets: Id del destino de cada arista
+            weights: Peso de cada arista
+            is_directed: False si las aristas ya están duplicadas en ambos sentidos
+        """
+        if len(offsets) != len(labels) + 1:
+            raise ValueError("offsets debe tener len(labels) + 1 elementos")
+        if len(targets) != len(weights) or offsets[-1] != len(targets):
+            raise ValueError("targets y weights no coinciden con offsets")
+
+        self.labels = labels
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.is_directed = is_directed
+        self._ids: Optional[Dict[str, int]] = None
+        self._degree_index = None
+        self._edge_index = None
+        self._num_sources = sum(
+            1 for v in range(len(labels)) if offsets[v + 1] > offsets[v]
+        )
+
+    @property
+    def num_vertices(self) -> int:
+        """Número de vértices internados (incluye los que solo reciben aristas)."""
+        return len(self.labels)
+
+    @property
+    def num_edges(self) -> int:
+        """Número de aristas almacenadas."""
+        return len(self.targets)
+
+    def id_map(self) -> Dict[str, int]:
+        """Diccionario etiqueta -> id (se construye la primera vez que se pide)."""
+        if self._ids is None:
+            self._ids = {label: vid for vid, label in enumerate(self.labels)}
+        return self._ids
+
+    def vertex_id(self, vertex: str) -> int:
+        """Devuelve el id entero de un vértice, o -1 si no existe."""
+        return self.id_map().get(vertex, -1)
+
+    def edge_range(self, vid: int) -> range:
+        """Rango de posiciones en targets/weights de las aristas de ``vid``."""
+        return range(self.offsets[vid], self.offsets[vid + 1])
+
+    def out_degree_of(self, vid: int) -> int:
+        """Grado de salida por id, en O(1)."""
+        return self.offsets[vid + 1] - self.offsets[vid]
+
+    def reversed(self) -> 'CSRGraph':
+        """
+        Grafo con todas las aristas invertidas, con los mismos ids de vértice.
+
+        Se construye con un counting sort por destino en O(V + E).
+        """
+        num_vertices = self.num_vertices
+        offsets = array('q', bytes(8 * (num_vertices + 1)))
+        for v in self.targets:
+            offsets[v + 1] += 1
+        for vid in range(num_vertices):
+            offsets[vid + 1] += offsets[vid]
+
+        cursor = array('q', offsets[:-1])
+        targets = array('i', bytes(4 * self.num_edges))
+        weights = array('d', bytes(8 * self.num_edges))
+        for u in range(num_vertices):
+            for i in self.edge_range(u):
+                v = self.targets[i]
+                pos = cursor[v]
+                targets[pos] = u
+                weights[pos] = self.weights[i]
+                cursor[v] = pos + 1
+
+        graph = CSRGraph(self.labels, offsets, targets, weights, self.is_directed)
+        graph._ids = self._ids
+        return graph
+
+    # --- Interfaz de Mapping compatible con el diccionario de adyacencia ---
+
+    def __getitem__(self, vertex: str) -> List[Tuple[str, float]]:
+        vid = self.vertex_id(vertex)
+        if vid < 0 or self.offsets[vid + 1] == self.offsets[vid]:
+            raise KeyError(vertex)
+        labels, targets, weights = self.labels, self.targets, self.weights
+        return [(labels[targets[i]], weights[i]) for i in self.edge_range(vid)]
+
+    def __contains__(self, vertex: object) -> bool:
+        vid = self.vertex_id(vertex) if isinstance(vertex, str) else -1
+        return vid >= 0 and self.offsets[vid + 1] > self.offsets[vid]
+
+    def __iter__(self) -> Iterator[str]:
+        offsets = self.offsets
+        for vid, label in enumerate(self.labels):
+            if offsets[vid + 1] > offsets[vid]:
+                yield label
+
+    def __len__(self) -> int:
+        return self._num_sources
+
+    def __repr__(self) -> str:
+        return (f"CSRGraph(vertices={self.num_vertices}, edges={self.num_edges}, "
+                f"directed={self.is_directed})")
+
+
+class UndirectedCSRGraph(Mapping):
+    """
+    Grafo no dirigido que guarda cada arista una sola vez.
+
+    Las aristas se guardan en un CSRGraph dirigido tal como aparecen en el
+    archivo (u -> v), ~12 bytes por arista en lugar de los ~24 de un
+    CSRGraph no dirigido, que guarda cada arista en ambos sentidos. Los
+    grados y el peso total se calculan sobre esa única copia.
+
+    ``graph[v]`` es la vista simétrica de ``v``: sus aristas guardadas más
+    las que lo tienen como destino, ordenadas por posición en el CSR. Para
+    estas últimas se construye, la primera vez que hace falta, un índice
+    inverso de posiciones (4 bytes por arista).
+    """
+
+    is_directed = False
+
+    def __init__(self, stored: CSRGraph):
+        """
+        Args:
+            stored: CSRGraph dirigido con cada arista no dirigida una sola vez
+        """
+        self.stored = stored
+        self.labels = stored.labels
+        self.offsets = stored.offsets
+        self.targets = stored.targets
+        self.weights = stored.weights
+        self._degree_index = None
+        self._edge_index = None
+        self._reverse: Optional[Tuple[array, array]] = None
+        self._mirrored: Optional[CSRGraph] = None
+
+        degrees = array('q', bytes(8 * stored.num_vertices))
+        for vid in range(stored.num_vertices):
+            degrees[vid] = stored.out_degree_of(vid)
+        for target in stored.targets:
+            degrees[target] += 1
+        self.degrees = degrees
+        self._num_connected = sum(1 for degree in degrees if degree)
+
+    @property
+    def num_vertices(self) -> int:
+        return self.stored.num_vertices
+
+    @property
+    def num_edges(self) -> int:
+        """Número de aristas no dirigidas (cada una contada una vez)."""
+        return self.stored.num_edges
+
+    def id_map(self) -> Dict[str, int]:
+        return self.stored.id_map()
+
+    def vertex_id(self, vertex: str) -> int:
+        return self.stored.vertex_id(vertex)
+
+    def edge_range(self, vid: int) -> range:
+        """Posiciones de las aristas guardadas con ``vid`` como primer extremo."""
+        return self.stored.edge_range(vid)
+
+    def degree_of(self, vid: int) -> int:
+        """Grado por id, en O(1); un lazo cuenta dos veces."""
+        return self.degrees[vid]
+
+    def degree(self, vertex: str) -> int:
+        """Grado de un vértice (0 si no existe)."""
+        vid = self.vertex_id(vertex)
+        return self.degrees[vid] if vid >= 0 else 0
+
+    def total_weight(self) -> float:
+        """Suma de los pesos, contando cada arista una sola vez."""
+        return sum(self.weights)
+
+    def _reverse_index(self) -> Tuple[array, array]:
+        """Posiciones de las aristas guardadas agrupadas por destino (counting sort)."""
+        if self._reverse is None:
+            num_vertices, num_edges = self.num_vertices, self.num_edges
+            offsets = array('q', bytes(8 * (num_vertices + 1)))
+            for v in self.targets:
+                offsets[v + 1] += 1
+            for vid in range(num_vertices):
+                offsets[vid + 1] += offsets[vid]
+
+            cursor = array('q', offsets[:-1])
+            typecode = 'i' if num_edges < 2**31 else 'q'
+            positions = array(typecode, bytes(array(typecode).itemsize * num_edges))
+            for position, v in enumerate(self.targets):
+                positions[cursor[v]] = position
+                cursor[v] += 1
+            self._reverse = (offsets, positions)
+        return self._reverse
+
+    def _source_of(self, position: int) -> int:
+        return bisect_right(self.offsets, position) - 1
+
+    def neighbor_ids(self, vid: int) -> Iterator[Tuple[int, float]]:
+        """Vecinos (id, peso) de ``vid`` en ambos sentidos, por posición en el CSR."""
+        reverse_offsets, positions = self._reverse_index()
+        start, end = self.offsets[vid], self.offsets[vid + 1]
+        incoming = positions[reverse_offsets[vid]:reverse_offsets[vid + 1]]
+        split = bisect_left(incoming, start)
+        targets, weights = self.targets, self.weights
+        for position in incoming[:split]:
+            yield self._source_of(position), weights[position]
+        for i in range(start, end):
+            yield targets[i], weights[i]
+        for position in incoming[split:]:
+            yield self._source_of(position), weights[position]
+
+    def to_csr(self) -> CSRGraph:
+        """
+        Copia simétrica como CSRGraph no dirigido, para los algoritmos que
+        recorren ``offsets``/``targets`` directamente (BFS, Dijkstra...).
+
+        Se arma en una pasada sobre las aristas guardadas, en el mismo orden
+        que neighbor_ids, y se guarda en la instancia: las consultas
+        siguientes la reutilizan.
+        """
+        if self._mirrored is not None:
+            return self._mirrored
+        stored_offsets, stored_targets, stored_weights = self.offsets, self.targets, self.weights
+        offsets = array('q', [0])
+        offsets.extend(accumulate(self.degrees))
+        cursor = offsets[:-1]
+        targets = array('i', bytes(4 * offsets[-1]))
+        weights = array('d', bytes(8 * offsets[-1]))
+        for u in range(self.num_vertices):
+            loops = []
+            for i in range(stored_offsets[u], stored_offsets[u + 1]):
+                v, weight = stored_targets[i], stored_weights[i]
+                position = cursor[u]
+                targets[position] = v
+                weights[position] = weight
+                cursor[u] = position + 1
+                if v == u:
+                    loops.append(weight)
+                    continue
+                position = cursor[v]
+                targets[position] = u
+                weights[position] = weight
+                cursor[v] = position + 1
+            # La copia entrante de un lazo va después de todas las salientes
+            for weight in loops:
+                position = cursor[u]
+                targets[position] = u
+                weights[position] = weight
+                cursor[u] = position + 1
+        graph = CSRGraph(self.labels, offsets, targets, weights, is_directed=False)
+        graph._ids = self.stored._ids
+        self._mirrored = graph
+        return graph
+
+    # --- Interfaz de Mapping compatible con el diccionario de adyacencia ---
+
+    def __getitem__(self, vertex: str) -> List[Tuple[str, float]]:
+        vid = self.vertex_id(vertex)
+        if vid < 0 or not self.degrees[vid]:
+            raise KeyError(vertex)
+        labels = self.labels
+        return [(labels[neighbor], weight) for neighbor, weight in self.neighbor_ids(vid)]
+
+    def __contains__(self, vertex: object) -> bool:
+        vid = self.vertex_id(vertex) if isinstance(vertex, str) else -1
+        return vid >= 0 and self.degrees[vid] > 0
+
+    def __iter__(self) -> Iterator[str]:
+        degrees = self.degrees
+        for vid, label in enumerate(self.labels):
+            if degrees[vid]:
+                yield label
+
+    def __len__(self) -> int:
+        return self._num_connected
+
+    def __repr__(self) -> str:
+        return f"UndirectedCSRGraph(vertices={self.num_vertices}, edges={self.num_edges})"
+
+
+class CSRBuilder:
+    """
+    Acumula aristas en arreglos tipados y construye un CSRGraph.
+
+    Las aristas se guardan en el orden de llegada y se reparten por vértice
+    de origen con un counting sort estable, así el orden de vecinos coincide
+    con el de la lista de adyacencia.
+    """
+
+    def __init__(self, is_directed: bool = True):
+        self.is_directed = is_directed
+        self.labels: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._sources = array('i')
+        self._targets = array('i')
+        self._weights = array('d')
+
+    def intern(self, vertex: str) -> int:
+        """Devuelve el id de un vértice, asignándole uno nuevo si no existe."""
+        vid = self._ids.get(vertex)
+        if vid is None:
+            vid = len(self.labels)
+            self._ids[vertex] = vid
+            self.labels.append(vertex)
+        return vid
+
+    def add_edge(self, from_vertex: str, to_vertex: str, weight: float):
+        """Agrega una arista (y su inversa si el grafo es no dirigido)."""
+        u = self.intern(from_vertex)
+        v = self.intern(to_vertex)
+        self._sources.append(u)
+        self._targets.append(v)
+        self._weights.append(weight)
+        if not self.is_directed:
+            self._sources.append(v)
+            self._targets.append(u)
+            self._weights.append(weight)
+
+    def extend(self, sources: array, targets: array, weights: array):
+        """
+        Agrega un bloque de aristas ya internadas (ids de este builder).
+
+        Equivale a llamar add_edge por cada arista, pero copia los arreglos
+        completos; en no dirigidos intercala cada arista con su inversa.
+        """
+        if self.is_directed:
+            self._sources.extend(sources)
+            self._targets.extend(targets)
+            self._weights.extend(weights)
+            return
+
+        count = len(sources)
+        both_sources = array('i', bytes(8 * count))
+        both_sources[0::2] = sources
+        both_sources[1::2] = targets
+        both_targets = array('i', bytes(8 * count))
+        both_targets[0::2] = targets
+        both_targets[1::2] = sources
+        both_weights = array('d', bytes(16 * count))
+        both_weights[0::2] = weights
+        both_weights[1::2] = weights
+        self._sources.extend(both_sources)
+        self._targets.extend(both_targets)
+        self._weights.extend(both_weights)
+
+    def build(self) -> CSRGraph:
+        """Construye el grafo CSR en O(V + E) y libera los buffers temporales."""
+        num_vertices = len(self.labels)
+        num_edges = len(self._sources)
+
+        offsets = array('q', bytes(8 * (num_vertices + 1)))
+        for u in self._sources:
+            offsets[u + 1] += 1
+        for vid in range(num_vertices):
+            offsets[vid + 1] += offsets[vid]
+
+        cursor = array('q', offsets[:-1])
+        targets = array('i', bytes(4 * num_edges))
+        weights = array('d', bytes(8 * num_edges))
+        for i, u in enumerate(self._sources):
+            pos = cursor[u]
+            targets[pos] = self._targets[i]
+            weights[pos] = self._weights[i]
+            cursor[u] = pos + 1
+
+        graph = CSRGraph(self.labels, offsets, targets, weights, self.is_directed)
+        graph._ids = self._ids
+        self._sources = array('i')
+        self._targets = array('i')
+        self._weights = array('d')
+        return graph
+
+    @classmethod
+    def from_adjacency(cls, adjacency: Mapping, is_directed: bool = True) -> CSRGraph:
+        """
+        Convierte una lista de adyacencia a CSR.
+
+        Las aristas se copian tal cual; si el diccionario es no dirigido ya
+        contiene ambas direcciones, por lo que no se vuelven a duplicar.
+        """
+        builder = cls(is_directed=True)
+        for from_vertex, neighbors in adjacency.items():
+            for to_vertex, weight in neighbors:
+                builder.add_edge(from_vertex, to_vertex, weight)
+        graph = builder.build()
+        graph.is_directed = is_directed
+        return graph
+
+
+def as_csr(graph: Mapping, is_directed: bool = True) -> CSRGraph:
+    """Devuelve el grafo como CSRGraph, convirtiéndolo solo si hace falta."""
+    if isinstance(graph, CSRGraph):
+        return graph
+    if isinstance(graph, UndirectedCSRGraph):
+        return graph.to_csr()
+    return CSRBuilder.from_adjacency(graph, is_directed)
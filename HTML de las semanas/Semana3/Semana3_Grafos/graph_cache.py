@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Caché binaria de grafos - Semana 3
+Guarda un CSRGraph junto al archivo de aristas y lo abre con mmap
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Callable, Optional, Tuple
+
+from csr_graph import CSRGraph
+
+MAGIC = b"CSRG"
+VERSION = 1
+FLAG_DIRECTED = 1
+FLAG_BIG_ENDIAN = 2
+
+# magic, versión, flags, tamaño y mtime del origen, sha256, V, E, bytes de etiquetas
+HEADER = struct.Struct("<4sII4xQq32sQQQ")
+
+# (tamaño, mtime_ns, sha256) del archivo de aristas
+SourceStamp = Tuple[int, int, bytes]
+
+
+class LabelTable(Sequence):
+    """
+    Etiquetas de vértices sobre un buffer UTF-8, decodificadas bajo demanda.
+
+    Evita crear V cadenas al abrir la caché: solo se decodifican las
+    etiquetas que se consultan.
+    """
+
+    def __init__(self, offsets: Sequence[int], blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __getitem__(self, vid):
+        if isinstance(vid, slice):
+            return [self[i] for i in range(*vid.indices(len(self)))]
+        if vid < 0:
+            vid += len(self)
+        return str(self._blob[self._offsets[vid]:self._offsets[vid + 1]], 'utf-8')
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+def cache_path_for(file_path: str, is_directed: bool) -> str:
+    """Ruta de la caché binaria que acompaña a un archivo de aristas."""
+    return f"{file_path}.{'d' if is_directed else 'u'}.csr"
+
+
+def _file_hash(file_path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as source:
+        for chunk in iter(lambda: source.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def source_stamp(file_path: str) -> SourceStamp:
+    """Tamaño, mtime y hash de contenido del archivo de aristas."""
+    info = os.stat(file_path)
+    return info.st_size, info.st_mtime_ns, _file_hash(file_path)
+
+
+def _padding(size: int) -> bytes:
+    return bytes(-size % 8)
+
+
+def write_snapshot(graph: CSRGraph, path: str, stamp: SourceStamp):
+    """
+    Escribe el grafo en formato binario de forma atómica.
+
+    Secciones (alineadas a 8 bytes): offsets (int64), pesos (float64),
+    destinos (int32), offsets de etiquetas (int64) y etiquetas en UTF-8.
+    Si la escritura falla se borra el archivo temporal.
+    """
+    encoded = [label.encode('utf-8') for label in graph.labels]
+    label_offsets = array('q', [0])
+    for label in encoded:
+        label_offsets.append(label_offsets[-1] + len(label))
+    blob = b"".join(encoded)
+
+    flags = (FLAG_DIRECTED if graph.is_directed else 0) | \
+        (FLAG_BIG_ENDIAN if sys.byteorder == 'big' else 0)
+    size, mtime_ns, digest = stamp
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(tmp_path, 'wb') as out:
+            out.write(HEADER.pack(MAGIC, VERSION, flags, size, mtime_ns, digest,
+                                  graph.num_vertices, graph.num_edges, len(blob)))
+            for section in (graph.offsets, graph.weights, graph.targets, label_offsets):
+                data = memoryview(section).cast('B')
+                out.write(data)
+                out.write(_padding(len(data)))
+            out.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _section_size(itemsize: int, count: int) -> int:
+    size = itemsize * count
+    return size + len(_padding(size))
+
+
+def open_snapshot(path: str) -> CSRGraph:
+    """
+    Abre una caché binaria con mmap sin copiar los arreglos.
+
+    El CSRGraph resultante lee offsets, destinos y pesos directamente del
+    archivo mapeado; el mapa se mantiene vivo mientras viva el grafo.
+
+    Raises:
+        ValueError: si el archivo no es una caché válida o está truncado
+    """
+    with open(path, 'rb') as snapshot:
+        if os.fstat(snapshot.fileno()).st_size < HEADER.size:
+            raise ValueError(f"'{path}' está truncada")
+        mapped = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, flags, _, _, _, num_vertices, num_edges, blob_size = \
+        HEADER.unpack_from(mapped, 0)
+    expected = (HEADER.size + 2 * _section_size(8, num_vertices + 1)
+                + _section_size(8, num_edges) + _section_size(4, num_edges) + blob_size)
+    problem = None
+    if magic != MAGIC or version != VERSION:
+        problem = "no es una caché de grafo válida"
+    elif bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == 'big'):
+        problem = "fue escrita con otro orden de bytes"
+    elif len(mapped) < expected:
+        problem = "está truncada"
+    if problem is not None:
+        mapped.close()
+        raise ValueError(f"'{path}' {problem}")
+
+    view = memoryview(mapped)
+    position = HEADER.size
+
+    def section(fmt: str, count: int) -> memoryview:
+        nonlocal position
+        size = struct.calcsize(fmt) * count
+        data = view[position:position + size].cast(fmt)
+        position += size + len(_padding(size))
+        return data
+
+    offsets = section('q', num_vertices + 1)
+    weights = section('d', num_edges)
+    targets = section('i', num_edges)
+    label_offsets = section('q', num_vertices + 1)
+    labels = LabelTable(label_offsets, view[position:position + blob_size])
+
+    graph = CSRGraph(labels, offsets, targets, weights, bool(flags & FLAG_DIRECTED))
+    graph._snapshot = mapped
+    return graph
+
+
+def _read_stamp(path: str) -> Optional[SourceStamp]:
+    try:
+        with open(path, 'rb') as snapshot:
+            header = snapshot.read(HEADER.size)
+    except OSError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, version, _, size, mtime_ns, digest, _, _, _ = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return size, mtime_ns, digest
+
+
+def _refresh_mtime(path: str, mtime_ns: int):
+    """Actualiza el mtime guardado cuando el contenido no cambió (p.ej. touch)."""
+    with open(path, 'r+b') as snapshot:
+        header = bytearray(snapshot.read(HEADER.size))
+        fields = list(HEADER.unpack(header))
+        fields[4] = mtime_ns
+        snapshot.seek(0)
+        snapshot.write(HEADER.pack(*fields))
+
+
+def stamp_matches(file_path: str, stamp: SourceStamp) -> Tuple[bool, bool]:
+    """
+    Compara un archivo de aristas con un sello guardado.
+
+    Si tamaño y mtime coinciden se acepta sin leer el origen; si solo cambió
+    el mtime se compara el hash del contenido.
+
+    Returns:
+        (coincide, mtime_cambiado)
+    """
+    info = os.stat(file_path)
+    size, mtime_ns, digest = stamp
+    if info.st_size != size:
+        return False, True
+    if info.st_mtime_ns == mtime_ns:
+        return True, False
+    return _file_hash(file_path) == digest, True
+
+
+def is_snapshot_fresh(file_path: str, path: str) -> bool:
+    """Indica si la caché corresponde al archivo de aristas actual."""
+    cached = _read_stamp(path)
+    if cached is None:
+        return False
+    matches, mtime_changed = stamp_matches(file_path, cached)
+    if matches and mtime_changed:
+        try:
+            _refresh_mtime(path, os.stat(file_path).st_mtime_ns)
+        except OSError:
+            pass
+    return matches
+
+
+def load_cached_graph(file_path: str, is_directed: bool,
+                      build: Callable[[], CSRGraph],
+                      complete: Callable[[], bool] = lambda: True) -> CSRGraph:
+    """
+    Devuelve el grafo desde la caché binaria, reconstruyéndola si está obsoleta.
+
+    Args:
+        file_path: Ruta al archivo de aristas
+        is_directed: True para grafo dirigido, False para no dirigido
+        build: Función que parsea el archivo de texto y devuelve un CSRGraph
+        complete: Se consulta después de build; si devuelve False (la
+            lectura se cortó con un error) el grafo parcial no se guarda
+
+    Returns:
+        CSRGraph respaldado por mmap (o el recién construido si no se pudo
+        escribir o quedó incompleto)
+    """
+    path = cache_path_for(file_path, is_directed)
+    if not os.path.exists(file_path):
+        return build()
+
+    if is_snapshot_fresh(file_path, path):
+        try:
+            return open_snapshot(path)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"⚠️  Caché '{path}' inválida, reconstruyendo: {e}")
+
+    stamp = source_stamp(file_path)
+    graph = build()
+    if not complete():
+        return graph
+    try:
+        write_snapshot(graph, path, stamp)
+    except OSError as e:
+        print(f"⚠️  No se pudo escribir la caché '{path}': {e}")
+        return graph
+    return open_snapshot(path)
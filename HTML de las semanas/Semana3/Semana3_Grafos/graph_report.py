@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Escritura de reportes - Semana 3
+Salida con buffer en texto, JSON lines o CSV
+"""
+
+import csv
+import io
+import json
+import sys
+from typing import Dict, List, Optional, TextIO, Union
+
+REPORT_FORMATS = ("text", "jsonl", "csv")
+
+# Líneas acumuladas antes de escribir al destino
+DEFAULT_BUFFER_LINES = 4096
+
+
+class ReportWriter:
+    """
+    Acumula líneas del reporte y las escribe en bloques.
+
+    En lugar de un print por línea, las líneas se juntan en memoria y se
+    escriben con un solo write cada ``buffer_lines`` líneas. El reporte emite
+    a la vez líneas de texto (``text``) y registros estructurados
+    (``record``); cada formato usa solo los que le corresponden.
+    """
+
+    def __init__(self, output: Union[str, TextIO, None] = None,
+                 buffer_lines: int = DEFAULT_BUFFER_LINES):
+        """
+        Args:
+            output: Ruta de archivo, stream abierto, o None para sys.stdout
+            buffer_lines: Líneas a acumular antes de cada escritura
+        """
+        if isinstance(output, str):
+            self._stream = open(output, 'w', encoding='utf-8', newline='')
+            self._owns_stream = True
+        else:
+            self._stream = output if output is not None else sys.stdout
+            self._owns_stream = False
+        self._buffer: List[str] = []
+        self._buffer_lines = buffer_lines
+
+    def _emit(self, line: str):
+        self._buffer.append(line)
+        if len(self._buffer) >= self._buffer_lines:
+            self.flush()
+
+    def text(self, line: str = ""):
+        """Línea del reporte legible (se ignora en formatos estructurados)."""
+
+    def record(self, kind: str, fields: Dict[str, object]):
+        """Registro estructurado (se ignora en formato texto)."""
+
+    def flush(self):
+        if self._buffer:
+            self._stream.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._stream.flush()
+
+    def close(self):
+        self.flush()
+        if self._owns_stream:
+            self._stream.close()
+
+    def __enter__(self) -> 'ReportWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TextReportWriter(ReportWriter):
+    """Reporte legible con el formato de siempre de analyze_graph."""
+
+    def text(self, line: str = ""):
+        self._emit(line)
+
+
+class JsonLinesReportWriter(ReportWriter):
+    """Un objeto JSON por línea, con el campo 'kind' indicando el tipo."""
+
+    def record(self, kind: str, fields: Dict[str, object]):
+        self._emit(json.dumps({"kind": kind, **fields}, ensure_ascii=False))
+
+
+class CsvReportWriter(ReportWriter):
+    """
+    CSV con columnas fijas.
+
+    Los registros de vértices y del top ocupan una fila; los registros de
+    resumen se expanden a una fila por métrica (columnas metric/value).
+    """
+
+    COLUMNS = ("kind", "vertex", "out_degree", "in_degree", "neighbors", "metric", "value")
+    SUMMARY_KINDS = ("summary", "structure")
+
+    def __init__(self, output: Union[str, TextIO, None] = None,
+                 buffer_lines: int = DEFAULT_BUFFER_LINES):
+        super().__init__(output, buffer_lines)
+        self._emit(",".join(self.COLUMNS))
+
+    def _row(self, values: Dict[str, object]):
+        line = io.StringIO()
+        csv.writer(line, lineterminator="").writerow(
+            [values.get(column, "") for column in self.COLUMNS])
+        self._emit(line.getvalue())
+
+    def record(self, kind: str, fields: Dict[str, object]):
+        if kind in self.SUMMARY_KINDS:
+            for metric, value in fields.items():
+                if isinstance(value, list):
+                    value = " ".join(str(item) for item in value)
+                self._row({"kind": kind, "metric": metric, "value": value})
+            return
+
+        values = dict(fields, kind=kind)
+        neighbors = values.get("neighbors")
+        if isinstance(neighbors, list):
+            values["neighbors"] = " ".join(f"{neighbor}:{weight}" for neighbor, weight in neighbors)
+        self._row(values)
+
+
+def open_report(fmt: str = "text", output: Union[str, TextIO, None] = None,
+                buffer_lines: int = DEFAULT_BUFFER_LINES) -> ReportWriter:
+    """Crea el escritor de reportes para un formato ('text', 'jsonl' o 'csv')."""
+    writers = {"text": TextReportWriter, "jsonl": JsonLinesReportWriter, "csv": CsvReportWriter}
+    if fmt not in writers:
+        raise ValueError(f"Formato '{fmt}' inválido; use uno de {REPORT_FORMATS}")
+    return writers[fmt](output, buffer_lines)
+
+
+def page_bounds(total: int, page: int, page_size: int) -> Optional[range]:
+    """Rango de posiciones de una página (1-based), o None si está fuera de rango."""
+    if page < 1 or page_size < 1:
+        raise ValueError("page y page_size deben ser >= 1")
+    start = (page - 1) * page_size
+    if start >= total:
+        return None
+    return range(start, min(start + page_size, total))
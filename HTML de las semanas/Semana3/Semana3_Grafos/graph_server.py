@@ -0,0 +1,538 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor de consultas de grafos - Semana 3
+Mantiene grafos cargados en memoria y responde consultas HTTP con asyncio
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+import traceback
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from analyze_graph import (Graph, ParseDiagnostics, build_degree_index, build_edge_index,
+                           calculate_total_weight, count_edges, load_graph)
+from csr_graph import UndirectedCSRGraph
+from graph_sketch import QuantileSketch
+from shortest_paths import INFINITY, DijkstraEngine
+
+OPERATIONS = ("info", "degree", "neighbors", "has_edge", "total_weight", "shortest_path")
+
+DEFAULT_PORT = 8765
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 256
+MAX_BODY_BYTES = 16 * 2**20
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 413: "Payload Too Large",
+                500: "Internal Server Error"}
+
+
+class QueryError(Exception):
+    """Consulta inválida: vértice, grafo u operación desconocidos o argumentos faltantes."""
+
+
+class GraphState:
+    """
+    Un grafo cargado con sus índices listos para consultar.
+
+    Es inmutable una vez publicado: al recargar se construye otro estado y se
+    reemplaza, así las consultas en curso terminan sobre la versión anterior.
+    """
+
+    def __init__(self, graph: Graph, is_directed: bool, mtime_ns: int, size: int,
+                 diagnostics: ParseDiagnostics):
+        self.graph = graph
+        self.is_directed = is_directed
+        self.degree_index = build_degree_index(graph)
+        self.edge_index = build_edge_index(graph)
+        self.total_weight = calculate_total_weight(graph, is_directed)
+        self.num_edges = count_edges(graph, is_directed, self.degree_index)
+        self.num_vertices = len(self.degree_index.vertices())
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.parse_problems = diagnostics.total_problems
+        self.loaded_at = time.time()
+        # Lo que las consultas construirían la primera vez se arma aquí,
+        # fuera del event loop: el índice inverso de neighbors y el CSR
+        # con ambos sentidos que usa Dijkstra
+        if isinstance(graph, UndirectedCSRGraph):
+            graph._reverse_index()
+        self._engine: Optional[DijkstraEngine] = None
+        self._engine_error = ""
+        try:
+            self._engine = DijkstraEngine(graph, is_directed)
+        except ValueError as e:  # pesos negativos: el resto de las consultas sigue sirviendo
+            self._engine_error = str(e)
+
+    def engine(self) -> DijkstraEngine:
+        if self._engine is None:
+            raise QueryError(self._engine_error)
+        return self._engine
+
+    def vertex_exists(self, vertex: str) -> bool:
+        index = self.degree_index
+        return vertex in index.out_degrees or vertex in index.in_degrees
+
+
+def load_state(file_path: str, is_directed: bool) -> GraphState:
+    """
+    Carga un archivo como GraphState (se ejecuta fuera del event loop).
+
+    Los no dirigidos se guardan con single_copy, igual que en analyze_graph,
+    y GraphState deja listos sus índices para que ninguna consulta los
+    construya en el event loop.
+
+    Raises:
+        ValueError: si algún peso no es finito ('nan' o 'inf' pasan por
+            float() pero no se pueden responder en JSON)
+    """
+    stat = os.stat(file_path)
+    diagnostics = ParseDiagnostics("silent")
+    graph = load_graph(file_path, is_directed, compact=True, single_copy=not is_directed,
+                       diagnostics=diagnostics)
+    if not all(map(math.isfinite, graph.weights)):
+        raise ValueError("el archivo tiene pesos no finitos (nan o inf)")
+    return GraphState(graph, is_directed, stat.st_mtime_ns, stat.st_size, diagnostics)
+
+
+def _solve_paths(state: GraphState,
+                 pairs: List[Tuple[str, str]]) -> List[Tuple[bool, object]]:
+    """Resuelve un lote de caminos; los pares con vértices inexistentes dan error."""
+    valid = [pair for pair in pairs if state.vertex_exists(pair[0]) and state.vertex_exists(pair[1])]
+    solved = iter(state.engine().batch_shortest_paths(valid))
+    results = []
+    for source, target in pairs:
+        if not (state.vertex_exists(source) and state.vertex_exists(target)):
+            missing = source if not state.vertex_exists(source) else target
+            results.append((False, f"El vértice '{missing}' no existe en el grafo"))
+            continue
+        distance, path = next(solved)
+        results.append((True, {"distance": None if distance == INFINITY else distance,
+                               "path": path}))
+    return results
+
+
+class OperationMetrics:
+    """Latencias de una operación en milisegundos, con cuantiles aproximados."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.latencies = QuantileSketch(0.01)
+
+    def record(self, milliseconds: float, ok: bool):
+        self.calls += 1
+        self.errors += 0 if ok else 1
+        self.total_ms += milliseconds
+        self.latencies.add(milliseconds)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": self.total_ms / self.calls if self.calls else 0.0,
+            "p50_ms": self.latencies.quantile(0.5),
+            "p95_ms": self.latencies.quantile(0.95),
+            "p99_ms": self.latencies.quantile(0.99),
+            "max_ms": self.latencies.maximum if self.calls else None,
+        }
+
+
+class GraphEntry:
+    """
+    Grafo con nombre servido por el servidor.
+
+    Guarda el GraphState vigente y agrupa las consultas de caminos: las que
+    llegan dentro de ``batch_window`` segundos se resuelven juntas con
+    DijkstraEngine.batch_shortest_paths en un hilo, así un origen repetido
+    calcula su árbol una vez y el event loop sigue atendiendo.
+    """
+
+    def __init__(self, name: str, file_path: str, is_directed: bool,
+                 batch_window: float = DEFAULT_BATCH_WINDOW, max_batch: int = DEFAULT_MAX_BATCH):
+        self.name = name
+        self.file_path = file_path
+        self.is_directed = is_directed
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.state: Optional[GraphState] = None
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        self.batches = 0
+        self.batched_queries = 0
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._drainer: Optional[asyncio.Task] = None
+        self._reload_lock = asyncio.Lock()
+
+    def info(self) -> Dict[str, object]:
+        info = {"name": self.name, "file": self.file_path, "directed": self.is_directed,
+                "loaded": self.state is not None, "reloads": self.reloads,
+                "last_error": self.last_error}
+        state = self.state
+        if state is not None:
+            info.update({"vertices": state.num_vertices,
+                         "edges": state.num_edges,
+                         "total_weight": state.total_weight,
+                         "parse_problems": state.parse_problems,
+                         "loaded_at": state.loaded_at})
+        return info
+
+    def is_stale(self) -> bool:
+        """True si el archivo cambió (mtime o tamaño) desde la última carga."""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False  # sin archivo se sigue sirviendo la última versión
+        state = self.state
+        return state is None or (stat.st_mtime_ns, stat.st_size) != (state.mtime_ns, state.size)
+
+    async def reload(self, force: bool = False) -> bool:
+        """
+        Recarga el grafo en un hilo si el archivo cambió (o siempre con force).
+
+        Si la carga falla se conserva la versión anterior y se guarda el error.
+        """
+        async with self._reload_lock:
+            if not force and not self.is_stale():
+                return False
+            loop = asyncio.get_running_loop()
+            try:
+                state = await loop.run_in_executor(None, load_state,
+                                                   self.file_path, self.is_directed)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"⚠️  No se pudo cargar '{self.name}' ({self.file_path}): {self.last_error}")
+                return False
+            first = self.state is None
+            self.state = state
+            self.last_error = None
+            if not first:
+                self.reloads += 1
+            print(f"{'📂' if first else '🔄'} '{self.name}': {state.num_vertices} "
+                  f"vértices, {state.num_edges} aristas")
+            return True
+
+    def current(self) -> GraphState:
+        if self.state is None:
+            raise QueryError(f"El grafo '{self.name}' no está cargado: {self.last_error}")
+        return self.state
+
+    async def shortest_path(self, source: str, target: str) -> object:
+        """Encola la consulta en el lote en curso y espera su resultado."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((source, target, future))
+        if self._drainer is None:
+            self._drainer = asyncio.create_task(self._drain())
+        ok, value = await future
+        if not ok:
+            raise QueryError(value)
+        return value
+
+    async def _drain(self):
+        """Resuelve los lotes pendientes de a uno (DijkstraEngine no es reentrante)."""
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending:
+                if len(self._pending) < self.max_batch:
+                    await asyncio.sleep(self.batch_window)
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                try:
+                    state = self.current()
+                    results = await loop.run_in_executor(
+                        None, _solve_paths, state, [(source, target) for source, target, _ in batch])
+                except Exception as e:
+                    message = str(e) if isinstance(e, QueryError) else f"{type(e).__name__}: {e}"
+                    results = [(False, message)] * len(batch)
+                self.batches += 1
+                self.batched_queries += len(batch)
+                for (_, _, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._drainer = None
+
+
+def _content_length(value: str) -> Optional[int]:
+    """Largo del cuerpo según la cabecera (0 si falta), o None si no es un entero >= 0."""
+    if not value:
+        return 0
+    try:
+        length = int(value)
+    except ValueError:
+        return None
+    return length if length >= 0 else None
+
+
+def _encode(payload: object) -> bytes:
+    """Cuerpo JSON de una respuesta; lanza ValueError ante NaN o infinitos."""
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, default=str).encode('utf-8')
+
+
+def _error_body(message: str) -> bytes:
+    return _encode({"ok": False, "error": message})
+
+
+def _require(query: Dict[str, object], *fields: str) -> List[str]:
+    values = []
+    for field in fields:
+        value = query.get(field)
+        if not isinstance(value, str) or not value:
+            raise QueryError(f"Falta el campo '{field}'")
+        values.append(value)
+    return values
+
+
+class GraphServer:
+    """
+    Servidor HTTP/1.1 mínimo sobre asyncio con grafos residentes.
+
+    Rutas:
+        GET  /graphs                  grafos servidos y su estado
+        GET  /metrics                 latencias por operación y lotes
+        GET  /query?graph=g&op=...    una consulta con parámetros en la URL
+        POST /query                   una consulta JSON o una lista (lote)
+        POST /reload?graph=g          fuerza la recarga de un grafo
+
+    Cada consulta es un objeto con 'graph', 'op' y los argumentos de la
+    operación ('vertex' para degree y neighbors, 'from' y 'to' para has_edge
+    y shortest_path). Las operaciones con índice (O(1)) se responden en el
+    event loop; los caminos pasan por el lote de su grafo.
+    """
+
+    def __init__(self, entries: List[GraphEntry], poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.entries = {entry.name: entry for entry in entries}
+        self.poll_interval = poll_interval
+        self.metrics: Dict[str, OperationMetrics] = {op: OperationMetrics() for op in OPERATIONS}
+        self.started = time.time()
+        self.requests = 0
+
+    async def load_all(self):
+        await asyncio.gather(*(entry.reload(force=True) for entry in self.entries.values()))
+
+    async def watch(self):
+        """Revisa cada poll_interval segundos si algún archivo cambió."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            for entry in self.entries.values():
+                if entry.is_stale():
+                    await entry.reload()
+
+    # --- Consultas ---
+
+    async def query(self, query: object) -> Dict[str, object]:
+        """Resuelve una consulta y registra su latencia; los errores van en la respuesta."""
+        started = time.perf_counter()
+        op = query.get("op") if isinstance(query, dict) else None
+        try:
+            if not isinstance(query, dict):
+                raise QueryError("Cada consulta debe ser un objeto JSON")
+            response = {"ok": True, "result": await self._dispatch(query)}
+        except QueryError as e:
+            response = {"ok": False, "error": str(e)}
+        if op in self.metrics:
+            self.metrics[op].record((time.perf_counter() - started) * 1000, response["ok"])
+        return response
+
+    async def _dispatch(self, query: Dict[str, object]) -> object:
+        name, op = _require(query, "graph", "op")
+        entry = self.entries.get(name)
+        if entry is None:
+            raise QueryError(f"No existe el grafo '{name}'")
+        if op not in OPERATIONS:
+            raise QueryError(f"Operación desconocida '{op}' (válidas: {', '.join(OPERATIONS)})")
+        if op == "shortest_path":
+            source, target = _require(query, "from", "to")
+            return await entry.shortest_path(source, target)
+
+        state = entry.current()
+        if op == "info":
+            return entry.info()
+        if op == "total_weight":
+            return state.total_weight
+        if op == "has_edge":
+            source, target = _require(query, "from", "to")
+            return state.edge_index.contains(source, target)
+
+        (vertex,) = _require(query, "vertex")
+        if not state.vertex_exists(vertex):
+            raise QueryError(f"El vértice '{vertex}' no existe en el grafo")
+        if op == "neighbors":
+            return [[neighbor, weight] for neighbor, weight in state.graph.get(vertex, ())]
+        index = state.degree_index
+        if not state.is_directed:
+            return {"degree": index.out_degree(vertex)}
+        return {"out": index.out_degree(vertex), "in": index.in_degree(vertex),
+                "total": index.total_degree(vertex)}
+
+    def metrics_summary(self) -> Dict[str, object]:
+        """Latencias por operación, lotes de caminos y recargas por grafo."""
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "requests": self.requests,
+            "operations": {op: metrics.as_dict() for op, metrics in self.metrics.items()
+                           if metrics.calls},
+            "graphs": {name: {"reloads": entry.reloads, "path_batches": entry.batches,
+                              "batched_queries": entry.batched_queries}
+                       for name, entry in self.entries.items()},
+        }
+
+    # --- HTTP ---
+
+    async def _route(self, method: str, target: str, body: bytes) -> Tuple[int, object]:
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        if url.path == "/graphs" and method == "GET":
+            return 200, [entry.info() for entry in self.entries.values()]
+        if url.path == "/metrics" and method == "GET":
+            return 200, self.metrics_summary()
+        if url.path == "/reload" and method == "POST":
+            entry = self.entries.get(params.get("graph", ""))
+            if entry is None:
+                return 404, {"ok": False, "error": f"No existe el grafo '{params.get('graph')}'"}
+            reloaded = await entry.reload(force=True)
+            return 200, {"ok": reloaded, "graph": entry.info()}
+        if url.path == "/query":
+            if method == "GET":
+                return 200, await self.query(params)
+            if method == "POST":
+                try:
+                    payload = json.loads(body or b"null")
+                except ValueError as e:
+                    return 400, {"ok": False, "error": f"JSON inválido: {e}"}
+                if isinstance(payload, list):
+                    # Las consultas del lote corren juntas y los caminos se agrupan
+                    return 200, list(await asyncio.gather(*(self.query(item) for item in payload)))
+                return 200, await self.query(payload)
+            return 405, {"ok": False, "error": f"Método {method} no permitido"}
+        return 404, {"ok": False, "error": f"Ruta desconocida '{url.path}'"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atiende una conexión HTTP/1.1, con keep-alive."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, _error_body("Petición inválida"), False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode('latin-1').partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                # Sin un largo válido no se sabe dónde termina el cuerpo: se cierra
+                length = _content_length(headers.get("content-length", ""))
+                if length is None:
+                    await self._respond(writer, 400, _error_body("Content-Length inválido"), False)
+                    break
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, _error_body("Cuerpo demasiado grande"), False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                self.requests += 1
+                try:
+                    status, payload = await self._route(method, target, body)
+                    response = _encode(payload)
+                except Exception as e:
+                    print(f"❌ Error inesperado en {method} {target}: {type(e).__name__}: {e}")
+                    traceback.print_exc()
+                    status = 500
+                    response = _error_body("Error interno del servidor")
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, body: bytes, keep_alive: bool):
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                    unix_path: Optional[str] = None):
+        """Carga los grafos y atiende hasta que se cancela."""
+        await self.load_all()
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_path)
+            where = unix_path
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            where = f"http://{host}:{port}"
+        watcher = asyncio.create_task(self.watch())
+        print(f"🚀 Servidor de grafos escuchando en {where}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+def _parse_graph_spec(spec: str) -> Tuple[str, str]:
+    name, separator, path = spec.partition("=")
+    if not separator:
+        path = spec
+        name = os.path.splitext(os.path.basename(spec))[0]
+    return name, path
+
+
+def main():
+    """Punto de entrada del servidor de grafos."""
+    parser = argparse.ArgumentParser(description="Servidor de consultas de grafos en memoria")
+    parser.add_argument("graphs", nargs="*", metavar="NOMBRE=ARCHIVO",
+                        help="Grafos dirigidos a servir (sin nombre, se usa el del archivo)")
+    parser.add_argument("-u", "--undirected", action="append", default=[], metavar="NOMBRE=ARCHIVO",
+                        help="Grafos no dirigidos a servir (repetible)")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección donde escuchar")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Puerto HTTP")
+    parser.add_argument("--unix", metavar="RUTA", help="Escuchar en un socket Unix en lugar de TCP")
+    parser.add_argument("--poll", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="Segundos entre revisiones de cambios en los archivos")
+    parser.add_argument("--batch-window", type=float, default=DEFAULT_BATCH_WINDOW,
+                        help="Segundos que se esperan para agrupar consultas de caminos")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help="Máximo de consultas de caminos por lote")
+    args = parser.parse_args()
+
+    entries = []
+    for specs, is_directed in ((args.graphs, True), (args.undirected, False)):
+        for spec in specs:
+            name, path = _parse_graph_spec(spec)
+            entries.append(GraphEntry(name, path, is_directed, args.batch_window, args.max_batch))
+    if not entries:
+        parser.error("indica al menos un grafo a servir")
+    if len({entry.name for entry in entries}) != len(entries):
+        parser.error("los nombres de los grafos deben ser únicos")
+
+    server = GraphServer(entries, args.poll)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("\n👋 Servidor detenido")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+Análisis aproximado con sketches - Semana 3
+Perfil de archivos de aristas enormes en una pasada y memoria fija
+"""
+
+import argparse
+import hashlib
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+
+from analyze_graph import ParseDiagnostics, iter_edges
+
+DEFAULT_DISTINCT_ERROR = 0.01
+DEFAULT_HEAVY_HITTER_ERROR = 0.0001
+DEFAULT_QUANTILE_ERROR = 0.01
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _hash64(label: str) -> int:
+    """Hash de 64 bits estable entre procesos (hash() cambia con PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(label.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class HyperLogLog:
+    """
+    Estimador de elementos distintos con 2^p registros de un byte.
+
+    El error relativo típico es 1.04 / sqrt(2^p); p se elige a partir del
+    error pedido. Para pocos elementos usa conteo lineal, que es exacto
+    en la práctica.
+    """
+
+    def __init__(self, error: float = DEFAULT_DISTINCT_ERROR):
+        self.precision = min(18, max(4, math.ceil(2 * math.log2(1.04 / error))))
+        self.num_registers = 1 << self.precision
+        self.registers = bytearray(self.num_registers)
+
+    @property
+    def error(self) -> float:
+        """Error relativo típico (una desviación estándar)."""
+        return 1.04 / math.sqrt(self.num_registers)
+
+    def add_hash(self, value: int):
+        index = value & (self.num_registers - 1)
+        rest = value >> self.precision
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, label: str):
+        self.add_hash(_hash64(label))
+
+    def estimate(self) -> float:
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # conteo lineal para cardinalidades bajas
+        return raw
+
+
+class SpaceSaving:
+    """
+    Heavy hitters con el algoritmo Space-Saving y ``capacity`` contadores.
+
+    Cada conteo estimado sobreestima el real en a lo sumo ``error_of(item)``,
+    que nunca supera N / capacity (N = total de incrementos). El mínimo se
+    mantiene con un heap perezoso: las entradas desactualizadas se corrigen
+    al llegar a la cima.
+    """
+
+    def __init__(self, error: float = DEFAULT_HEAVY_HITTER_ERROR):
+        self.capacity = max(1, math.ceil(1 / error))
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+        self.total = 0
+
+    def add(self, item: str, amount: int = 1):
+        self.total += amount
+        counts = self.counts
+        if item in counts:
+            counts[item] += amount
+            return
+        if len(counts) < self.capacity:
+            counts[item] = amount
+            self.errors[item] = 0
+            heapq.heappush(self._heap, (amount, item))
+            return
+
+        heap = self._heap
+        while True:
+            count, victim = heap[0]
+            current = counts[victim]
+            if count == current:
+                break
+            heapq.heapreplace(heap, (current, victim))
+        heapq.heapreplace(heap, (current + amount, item))
+        del counts[victim]
+        del self.errors[victim]
+        counts[item] = current + amount
+        self.errors[item] = current
+
+    @property
+    def max_error(self) -> float:
+        """Cota del error de cualquier conteo: N / capacity."""
+        return self.total / self.capacity
+
+    def top(self, k: int) -> List[Tuple[str, int, int]]:
+        """Los k elementos de mayor conteo estimado: (elemento, conteo, error máximo)."""
+        best = heapq.nsmallest(k, self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return [(item, count, self.errors[item]) for item, count in best]
+
+
+class QuantileSketch:
+    """
+    Sketch de cuantiles con error relativo acotado (estilo DDSketch).
+
+    Cada valor positivo cae en la cubeta ceil(log_gamma(x)), con
+    gamma = (1 + a) / (1 - a); el cuantil devuelto está a menos de un factor
+    ``a`` del valor real. Si se superan ``max_buckets`` cubetas se funden
+    las más bajas, así la memoria queda fija y solo pierden precisión los
+    cuantiles más bajos.
+    """
+
+    def __init__(self, error: float = DEFAULT_QUANTILE_ERROR, max_buckets: int = 2048):
+        self.relative_error = error
+        self.gamma = (1 + error) / (1 - error)
+        self._log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float):
+        self.count += 1
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        if value > 0:
+            buckets, key = self.positive, self._key(value)
+        elif value < 0:
+            buckets, key = self.negative, self._key(-value)
+        else:
+            self.zeros += 1
+            return
+        buckets[key] = buckets.get(key, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self._collapse(buckets)
+
+    def _collapse(self, buckets: Dict[int, int]):
+        lowest, second = heapq.nsmallest(2, buckets)
+        buckets[second] += buckets.pop(lowest)
+
+    def _value_at(self, index: int) -> float:
+        """Valor aproximado del elemento ``index`` (desde 0) en orden creciente."""
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > index:
+                return max(self.minimum, -self._value(key))
+        seen += self.zeros
+        if seen > index:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > index:
+                return min(self.maximum, self._value(key))
+        return self.maximum
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Valor aproximado del cuantil q (entre 0 y 1), o None si está vacío.
+
+        Usa la misma convención que np.percentile (y weight_summary): el
+        rango q(n - 1) se interpola linealmente entre los dos elementos que
+        lo rodean.
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        lower = math.floor(rank)
+        low = self._value_at(lower)
+        if rank == lower:
+            return low
+        return low + (self._value_at(lower + 1) - low) * (rank - lower)
+
+
+class SketchStats:
+    """Resultado de sketch_graph_stats: conteos exactos y estimaciones con sus cotas."""
+
+    def __init__(self, file_path: str, is_directed: bool, distinct: HyperLogLog,
+                 degrees: SpaceSaving, weights: QuantileSketch):
+        self.file_path = file_path
+        self.is_directed = is_directed
+        self.distinct = distinct
+        self.degrees = degrees
+        self.weights = weights
+        self.num_edges = 0
+        self.total_weight = 0.0
+        self.lines_read = 0
+
+    @property
+    def num_vertices(self) -> float:
+        return self.distinct.estimate()
+
+    @property
+    def density(self) -> float:
+        """Densidad estimada con la misma fórmula que analyze_graph."""
+        vertices = self.num_vertices
+        max_possible_edges = vertices * (vertices - 1)
+        if not self.is_directed:
+            max_possible_edges /= 2
+        return self.num_edges / max_possible_edges if max_possible_edges > 0 else 0.0
+
+    def summary(self, top_n: int = 10,
+                quantiles=DEFAULT_QUANTILES) -> Dict[str, object]:
+        """Resumen estructurado (serializable a JSON)."""
+        return {
+            "file": self.file_path,
+            "directed": self.is_directed,
+            "lines_read": self.lines_read,
+            "edges": self.num_edges,
+            "total_weight": self.total_weight,
+            "vertices_estimate": round(self.num_vertices),
+            "vertices_relative_error": self.distinct.error,
+            "density_estimate": self.density,
+            "top_degrees": [{"vertex": vertex, "degree": degree, "max_error": error}
+                            for vertex, degree, error in self.degrees.top(top_n)],
+            "degree_max_error": self.degrees.max_error,
+            "weight_quantiles": {str(q): self.weights.quantile(q) for q in quantiles},
+            "weight_relative_error": self.weights.relative_error,
+        }
+
+
+def sketch_graph_stats(file_path: str, is_directed: bool = True,
+                       distinct_error: float = DEFAULT_DISTINCT_ERROR,
+                       heavy_hitter_error: float = DEFAULT_HEAVY_HITTER_ERROR,
+                       quantile_error: float = DEFAULT_QUANTILE_ERROR,
+                       mode: str = "lenient") -> SketchStats:
+    """
+    Perfil aproximado de un archivo de aristas en una pasada y memoria fija.
+
+    Usa las reglas de load_graph (iter_edges). Las aristas, el peso total y
+    las líneas se cuentan exactamente; los vértices distintos se estiman con
+    HyperLogLog, los vértices de mayor grado total con Space-Saving y los
+    cuantiles de peso con un sketch de error relativo. Como en
+    analyze_graph, en no dirigidos cada arista cuenta una vez en los totales
+    y suma uno al grado de cada extremo.
+
+    Args:
+        file_path: Ruta al archivo de aristas
+        is_directed: True para grafo dirigido, False para no dirigido
+        distinct_error: Error relativo típico del conteo de vértices
+        heavy_hitter_error: Error máximo de los grados, como fracción del total
+        quantile_error: Error relativo de los cuantiles de peso
+        mode: 'strict', 'lenient' o 'silent' (ver ParseDiagnostics)
+    """
+    stats = SketchStats(file_path, is_directed, HyperLogLog(distinct_error),
+                        SpaceSaving(heavy_hitter_error), QuantileSketch(quantile_error))
+    distinct, degrees, weights = stats.distinct, stats.degrees, stats.weights
+    diagnostics = ParseDiagnostics(mode)
+
+    for from_vertex, to_vertex, weight in iter_edges(file_path, diagnostics):
+        distinct.add(from_vertex)
+        distinct.add(to_vertex)
+        degrees.add(from_vertex)
+        degrees.add(to_vertex)
+        weights.add(weight)
+        stats.num_edges += 1
+        stats.total_weight += weight
+
+    stats.lines_read = diagnostics.lines_read
+    return stats
+
+
+def print_sketch_stats(stats: SketchStats, graph_type: str, top_n: int = 10):
+    """Muestra el perfil aproximado con el formato de analyze_graph."""
+    print(f"\n{'='*60}")
+    print(f"🧮 Perfil aproximado del Grafo {graph_type}")
+    print(f"{'='*60}")
+    print(f"📊 Estadísticas generales:")
+    print(f"   • Vértices: ~{stats.num_vertices:.0f} (±{stats.distinct.error * 100:.1f}%)")
+    print(f"   • Aristas: {stats.num_edges}")
+    print(f"   • Densidad: ~{stats.density:.3f}")
+    print(f"   • Peso total: {stats.total_weight:.1f} km")
+
+    print(f"\n🏆 Top {top_n} vértices por grado total (error máximo ±{stats.degrees.max_error:.0f}):")
+    for rank, (vertex, degree, error) in enumerate(stats.degrees.top(top_n), 1):
+        print(f"   {rank}. {vertex}: ~{degree}" + (f" (≥{degree - error})" if error else ""))
+
+    print(f"\n📏 Cuantiles de peso (±{stats.weights.relative_error * 100:.1f}%):")
+    for q in DEFAULT_QUANTILES:
+        value = stats.weights.quantile(q)
+        print(f"   • p{q * 100:g}: {value:.2f}" if value is not None else f"   • p{q * 100:g}: -")
+
+
+def main():
+    """Punto de entrada para perfilar archivos de aristas con sketches."""
+    parser = argparse.ArgumentParser(description="Perfil aproximado de grafos con sketches")
+    parser.add_argument("file", help="Archivo de aristas (formato edges_*.txt)")
+    parser.add_argument("--undirected", action="store_true", help="Tratar el grafo como no dirigido")
+    parser.add_argument("--distinct-error", type=float, default=DEFAULT_DISTINCT_ERROR,
+                        help="Error relativo del conteo de vértices (HyperLogLog)")
+    parser.add_argument("--heavy-hitter-error", type=float, default=DEFAULT_HEAVY_HITTER_ERROR,
+                        help="Error de los grados como fracción del total (Space-Saving)")
+    parser.add_argument("--quantile-error", type=float, default=DEFAULT_QUANTILE_ERROR,
+                        help="Error relativo de los cuantiles de peso")
+    parser.add_argument("--top", type=int, default=10, help="Vértices de mayor grado a mostrar")
+    args = parser.parse_args()
+
+    stats = sketch_graph_stats(args.file, is_directed=not args.undirected,
+                               distinct_error=args.distinct_error,
+                               heavy_hitter_error=args.heavy_hitter_error,
+                               quantile_error=args.quantile_error)
+    print_sketch_stats(stats, "NO DIRIGIDO" if args.undirected else "DIRIGIDO", args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Estadísticas en streaming - Semana 3
+Analiza archivos de aristas más grandes que la RAM en una sola pasada
+"""
+
+import argparse
+import heapq
+import os
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from analyze_graph import ParseDiagnostics, iter_edges
+
+# Vértices que se acumulan en memoria antes de volcar un bloque a disco
+DEFAULT_MAX_VERTICES_IN_MEMORY = 1_000_000
+# Bloques abiertos a la vez al fusionar (cada uno es un descriptor de archivo)
+DEFAULT_MERGE_FAN_IN = 64
+
+
+class DegreeSummary:
+    """Mínimo, máximo y promedio de un tipo de grado."""
+
+    def __init__(self):
+        self.minimum = 0
+        self.maximum = 0
+        self.total = 0
+        self.count = 0
+
+    def add(self, degree: int):
+        if self.count == 0 or degree < self.minimum:
+            self.minimum = degree
+        if degree > self.maximum:
+            self.maximum = degree
+        self.total += degree
+        self.count += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class StreamStats:
+    """Resultado de stream_graph_stats."""
+
+    def __init__(self, file_path: str, is_directed: bool):
+        self.file_path = file_path
+        self.is_directed = is_directed
+        self.num_vertices = 0
+        self.num_edges = 0
+        self.total_weight = 0.0
+        self.out_degree = DegreeSummary()
+        self.in_degree = DegreeSummary()
+        self.total_degree = DegreeSummary()
+        self.most_connected = ""
+        self.spilled_runs = 0
+        self.detail_path: Optional[str] = None
+
+    @property
+    def density(self) -> float:
+        """
+        Densidad con la misma fórmula que analyze_graph: E / V(V-1), o
+        E / (V(V-1)/2) si el grafo no es dirigido.
+        """
+        max_possible_edges = self.num_vertices * (self.num_vertices - 1)
+        if not self.is_directed:
+            max_possible_edges //= 2
+        return self.num_edges / max_possible_edges if max_possible_edges > 0 else 0.0
+
+
+def _spill(counts: Dict[str, List[int]], directory: str, run_number: int) -> str:
+    """Escribe un bloque ordenado de grados parciales y devuelve su ruta."""
+    path = os.path.join(directory, f"run_{run_number:05d}.tsv")
+    with open(path, 'w', encoding='utf-8') as run:
+        for vertex in sorted(counts):
+            out_deg, in_deg = counts[vertex]
+            run.write(f"{vertex}\t{out_deg}\t{in_deg}\n")
+    return path
+
+
+def _read_run(path: str) -> Iterator[Tuple[str, int, int]]:
+    with open(path, 'r', encoding='utf-8') as run:
+        for line in run:
+            vertex, out_deg, in_deg = line.rstrip('\n').split('\t')
+            yield vertex, int(out_deg), int(in_deg)
+
+
+def _merge_streams(streams: List[Iterator[Tuple[str, int, int]]]) -> Iterator[Tuple[str, int, int]]:
+    """Fusiona flujos ordenados por vértice, sumando los grados de cada uno."""
+    current, out_total, in_total = None, 0, 0
+    for vertex, out_deg, in_deg in heapq.merge(*streams):
+        if vertex != current:
+            if current is not None:
+                yield current, out_total, in_total
+            current, out_total, in_total = vertex, 0, 0
+        out_total += out_deg
+        in_total += in_deg
+    if current is not None:
+        yield current, out_total, in_total
+
+
+def _reduce_runs(paths: List[str], directory: str, fan_in: int) -> List[str]:
+    """
+    Fusiona los bloques en pasadas de a lo sumo fan_in archivos abiertos,
+    hasta que queden menos de fan_in (el bloque en memoria es el que falta).
+    """
+    generation = 0
+    while len(paths) >= fan_in:
+        merged = []
+        for start in range(0, len(paths), fan_in):
+            group = paths[start:start + fan_in]
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            path = os.path.join(directory, f"merge_{generation:03d}_{len(merged):05d}.tsv")
+            with open(path, 'w', encoding='utf-8') as run:
+                for vertex, out_deg, in_deg in _merge_streams([_read_run(item) for item in group]):
+                    run.write(f"{vertex}\t{out_deg}\t{in_deg}\n")
+            for item in group:
+                os.remove(item)
+            merged.append(path)
+        paths = merged
+        generation += 1
+    return paths
+
+
+def _merge_runs(paths: List[str], counts: Dict[str, List[int]], directory: str,
+                fan_in: int = DEFAULT_MERGE_FAN_IN) -> Iterator[Tuple[str, int, int]]:
+    """
+    Fusiona los bloques en disco y el bloque en memoria, sumando por vértice.
+
+    Nunca abre más de fan_in bloques a la vez: si hay más, primero se
+    fusionan por grupos en bloques intermedios.
+    """
+    paths = _reduce_runs(paths, directory, max(2, fan_in))
+    in_memory = ((vertex, counts[vertex][0], counts[vertex][1]) for vertex in sorted(counts))
+    return _merge_streams([_read_run(path) for path in paths] + [in_memory])
+
+
+def stream_graph_stats(file_path: str, is_directed: bool = True,
+                       detail_path: Optional[str] = None,
+                       max_vertices_in_memory: int = DEFAULT_MAX_VERTICES_IN_MEMORY,
+                       mode: str = "lenient", spill_dir: Optional[str] = None,
+                       merge_fan_in: int = DEFAULT_MERGE_FAN_IN) -> StreamStats:
+    """
+    Calcula las estadísticas del grafo sin construir la lista de adyacencia.
+
+    Usa las mismas reglas que load_graph (comentarios, peso por defecto 1.0,
+    aristas inversas si es no dirigido). Los grados por vértice se acumulan
+    en memoria hasta max_vertices_in_memory y después se vuelcan a bloques
+    ordenados en disco, que se fusionan al final con memoria y archivos
+    abiertos acotados. En un grafo no dirigido el grado total es el número
+    de aristas incidentes, como en top_k_vertices.
+
+    Args:
+        file_path: Ruta al archivo de aristas
+        is_directed: True para grafo dirigido, False para no dirigido
+        detail_path: Si se indica, escribe 'vértice out in total' por línea (TSV)
+        max_vertices_in_memory: Tamaño máximo del bloque de grados en memoria
+        mode: 'strict', 'lenient' o 'silent'; no se buscan aristas repetidas,
+            porque eso exigiría guardar todas las aristas en memoria
+        spill_dir: Carpeta donde crear los bloques (por defecto, la temporal
+            del sistema, que en máquinas pequeñas suele tener poco espacio)
+        merge_fan_in: Máximo de bloques abiertos a la vez al fusionar
+
+    Returns:
+        StreamStats con vértices, aristas, densidad, peso total y grados
+    """
+    stats = StreamStats(file_path, is_directed)
+    counts: Dict[str, List[int]] = {}
+    runs: List[str] = []
+
+    with tempfile.TemporaryDirectory(prefix="graph_stream_", dir=spill_dir) as run_dir:
+        for from_vertex, to_vertex, weight in iter_edges(
+                file_path, ParseDiagnostics(mode)):
+            # Una arista no dirigida cuenta una vez en el total, pero suma
+            # grado en ambos sentidos
+            stats.num_edges += 1
+            stats.total_weight += weight
+            edge_copies = ((from_vertex, to_vertex),) if is_directed else \
+                ((from_vertex, to_vertex), (to_vertex, from_vertex))
+            for source, target in edge_copies:
+                counts.setdefault(source, [0, 0])[0] += 1
+                counts.setdefault(target, [0, 0])[1] += 1
+
+            if len(counts) >= max_vertices_in_memory:
+                runs.append(_spill(counts, run_dir, len(runs)))
+                counts = {}
+
+        stats.spilled_runs = len(runs)
+        detail = open(detail_path, 'w', encoding='utf-8') if detail_path else None
+        try:
+            best_degree = -1
+            for vertex, out_deg, in_deg in _merge_runs(runs, counts, run_dir, merge_fan_in):
+                total_deg = out_deg + in_deg if is_directed else out_deg
+                stats.num_vertices += 1
+                stats.out_degree.add(out_deg)
+                stats.in_degree.add(in_deg)
+                stats.total_degree.add(total_deg)
+                if total_deg > best_degree:
+                    best_degree = total_deg
+                    stats.most_connected = vertex
+                if detail is not None:
+                    detail.write(f"{vertex}\t{out_deg}\t{in_deg}\t{total_deg}\n")
+        finally:
+            if detail is not None:
+                detail.close()
+                stats.detail_path = detail_path
+
+    return stats
+
+
+def print_stream_stats(stats: StreamStats, graph_type: str):
+    """Muestra las estadísticas en streaming con el formato de analyze_graph."""
+    print(f"\n{'='*60}")
+    print(f"🌊 Análisis en streaming del Grafo {graph_type}")
+    print(f"{'='*60}")
+
+    if stats.num_edges == 0:
+        print("⚠️  El grafo está vacío")
+        return
+
+    print(f"📊 Estadísticas generales:")
+    print(f"   • Vértices: {stats.num_vertices}")
+    print(f"   • Aristas: {stats.num_edges}")
+    print(f"   • Densidad: {stats.density:.3f}")
+    print(f"   • Tipo: {'Denso' if stats.density > 0.5 else 'Disperso'}")
+    print(f"📏 Distancia total de calles: {stats.total_weight:.1f} km")
+
+    print(f"\n📈 Grados (mín / máx / promedio):")
+    for name, summary in (("Out-degree", stats.out_degree),
+                          ("In-degree", stats.in_degree),
+                          ("Total", stats.total_degree)):
+        print(f"   • {name}: {summary.minimum} / {summary.maximum} / {summary.mean:.2f}")
+    print(f"\n🏆 Vértice más conectado: {stats.most_connected} "
+          f"(grado total: {stats.total_degree.maximum})")
+
+    if stats.spilled_runs:
+        print(f"💾 Bloques volcados a disco: {stats.spilled_runs}")
+    if stats.detail_path:
+        print(f"📝 Detalle por vértice en: {stats.detail_path}")
+
+
+def main():
+    """Punto de entrada para perfilar archivos de aristas en streaming."""
+    parser = argparse.ArgumentParser(description="Estadísticas de grafos en streaming")
+    parser.add_argument("file", help="Archivo de aristas (formato edges_*.txt)")
+    parser.add_argument("--undirected", action="store_true", help="Tratar el grafo como no dirigido")
+    parser.add_argument("--detail", help="Archivo TSV para el detalle por vértice")
+    parser.add_argument("--max-vertices", type=int, default=DEFAULT_MAX_VERTICES_IN_MEMORY,
+                        help="Vértices en memoria antes de volcar a disco")
+    parser.add_argument("--spill-dir", help="Carpeta para los bloques volcados a disco")
+    parser.add_argument("--fan-in", type=int, default=DEFAULT_MERGE_FAN_IN,
+                        help="Máximo de bloques abiertos a la vez al fusionar")
+    args = parser.parse_args()
+
+    stats = stream_graph_stats(args.file, is_directed=not args.undirected,
+                               detail_path=args.detail,
+                               max_vertices_in_memory=args.max_vertices,
+                               spill_dir=args.spill_dir, merge_fan_in=args.fan_in)
+    print_stream_stats(stats, "NO DIRIGIDO" if args.undirected else "DIRIGIDO")
+
+
+if __name__ == "__main__":
+    main()
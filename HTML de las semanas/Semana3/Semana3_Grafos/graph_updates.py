@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Actualizaciones incrementales de grafos - Semana 3
+Inserta, borra y cambia pesos manteniendo las estadísticas al día
+"""
+
+from collections import defaultdict
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from analyze_graph import (MISSING_EDGE, DegreeIndex, Graph, ParseDiagnostics, load_graph,
+                           parse_edge_line)
+from matrix_graph import MatrixGraph
+
+
+class DynamicGraph(Mapping):
+    """
+    Lista de adyacencia mutable con estadísticas mantenidas en O(1) por cambio.
+
+    Mantiene grados de entrada y salida, número de aristas, peso total y el
+    vértice más conectado (con cubetas por grado total), así que no hace falta
+    volver a cargar ni a recorrer el grafo tras cada actualización.
+
+    Se comporta como el diccionario de load_graph, y como expone su propio
+    índice de grados, analyze_graph y los helpers lo usan sin reconstruirlo.
+    Un grafo no dirigido se guarda en ambos sentidos, pero num_edges y
+    total_weight cuentan cada arista una vez, como count_edges y
+    calculate_total_weight.
+    """
+
+    def __init__(self, graph: Graph, is_directed: bool = True):
+        """
+        Args:
+            graph: Grafo cargado (dict, CSRGraph, UndirectedCSRGraph o
+                MatrixGraph); sus aristas se copian
+            is_directed: False si el grafo es no dirigido
+        """
+        self.is_directed = is_directed
+        self._adjacency: Dict[str, List[Tuple[str, float]]] = {}
+        self._out_degrees: Dict[str, int] = {}
+        self._in_degrees: Dict[str, int] = {}
+        self._buckets: Dict[int, Set[str]] = defaultdict(set)
+        self._max_degree = 0
+        self._stored_edges = 0
+        self.num_edges = 0
+        self.total_weight = 0.0
+
+        # La matriz simétrica guarda un lazo en una sola celda; el resto de
+        # representaciones no dirigidas lo tienen dos veces en su lista
+        single_loops = not is_directed and isinstance(graph, MatrixGraph)
+        for from_vertex, neighbors in graph.items():
+            for to_vertex, weight in neighbors:
+                self._insert(from_vertex, to_vertex, weight)
+                self.total_weight += weight
+                if single_loops and from_vertex == to_vertex:
+                    self._insert(from_vertex, to_vertex, weight)
+                    self.total_weight += weight
+
+        self.num_edges = self._stored_edges
+        if not is_directed:
+            self.num_edges //= 2
+            self.total_weight /= 2
+
+    @classmethod
+    def from_file(cls, file_path: str, is_directed: bool = True) -> 'DynamicGraph':
+        """Carga un archivo de aristas con load_graph y lo envuelve."""
+        return cls(load_graph(file_path, is_directed), is_directed)
+
+    # --- Interfaz de Mapping compatible con el diccionario de adyacencia ---
+
+    def __getitem__(self, vertex: str) -> List[Tuple[str, float]]:
+        return self._adjacency[vertex]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._adjacency)
+
+    def __len__(self) -> int:
+        return len(self._adjacency)
+
+    @property
+    def _degree_index(self) -> DegreeIndex:
+        """Índice de grados vivo, leído por build_degree_index y get_in_degree."""
+        return DegreeIndex(self._out_degrees, self._in_degrees, self._stored_edges)
+
+    # --- Estadísticas mantenidas ---
+
+    @property
+    def num_vertices(self) -> int:
+        """Vértices con aristas de salida, como cuenta analyze_graph."""
+        return len(self._adjacency)
+
+    @property
+    def density(self) -> float:
+        """Densidad con la misma fórmula que analyze_graph."""
+        max_possible_edges = self.num_vertices * (self.num_vertices - 1)
+        if not self.is_directed:
+            max_possible_edges //= 2
+        return self.num_edges / max_possible_edges if max_possible_edges > 0 else 0.0
+
+    def out_degree(self, vertex: str) -> int:
+        return self._out_degrees.get(vertex, 0)
+
+    def in_degree(self, vertex: str) -> int:
+        return self._in_degrees.get(vertex, 0)
+
+    def total_degree(self, vertex: str) -> int:
+        """Entrada + salida; en no dirigidos, las aristas incidentes (como top_k_vertices)."""
+        if not self.is_directed:
+            return self.out_degree(vertex)
+        return self.out_degree(vertex) + self.in_degree(vertex)
+
+    def most_connected(self) -> str:
+        """Vértice de mayor grado total; en empate, el de menor etiqueta."""
+        if self._max_degree == 0:
+            return ""
+        return min(self._buckets[self._max_degree])
+
+    # --- Mantenimiento interno ---
+
+    def _shift_degree(self, vertex: str, degrees: Dict[str, int], delta: int):
+        # Las cubetas usan entrada + salida guardadas, que en no dirigidos es
+        # el doble del grado y ordena igual
+        old_total = self.out_degree(vertex) + self.in_degree(vertex)
+        count = degrees.get(vertex, 0) + delta
+        if count:
+            degrees[vertex] = count
+        else:
+            del degrees[vertex]
+
+        new_total = old_total + delta
+        if old_total:
+            bucket = self._buckets[old_total]
+            bucket.discard(vertex)
+            if not bucket:
+                del self._buckets[old_total]
+                if old_total == self._max_degree and delta < 0:
+                    self._max_degree = new_total
+        if new_total:
+            self._buckets[new_total].add(vertex)
+            self._max_degree = max(self._max_degree, new_total)
+
+    def _insert(self, from_vertex: str, to_vertex: str, weight: float):
+        """Guarda una copia de la arista y actualiza los grados."""
+        self._adjacency.setdefault(from_vertex, []).append((to_vertex, weight))
+        self._shift_degree(from_vertex, self._out_degrees, 1)
+        self._shift_degree(to_vertex, self._in_degrees, 1)
+        self._stored_edges += 1
+
+    def _find(self, from_vertex: str, to_vertex: str,
+              weight: Optional[float] = None) -> int:
+        """Posición de la primera copia guardada (con ese peso, si se indica), o -1."""
+        for position, (neighbor, stored_weight) in enumerate(self._adjacency.get(from_vertex, ())):
+            if neighbor == to_vertex and (weight is None or stored_weight == weight):
+                return position
+        return -1
+
+    def _delete(self, from_vertex: str, to_vertex: str,
+                weight: Optional[float] = None) -> Optional[float]:
+        """Borra una copia guardada y devuelve su peso, o None si no existía."""
+        position = self._find(from_vertex, to_vertex, weight)
+        if position < 0:
+            return None
+        neighbors = self._adjacency[from_vertex]
+        _, weight = neighbors.pop(position)
+        if not neighbors:
+            del self._adjacency[from_vertex]
+        self._shift_degree(from_vertex, self._out_degrees, -1)
+        self._shift_degree(to_vertex, self._in_degrees, -1)
+        self._stored_edges -= 1
+        return weight
+
+    def _reweight(self, from_vertex: str, to_vertex: str, weight: float,
+                  old_weight: Optional[float] = None) -> Optional[float]:
+        """Cambia el peso de una copia guardada y devuelve el anterior, o None."""
+        position = self._find(from_vertex, to_vertex, old_weight)
+        if position < 0:
+            return None
+        neighbors = self._adjacency[from_vertex]
+        old_weight = neighbors[position][1]
+        neighbors[position] = (to_vertex, weight)
+        return old_weight
+
+    # --- API pública de actualización ---
+
+    def add_edge(self, from_vertex: str, to_vertex: str, weight: float = 1.0):
+        """Inserta una arista (y su inversa si el grafo es no dirigido)."""
+        self._insert(from_vertex, to_vertex, weight)
+        if not self.is_directed:
+            self._insert(to_vertex, from_vertex, weight)
+        self.num_edges += 1
+        self.total_weight += weight
+
+    def remove_edge(self, from_vertex: str, to_vertex: str) -> bool:
+        """
+        Borra una ocurrencia de la arista (y su inversa si es no dirigido).
+
+        Returns:
+            False si la arista no existía
+        """
+        weight = self._delete(from_vertex, to_vertex)
+        if weight is None:
+            return False
+        if not self.is_directed:
+            # La inversa con el mismo peso (en un lazo, la otra copia)
+            self._delete(to_vertex, from_vertex, weight)
+        self.num_edges -= 1
+        self.total_weight -= weight
+        return True
+
+    def set_weight(self, from_vertex: str, to_vertex: str, weight: float) -> bool:
+        """
+        Cambia el peso de una arista existente (y de su inversa si es no dirigido).
+
+        Returns:
+            False si la arista no existía
+        """
+        old_weight = self._reweight(from_vertex, to_vertex, weight)
+        if old_weight is None:
+            return False
+        if not self.is_directed:
+            self._reweight(to_vertex, from_vertex, weight, old_weight)
+        self.total_weight += weight - old_weight
+        return True
+
+    def apply_delta_file(self, file_path: str, mode: str = "lenient",
+                         diagnostics: Optional[ParseDiagnostics] = None) -> Dict[str, int]:
+        """
+        Aplica un archivo de cambios con el formato de edges_*.txt.
+
+        Cada línea es una arista 'origen destino [peso]' precedida
+        opcionalmente de una operación:
+            + A B 2.0   inserta la arista (igual que sin prefijo)
+            - A B       borra la arista
+            = A B 3.5   cambia el peso de la arista
+
+        Las líneas mal formadas y las aristas que no existen se registran en
+        un ParseDiagnostics, con los mismos modos y el mismo límite de avisos
+        que load_graph.
+
+        Args:
+            file_path: Archivo de cambios
+            mode: 'strict', 'lenient' o 'silent' (ver ParseDiagnostics)
+            diagnostics: Objeto donde acumular los diagnósticos
+
+        Returns:
+            Número de inserciones, borrados, cambios de peso y líneas omitidas
+
+        Raises:
+            GraphParseError: en modo 'strict', ante la primera línea con problemas
+        """
+        if diagnostics is None:
+            diagnostics = ParseDiagnostics(mode)
+        applied = {"added": 0, "removed": 0, "reweighted": 0, "skipped": 0}
+
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line_num, line in enumerate(file, 1):
+                diagnostics.lines_read += 1
+                operation, rest = '+', line.strip()
+                if rest[:1] in ('+', '-', '='):
+                    operation, rest = rest[0], rest[1:]
+
+                edge, problem = parse_edge_line(rest)
+                if problem is not None:
+                    diagnostics.report_problem(problem, line_num, line.strip())
+                if edge is None:
+                    if problem is not None:
+                        applied["skipped"] += 1
+                    continue
+
+                diagnostics.edges_parsed += 1
+                from_vertex, to_vertex, weight = edge
+                if operation == '+':
+                    self.add_edge(from_vertex, to_vertex, weight)
+                    applied["added"] += 1
+                elif operation == '-' and self.remove_edge(from_vertex, to_vertex):
+                    applied["removed"] += 1
+                elif operation == '=' and self.set_weight(from_vertex, to_vertex, weight):
+                    applied["reweighted"] += 1
+                else:
+                    diagnostics.report_problem(MISSING_EDGE, line_num, line.strip())
+                    applied["skipped"] += 1
+
+        diagnostics.finish()
+        return applied
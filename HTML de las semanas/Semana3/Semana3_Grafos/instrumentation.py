@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentación por fases - Semana 3
+Tiempos, picos de memoria y contadores opcionales de carga y análisis
+"""
+
+import functools
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional
+
+# Recibe (fase, segundos, pico de memoria en bytes o None) al cerrar cada fase
+PhaseCallback = Callable[[str, float, Optional[int]], None]
+
+# Instrumentaciones activas; las funciones solo miden si hay alguna
+_active: List['Instrumentation'] = []
+
+_NO_PHASE = nullcontext()
+
+
+class PhaseStats:
+    """Acumulado de una fase: llamadas, tiempo total y mayor pico de memoria."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.peak_bytes: Optional[int] = None
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"phase": self.name, "calls": self.calls, "seconds": self.seconds,
+                "peak_bytes": self.peak_bytes}
+
+
+class _Frame:
+    """Fase abierta: nombre completo y memoria al entrar."""
+
+    def __init__(self, name: str, start_bytes: int):
+        self.name = name
+        self.start_bytes = start_bytes
+        self.max_bytes = start_bytes
+
+
+class Instrumentation:
+    """
+    Mide las fases de load_graph, analyze_graph y los helpers mientras está activa.
+
+    Las fases se anidan y se nombran con su ruta ('load_graph/parse'). Con
+    trace_memory cada fase registra su pico con tracemalloc, medido como los
+    bytes por encima de lo que había asignado al entrar; tracemalloc hace más
+    lento el programa, por eso es opcional.
+
+    Uso:
+        with Instrumentation(trace_memory=True) as metrics:
+            graph = load_graph("edges_directed.txt")
+            analyze_graph(graph, "DIRIGIDO")
+        metrics.print_summary()
+    """
+
+    def __init__(self, trace_memory: bool = False, callback: Optional[PhaseCallback] = None):
+        """
+        Args:
+            trace_memory: True para medir picos de memoria por fase
+            callback: Función llamada al cerrar cada fase, p. ej. para
+                enviar las métricas a un exportador
+        """
+        self.trace_memory = trace_memory
+        self.callback = callback
+        self.phases: Dict[str, PhaseStats] = {}
+        self.counters: Dict[str, int] = {}
+        self._stack: List[_Frame] = []
+        self._started_tracing = False
+
+    def __enter__(self) -> 'Instrumentation':
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _active.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _active.remove(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str):
+        """Mide el bloque como una fase, anidada en la fase abierta si la hay."""
+        if self._stack:
+            name = f"{self._stack[-1].name}/{name}"
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        current = 0
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent.max_bytes = max(parent.max_bytes, peak)
+            tracemalloc.reset_peak()
+        if name not in self.phases:
+            self.phases[name] = PhaseStats(name)  # en orden de apertura
+        frame = _Frame(name, current)
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            peak_bytes = None
+            if tracing:
+                top = max(tracemalloc.get_traced_memory()[1], frame.max_bytes)
+                peak_bytes = top - frame.start_bytes
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent.max_bytes = max(parent.max_bytes, top)
+            self._record(name, seconds, peak_bytes)
+
+    def is_open(self, name: str) -> bool:
+        """Indica si una fase con ese nombre ya está abierta en la ruta actual."""
+        return bool(self._stack) and name in self._stack[-1].name.split("/")
+
+    def _record(self, name: str, seconds: float, peak_bytes: Optional[int]):
+        stats = self.phases[name]
+        stats.calls += 1
+        stats.seconds += seconds
+        if peak_bytes is not None:
+            stats.peak_bytes = max(stats.peak_bytes or 0, peak_bytes)
+        if self.callback is not None:
+            self.callback(name, seconds, peak_bytes)
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self) -> Dict[str, object]:
+        """Resumen estructurado (serializable a JSON)."""
+        return {"phases": [stats.as_dict() for stats in self.phases.values()],
+                "counters": dict(self.counters)}
+
+    def print_summary(self):
+        """Muestra las fases en orden de aparición, sangradas según su anidamiento."""
+        print(f"\n⏱️  Fases medidas:")
+        for stats in self.phases.values():
+            depth = stats.name.count("/")
+            label = "   " + "  " * depth + stats.name.rsplit("/", 1)[-1]
+            memory = f"  pico {stats.peak_bytes / 2**20:.2f}MB" if stats.peak_bytes is not None else ""
+            print(f"{label:<40} {stats.seconds * 1000:>10.2f}ms  x{stats.calls}{memory}")
+        for name, value in self.counters.items():
+            print(f"   • {name}: {value}")
+
+
+def phase(name: str):
+    """Fase de la instrumentación activa, o un contexto vacío si no hay ninguna."""
+    if not _active:
+        return _NO_PHASE
+    return _active[-1].phase(name)
+
+
+def count(name: str, amount: int = 1):
+    """Suma a un contador de la instrumentación activa (si la hay)."""
+    if _active:
+        _active[-1].count(name, amount)
+
+
+def timed_phase(name: str):
+    """
+    Decorador que mide cada llamada a la función como una fase.
+
+    Una llamada recursiva (p. ej. load_graph cargando el CSR de la matriz)
+    queda dentro de la fase de la llamada externa en lugar de abrir otra
+    con el mismo nombre ('load_graph/load_graph').
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _active or _active[-1].is_open(name):
+                return function(*args, **kwargs)
+            with _active[-1].phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Landmarks ALT (A*, Landmarks, desigualdad triangular) - Semana 3
+Preprocesa distancias a unos pocos vértices para acelerar consultas repetidas
+"""
+
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+from analyze_graph import Graph
+from csr_graph import CSRGraph, as_csr
+from graph_cache import SourceStamp, source_stamp, stamp_matches
+from shortest_paths import INFINITY, DijkstraEngine
+
+DEFAULT_NUM_LANDMARKS = 8
+
+MAGIC = b"ALTG"
+VERSION = 1
+FLAG_DIRECTED = 1
+
+# magic, versión, flags, V, K, hash de etiquetas, tamaño/mtime/sha256 del origen
+HEADER = struct.Struct("<4sIIQQ32sQq32s")
+
+
+def labels_digest(graph: CSRGraph) -> bytes:
+    """Huella del orden de ids y del número de aristas del grafo."""
+    digest = hashlib.sha256()
+    for label in graph.labels:
+        digest.update(label.encode('utf-8'))
+        digest.update(b"\n")
+    digest.update(struct.pack("<Q", graph.num_edges))
+    return digest.digest()
+
+
+def landmark_path_for(file_path: str, is_directed: bool) -> str:
+    """Ruta de las tablas de landmarks que acompañan a un archivo de aristas."""
+    return f"{file_path}.{'d' if is_directed else 'u'}.alt"
+
+
+class LandmarkIndex:
+    """
+    Tablas de distancias desde y hacia un conjunto de landmarks.
+
+    Para cualquier landmark L y vértices v, t la desigualdad triangular da
+        d(v, t) >= d(L, t) - d(L, v)   y   d(v, t) >= d(v, L) - d(t, L)
+    y el máximo de estas cotas es una heurística consistente para A*.
+    En grafos no dirigidos d(v, L) = d(L, v) y basta una tabla por landmark.
+    """
+
+    def __init__(self, graph: CSRGraph, landmarks: List[int],
+                 from_tables: List[Sequence[float]], to_tables: List[Sequence[float]]):
+        self.graph = graph
+        self.landmarks = landmarks
+        self.from_tables = from_tables
+        self.to_tables = to_tables
+        self.last_settled = 0
+
+    @classmethod
+    def build(cls, graph: Graph, num_landmarks: int = DEFAULT_NUM_LANDMARKS,
+              is_directed: bool = True) -> 'LandmarkIndex':
+        """
+        Elige landmarks por el método del más lejano y calcula sus tablas.
+
+        Cada nuevo landmark es el vértice más alejado de los ya elegidos; si
+        hay vértices inalcanzables desde todos ellos, se elige uno de esos
+        para cubrir otras componentes.
+        """
+        graph = as_csr(graph, is_directed)
+        forward = DijkstraEngine(graph)
+        backward = DijkstraEngine(graph.reversed()) if graph.is_directed else None
+
+        landmarks: List[int] = []
+        from_tables: List[Sequence[float]] = []
+        to_tables: List[Sequence[float]] = []
+        nearest = array('d', [INFINITY]) * graph.num_vertices
+        candidate = 0
+
+        while graph.num_vertices and len(landmarks) < num_landmarks:
+            label = graph.labels[candidate]
+            distances = forward.single_source(label).distance_array
+            landmarks.append(candidate)
+            from_tables.append(distances)
+            to_tables.append(backward.single_source(label).distance_array
+                             if backward is not None else distances)
+
+            for vid, dist in enumerate(distances):
+                if dist < nearest[vid]:
+                    nearest[vid] = dist
+
+            chosen = set(landmarks)
+            unreached = [vid for vid, dist in enumerate(nearest)
+                         if dist == INFINITY and vid not in chosen]
+            if unreached:
+                candidate = unreached[0]
+                continue
+            farthest = max(range(graph.num_vertices), key=nearest.__getitem__)
+            if nearest[farthest] == 0.0:
+                break
+            candidate = farthest
+
+        return cls(graph, landmarks, from_tables, to_tables)
+
+    # --- Persistencia junto al archivo de aristas ---
+
+    def save(self, path: str, stamp: Optional[SourceStamp] = None):
+        """Escribe las tablas en binario (escritura atómica)."""
+        size, mtime_ns, digest = stamp or (0, 0, bytes(32))
+        flags = FLAG_DIRECTED if self.graph.is_directed else 0
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as out:
+            out.write(HEADER.pack(MAGIC, VERSION, flags, self.graph.num_vertices,
+                                  len(self.landmarks), labels_digest(self.graph),
+                                  size, mtime_ns, digest))
+            out.write(array('q', self.landmarks).tobytes())
+            tables = self.from_tables + (self.to_tables if self.graph.is_directed else [])
+            for table in tables:
+                out.write(memoryview(table).cast('B'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def open(cls, path: str, graph: CSRGraph) -> Tuple['LandmarkIndex', SourceStamp]:
+        """
+        Abre tablas guardadas con mmap, verificando que sean de este grafo.
+
+        Raises:
+            ValueError: si el archivo no es válido o el grafo no coincide
+        """
+        with open(path, 'rb') as source:
+            mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, flags, num_vertices, count, digest, size, mtime_ns, sha = \
+            HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{path}' no contiene tablas de landmarks")
+        if (num_vertices != graph.num_vertices or bool(flags & FLAG_DIRECTED) != graph.is_directed
+                or digest != labels_digest(graph)):
+            raise ValueError(f"'{path}' corresponde a otro grafo")
+
+        view = memoryview(mapped)
+        position = HEADER.size
+        landmarks = list(view[position:position + 8 * count].cast('q'))
+        position += 8 * count
+
+        def table() -> memoryview:
+            nonlocal position
+            data = view[position:position + 8 * num_vertices].cast('d')
+            position += 8 * num_vertices
+            return data
+
+        from_tables = [table() for _ in range(count)]
+        to_tables = [table() for _ in range(count)] if graph.is_directed else from_tables
+        index = cls(graph, landmarks, from_tables, to_tables)
+        index._mapped = mapped
+        return index, (size, mtime_ns, sha)
+
+    @classmethod
+    def load_or_build(cls, file_path: str, graph: Graph, is_directed: bool = True,
+                      num_landmarks: int = DEFAULT_NUM_LANDMARKS) -> 'LandmarkIndex':
+        """
+        Reutiliza las tablas guardadas junto al archivo si siguen vigentes.
+
+        Se reconstruyen si el archivo de aristas cambió, si el grafo tiene
+        otro orden de vértices o si se piden más landmarks de los guardados.
+        """
+        graph = as_csr(graph, is_directed)
+        path = landmark_path_for(file_path, graph.is_directed)
+        if os.path.exists(path):
+            try:
+                index, stamp = cls.open(path, graph)
+                if (len(index.landmarks) >= num_landmarks
+                        and stamp_matches(file_path, stamp)[0]):
+                    return index
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Landmarks '{path}' inválidos, recalculando: {e}")
+
+        stamp = source_stamp(file_path)
+        index = cls.build(graph, num_landmarks)
+        try:
+            index.save(path, stamp)
+        except OSError as e:
+            print(f"⚠️  No se pudieron guardar los landmarks en '{path}': {e}")
+        return index
+
+    # --- Consultas A* ---
+
+    def lower_bound(self, vid: int, target: int) -> float:
+        """Cota inferior de d(vid, target); inf si target es inalcanzable desde vid."""
+        best = 0.0
+        for from_table, to_table in zip(self.from_tables, self.to_tables):
+            landmark_to_v, landmark_to_t = from_table[vid], from_table[target]
+            if landmark_to_v != INFINITY:
+                if landmark_to_t == INFINITY:
+                    return INFINITY  # L llega a v pero no a t: v no llega a t
+                best = max(best, landmark_to_t - landmark_to_v)
+            v_to_landmark, t_to_landmark = to_table[vid], to_table[target]
+            if t_to_landmark != INFINITY:
+                if v_to_landmark == INFINITY:
+                    return INFINITY  # t llega a L pero v no: v no llega a t
+                best = max(best, v_to_landmark - t_to_landmark)
+        return best
+
+    def shortest_path(self, source: str, target: str) -> Tuple[float, List[str]]:
+        """
+        Camino más corto con A* guiado por las cotas de los landmarks.
+
+        Devuelve lo mismo que DijkstraEngine.shortest_path; el número de
+        vértices fijados queda en ``last_settled``.
+        """
+        graph = self.graph
+        source_id, target_id = graph.vertex_id(source), graph.vertex_id(target)
+        for vertex, vid in ((source, source_id), (target, target_id)):
+            if vid < 0:
+                raise KeyError(f"El vértice '{vertex}' no existe en el grafo")
+
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        distances = {source_id: 0.0}
+        predecessors = {source_id: -1}
+        heap = [(self.lower_bound(source_id, target_id), 0.0, source_id)]
+        settled = 0
+
+        while heap:
+            _, d, u = heapq.heappop(heap)
+            if d > distances[u]:
+                continue  # entrada obsoleta
+            settled += 1
+            if u == target_id:
+                break
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                candidate = d + weights[i]
+                if candidate < distances.get(v, INFINITY):
+                    estimate = self.lower_bound(v, target_id)
+                    if estimate == INFINITY:
+                        continue
+                    distances[v] = candidate
+                    predecessors[v] = u
+                    heapq.heappush(heap, (candidate + estimate, candidate, v))
+
+        self.last_settled = settled
+        distance = distances.get(target_id, INFINITY)
+        if distance == INFINITY:
+            return INFINITY, []
+        path = []
+        vid = target_id
+        while vid >= 0:
+            path.append(graph.labels[vid])
+            vid = predecessors[vid]
+        path.reverse()
+        return distance, path
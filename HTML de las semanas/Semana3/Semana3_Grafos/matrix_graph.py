@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Matriz de adyacencia de bits - Semana 3
+Representación para grafos densos con consulta de aristas en O(1)
+"""
+
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from csr_graph import CSRGraph
+
+# load_graph(matrix="auto") usa la matriz si ocupa a lo sumo esta fracción del CSR
+MATRIX_MEMORY_RATIO = 1.0
+
+
+def density_of(graph: CSRGraph) -> float:
+    """Densidad E / (V(V-1)) sobre todos los vértices internados."""
+    num_vertices = graph.num_vertices
+    max_possible_edges = num_vertices * (num_vertices - 1)
+    return graph.num_edges / max_possible_edges if max_possible_edges > 0 else 0.0
+
+
+def matrix_nbytes(num_vertices: int, weighted: bool) -> int:
+    """Bytes de una MatrixGraph de V vértices: V²/8 de bits más 8V² de pesos si los hay."""
+    bits = num_vertices * ((num_vertices + 7) // 8)
+    return bits + (8 * num_vertices * num_vertices if weighted else 0)
+
+
+def csr_nbytes(graph: CSRGraph) -> int:
+    """Bytes de los arreglos offsets, targets y weights de un CSRGraph."""
+    return sum(part.itemsize * len(part) for part in (graph.offsets, graph.targets, graph.weights))
+
+
+def matrix_fits(graph: CSRGraph, ratio: float = MATRIX_MEMORY_RATIO) -> bool:
+    """
+    Indica si la matriz del grafo ocupa a lo sumo ``ratio`` veces su CSR.
+
+    Con pesos la matriz cuesta ~8V² bytes frente a ~12E del CSR, así que
+    solo conviene con densidades cercanas a 1; sin pesos (V²/8 bytes)
+    conviene desde densidades de ~1%.
+    """
+    weighted = any(weight != 1.0 for weight in graph.weights)
+    return matrix_nbytes(graph.num_vertices, weighted) <= ratio * csr_nbytes(graph)
+
+
+class MatrixGraph(Mapping):
+    """
+    Grafo como matriz de adyacencia empaquetada en bits, más una matriz de pesos.
+
+    La fila ``u`` ocupa ``row_bytes`` bytes de ``bits`` y el bit ``v`` indica
+    la arista u -> v, así que verificar una arista cuesta O(1) y la matriz
+    ocupa V²/8 bytes. Los pesos van en una matriz ``array('d')`` de V² celdas,
+    que se omite si todas las aristas pesan 1.0.
+
+    Se comporta como el diccionario de load_graph (``graph[v]`` es la lista
+    de ``(vecino, peso)`` en orden de id) y hace de su propio índice de
+    aristas, así que has_edge y has_edges la consultan directamente. Una
+    matriz no puede guardar aristas repetidas: se funden en una sola con el
+    último peso leído, y ``merged_edges`` cuenta cuántas se fundieron.
+    """
+
+    def __init__(self, labels: List[str], bits: bytearray, weights: Optional[array],
+                 is_directed: bool = True, merged_edges: int = 0):
+        """
+        Args:
+            labels: Etiqueta de cada vértice, indexada por id
+            bits: V filas de (V + 7) // 8 bytes
+            weights: V² pesos por fila, o None si todas las aristas pesan 1.0
+            is_directed: False si la matriz ya es simétrica
+            merged_edges: Aristas repetidas que se fundieron al construirla
+        """
+        num_vertices = len(labels)
+        self.row_bytes = (num_vertices + 7) // 8
+        if len(bits) != num_vertices * self.row_bytes:
+            raise ValueError("bits no coincide con el número de vértices")
+        if weights is not None and len(weights) != num_vertices * num_vertices:
+            raise ValueError("weights debe tener V² elementos")
+
+        self.labels = labels
+        self.bits = bits
+        self.weights = weights
+        self.is_directed = is_directed
+        self.merged_edges = merged_edges
+        self._ids = {label: vid for vid, label in enumerate(labels)}
+        self._degree_index = None
+        self._edge_index = self
+        self._num_sources = sum(1 for vid in range(num_vertices) if self._row(vid))
+
+    @classmethod
+    def from_csr(cls, graph: CSRGraph) -> 'MatrixGraph':
+        """
+        Construye la matriz desde un CSRGraph en O(V²/8 + E).
+
+        En un CSR no dirigido cada lazo está guardado dos veces en la misma
+        fila; la segunda copia es su espejo y no cuenta como repetida.
+        """
+        num_vertices = graph.num_vertices
+        row_bytes = (num_vertices + 7) // 8
+        bits = bytearray(num_vertices * row_bytes)
+        weighted = any(weight != 1.0 for weight in graph.weights)
+        weights = array('d', bytes(8 * num_vertices * num_vertices)) if weighted else None
+        targets, edge_weights = graph.targets, graph.weights
+        mirrored = not graph.is_directed
+        merged = 0
+
+        for u in range(num_vertices):
+            row = u * row_bytes
+            mirror_loop = False
+            for i in graph.edge_range(u):
+                v = targets[i]
+                if mirrored and v == u:
+                    mirror_loop = not mirror_loop
+                    if not mirror_loop:
+                        continue
+                mask = 1 << (v & 7)
+                if bits[row + (v >> 3)] & mask:
+                    merged += 1
+                bits[row + (v >> 3)] |= mask
+                if weights is not None:
+                    weights[u * num_vertices + v] = edge_weights[i]
+
+        return cls(graph.labels, bits, weights, graph.is_directed, merged)
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.labels)
+
+    @property
+    def num_edges(self) -> int:
+        """Número de celdas con arista (las repetidas cuentan una vez)."""
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    @property
+    def density(self) -> float:
+        max_possible_edges = self.num_vertices * (self.num_vertices - 1)
+        return self.num_edges / max_possible_edges if max_possible_edges > 0 else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes de las matrices de bits y de pesos."""
+        return matrix_nbytes(self.num_vertices, self.weights is not None)
+
+    def vertex_id(self, vertex: str) -> int:
+        """Devuelve el id entero de un vértice, o -1 si no existe."""
+        return self._ids.get(vertex, -1)
+
+    def id_map(self) -> Dict[str, int]:
+        return self._ids
+
+    def _row(self, vid: int) -> int:
+        """Fila de bits como entero (bit v = arista vid -> v)."""
+        start = vid * self.row_bytes
+        return int.from_bytes(self.bits[start:start + self.row_bytes], 'little')
+
+    def has_edge_ids(self, u: int, v: int) -> bool:
+        return bool(self.bits[u * self.row_bytes + (v >> 3)] >> (v & 7) & 1)
+
+    def neighbor_ids(self, vid: int) -> Iterator[int]:
+        """Ids de los vecinos de salida, en orden creciente."""
+        row = self._row(vid)
+        while row:
+            low = row & -row
+            yield low.bit_length() - 1
+            row ^= low
+
+    def weight_of(self, u: int, v: int) -> float:
+        return self.weights[u * self.num_vertices + v] if self.weights is not None else 1.0
+
+    def out_degree_of(self, vid: int) -> int:
+        """Grado de salida por id: bits encendidos de la fila."""
+        return bin(self._row(vid)).count("1")
+
+    def degree_arrays(self) -> Tuple[array, array]:
+        """Grados de salida y de entrada de todos los vértices, en O(V²/8 + E)."""
+        out_counts = array('q', bytes(8 * self.num_vertices))
+        in_counts = array('q', bytes(8 * self.num_vertices))
+        for u in range(self.num_vertices):
+            for v in self.neighbor_ids(u):
+                out_counts[u] += 1
+                in_counts[v] += 1
+        return out_counts, in_counts
+
+    # --- Protocolo de EdgeIndex: consultas de aristas en O(1) ---
+
+    def contains(self, from_vertex: str, to_vertex: str) -> bool:
+        """Indica si existe la arista from_vertex -> to_vertex."""
+        u = self._ids.get(from_vertex)
+        v = self._ids.get(to_vertex)
+        return u is not None and v is not None and self.has_edge_ids(u, v)
+
+    def contains_many(self, pairs: Iterable[Tuple[str, str]]) -> List[bool]:
+        return [self.contains(from_vertex, to_vertex) for from_vertex, to_vertex in pairs]
+
+    def weight(self, from_vertex: str, to_vertex: str) -> Optional[float]:
+        """Peso de la arista, o None si no existe."""
+        u = self._ids.get(from_vertex)
+        v = self._ids.get(to_vertex)
+        if u is None or v is None or not self.has_edge_ids(u, v):
+            return None
+        return self.weight_of(u, v)
+
+    # --- Interfaz de Mapping compatible con el diccionario de adyacencia ---
+
+    def __getitem__(self, vertex: str) -> List[Tuple[str, float]]:
+        vid = self.vertex_id(vertex)
+        if vid < 0 or not self._row(vid):
+            raise KeyError(vertex)
+        labels = self.labels
+        return [(labels[v], self.weight_of(vid, v)) for v in self.neighbor_ids(vid)]
+
+    def __contains__(self, vertex: object) -> bool:
+        vid = self.vertex_id(vertex) if isinstance(vertex, str) else -1
+        return vid >= 0 and self._row(vid) != 0
+
+    def __iter__(self) -> Iterator[str]:
+        for vid, label in enumerate(self.labels):
+            if self._row(vid):
+                yield label
+
+    def __len__(self) -> int:
+        return self._num_sources
+
+    def __repr__(self) -> str:
+        return (f"MatrixGraph(vertices={self.num_vertices}, edges={self.num_edges}, "
+                f"directed={self.is_directed}, bytes={self.nbytes})")
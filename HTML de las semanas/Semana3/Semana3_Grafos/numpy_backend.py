@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Backend vectorizado con NumPy - Semana 3
+Estadísticas agregadas del grafo como reducciones sobre arreglos
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+from analyze_graph import Graph
+from csr_graph import CSRGraph, UndirectedCSRGraph
+from matrix_graph import MatrixGraph
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+
+def require_numpy():
+    """Lanza ImportError con un mensaje claro si NumPy no está instalado."""
+    if np is None:
+        raise ImportError("El backend vectorizado requiere NumPy (pip install numpy)")
+
+
+class EdgeArrays:
+    """
+    Aristas del grafo como tres arreglos NumPy paralelos.
+
+    sources[i] -> targets[i] con peso weights[i]; los ids de vértice indexan
+    ``labels``. Con un CSRGraph dirigido o un UndirectedCSRGraph, targets y
+    weights son vistas sin copia. En un grafo no dirigido cada arista
+    aparece una sola vez, como en analyze_graph.
+    """
+
+    def __init__(self, labels: Sequence[str], sources, targets, weights,
+                 is_directed: bool = True):
+        self.labels = labels
+        self.sources = sources
+        self.targets = targets
+        self.weights = weights
+        self.is_directed = is_directed
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.labels)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.weights)
+
+    @classmethod
+    def from_graph(cls, graph: Graph, is_directed: Optional[bool] = None) -> 'EdgeArrays':
+        """
+        Construye los arreglos desde un dict de adyacencia, un CSRGraph, un
+        UndirectedCSRGraph o una MatrixGraph.
+
+        Args:
+            graph: Grafo cargado
+            is_directed: Por defecto se toma del grafo o se asume dirigido; si
+                es False y el grafo guarda ambos sentidos, se deja una copia
+        """
+        require_numpy()
+        if is_directed is None:
+            is_directed = getattr(graph, 'is_directed', True)
+        if isinstance(graph, UndirectedCSRGraph):
+            arrays = cls.from_graph(graph.stored)
+            arrays.is_directed = False
+            return arrays
+
+        if isinstance(graph, MatrixGraph):
+            num_vertices = graph.num_vertices
+            rows = np.frombuffer(graph.bits, dtype=np.uint8).reshape(num_vertices, graph.row_bytes)
+            adjacency = np.unpackbits(rows, axis=1, count=num_vertices, bitorder='little')
+            if not is_directed:
+                adjacency = np.triu(adjacency)  # la matriz es simétrica
+            sources, targets = np.nonzero(adjacency)
+            if graph.weights is None:
+                weights = np.ones(len(sources), dtype=np.float64)
+            else:
+                matrix = np.frombuffer(graph.weights, dtype=np.float64)
+                weights = matrix.reshape(num_vertices, num_vertices)[sources, targets]
+            return cls(graph.labels, sources.astype(np.int32), targets.astype(np.int32),
+                       weights, is_directed)
+
+        if isinstance(graph, CSRGraph):
+            offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+            targets = np.frombuffer(graph.targets, dtype=np.int32)
+            weights = np.frombuffer(graph.weights, dtype=np.float64)
+            sources = np.repeat(np.arange(graph.num_vertices, dtype=np.int32), np.diff(offsets))
+            arrays = cls(graph.labels, sources, targets, weights, is_directed)
+            return arrays if is_directed else arrays._single_copy()
+
+        ids: Dict[str, int] = {}
+        labels: List[str] = []
+
+        def intern(vertex: str) -> int:
+            vid = ids.get(vertex)
+            if vid is None:
+                vid = ids[vertex] = len(labels)
+                labels.append(vertex)
+            return vid
+
+        num_edges = sum(len(neighbors) for neighbors in graph.values())
+        sources = np.empty(num_edges, dtype=np.int32)
+        targets = np.empty(num_edges, dtype=np.int32)
+        weights = np.empty(num_edges, dtype=np.float64)
+        position = 0
+        for vertex, neighbors in graph.items():
+            u = intern(vertex)
+            for neighbor, weight in neighbors:
+                sources[position] = u
+                targets[position] = intern(neighbor)
+                weights[position] = weight
+                position += 1
+        arrays = cls(labels, sources, targets, weights, is_directed)
+        return arrays if is_directed else arrays._single_copy()
+
+    def _single_copy(self) -> 'EdgeArrays':
+        """
+        Deja una copia de cada arista guardada en ambos sentidos: la u -> v
+        con u < v, y la mitad de los lazos (que también están duplicados).
+        """
+        keep = self.sources < self.targets
+        loops = np.flatnonzero(self.sources == self.targets)
+        # Las dos copias de un lazo son iguales: ordenadas quedan contiguas
+        loops = loops[np.lexsort((self.weights[loops], self.sources[loops]))]
+        keep[loops[::2]] = True
+        return EdgeArrays(self.labels, self.sources[keep], self.targets[keep],
+                          self.weights[keep], is_directed=False)
+
+
+def total_weight(arrays: EdgeArrays) -> float:
+    """Equivalente vectorizado de calculate_total_weight."""
+    return float(arrays.weights.sum())
+
+
+def _undirected_degrees(arrays: EdgeArrays):
+    """Grado no dirigido: cada arista suma en sus dos extremos (un lazo suma 2)."""
+    return (np.bincount(arrays.sources, minlength=arrays.num_vertices)
+            + np.bincount(arrays.targets, minlength=arrays.num_vertices))
+
+
+def out_degrees(arrays: EdgeArrays):
+    """Grado de salida de cada vértice (indexado por id); el grado si no es dirigido."""
+    if not arrays.is_directed:
+        return _undirected_degrees(arrays)
+    return np.bincount(arrays.sources, minlength=arrays.num_vertices)
+
+
+def in_degrees(arrays: EdgeArrays):
+    """Grado de entrada de cada vértice (indexado por id); el grado si no es dirigido."""
+    if not arrays.is_directed:
+        return _undirected_degrees(arrays)
+    return np.bincount(arrays.targets, minlength=arrays.num_vertices)
+
+
+def degree_histogram(degrees) -> Dict[int, int]:
+    """Cuántos vértices tienen cada grado (solo grados presentes)."""
+    counts = np.bincount(degrees)
+    present = np.flatnonzero(counts)
+    return {int(degree): int(counts[degree]) for degree in present}
+
+
+def density(arrays: EdgeArrays) -> float:
+    """
+    Densidad con la fórmula de analyze_graph: E / (V(V-1)), o E / (V(V-1)/2)
+    si no es dirigido, donde V son los vértices con aristas de salida (las
+    claves de la lista de adyacencia).
+    """
+    vertices = int(np.count_nonzero(out_degrees(arrays)))
+    max_possible_edges = vertices * (vertices - 1)
+    if not arrays.is_directed:
+        max_possible_edges //= 2
+    return arrays.num_edges / max_possible_edges if max_possible_edges > 0 else 0.0
+
+
+def weight_summary(arrays: EdgeArrays,
+                   percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+    """Mínimo, máximo, promedio y percentiles de los pesos."""
+    if arrays.num_edges == 0:
+        return {}
+    weights = arrays.weights
+    summary = {
+        "min": float(weights.min()),
+        "max": float(weights.max()),
+        "mean": float(weights.mean()),
+    }
+    for p, value in zip(percentiles, np.percentile(weights, percentiles)):
+        summary[f"p{p:g}"] = float(value)
+    return summary
+
+
+def matrix_vs_list_savings(num_vertices: int, num_edges: int) -> float:
+    """Porcentaje de memoria que ahorra la lista frente a la matriz de adyacencia."""
+    cells = num_vertices ** 2
+    return (cells - num_edges) / cells * 100 if cells else 0.0
+
+
+def vectorized_report(graph: Graph,
+                      percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                      is_directed: Optional[bool] = None) -> Dict[str, object]:
+    """
+    Reporte agregado del grafo calculado solo con reducciones NumPy.
+
+    Args:
+        graph: Grafo cargado
+        percentiles: Percentiles de los pesos a incluir
+        is_directed: Por defecto se toma del grafo o se asume dirigido
+
+    Returns:
+        Diccionario con vértices, aristas, densidad, peso total, resumen de
+        pesos e histogramas de grados de entrada, salida y total
+    """
+    arrays = EdgeArrays.from_graph(graph, is_directed)
+    out_deg = out_degrees(arrays)
+    in_deg = in_degrees(arrays)
+    vertices = int(np.count_nonzero(out_deg))
+    return {
+        "vertices": vertices,
+        "edges": arrays.num_edges,
+        "density": density(arrays),
+        "total_weight": total_weight(arrays),
+        "weights": weight_summary(arrays, percentiles),
+        "out_degree_histogram": degree_histogram(out_deg),
+        "in_degree_histogram": degree_histogram(in_deg),
+        "total_degree_histogram": degree_histogram(out_deg + in_deg),
+        "matrix_vs_list_savings": matrix_vs_list_savings(vertices, arrays.num_edges),
+    }
+
+
+def print_vectorized_report(report: Dict[str, object], graph_type: Optional[str] = None):
+    """Muestra el reporte vectorizado con el formato de analyze_graph."""
+    print(f"\n{'='*60}")
+    print(f"⚡ Análisis vectorizado del Grafo {graph_type or ''}".rstrip())
+    print(f"{'='*60}")
+    print(f"📊 Estadísticas generales:")
+    print(f"   • Vértices: {report['vertices']}")
+    print(f"   • Aristas: {report['edges']}")
+    print(f"   • Densidad: {report['density']:.3f}")
+    print(f"📏 Distancia total de calles: {report['total_weight']:.1f} km")
+    weights = report["weights"]
+    if weights:
+        quantiles = ", ".join(f"{name}={value:.1f}" for name, value in weights.items())
+        print(f"⚖️  Pesos: {quantiles}")
+    print(f"💾 Ahorro lista vs matriz: ~{report['matrix_vs_list_savings']:.1f}%")
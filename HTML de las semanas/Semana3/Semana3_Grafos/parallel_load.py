@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+Carga paralela de grafos - Semana 3
+Parsea archivos de aristas grandes en varios procesos
+"""
+
+import hashlib
+import os
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from multiprocessing import resource_tracker
+from typing import Dict, List, Optional, Set, Tuple
+
+from analyze_graph import (DUPLICATE, Graph, GraphParseError, ParseDiagnostics, load_graph,
+                           parse_edge_line)
+from csr_graph import CSRBuilder, CSRGraph
+from shared_graph import SharedArrays
+
+# Por debajo de este tamaño el arranque de procesos cuesta más que el parseo
+MIN_PARALLEL_BYTES = 4 * 1024 * 1024
+
+# Bloques por proceso, para repartir mejor la carga entre workers
+CHUNKS_PER_WORKER = 4
+
+
+def _edge_key(from_vertex: str, to_vertex: str) -> int:
+    """Hash de arista estable entre procesos (hash() cambia con PYTHONHASHSEED)."""
+    data = f"{from_vertex}\0{to_vertex}".encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+class ShardResult:
+    """
+    Un bloque del archivo ya parseado: CSR local y diagnósticos propios.
+
+    Los ids de vértice son locales al bloque (orden de primera aparición en
+    él). Con track_edges se guarda además la primera aparición de cada
+    arista del bloque, para detectar duplicadas entre bloques.
+    """
+
+    def __init__(self):
+        self.labels: List[str] = []
+        self.offsets = array('q')
+        self.targets = array('i')
+        self.weights = array('d')
+        self.diagnostics: Optional[ParseDiagnostics] = None
+        self.malformed: List[Tuple[int, str, str]] = []
+        self.line_count = 0
+        self.edge_keys = array('Q')
+        self.edge_texts: List[Tuple[int, str]] = []
+
+
+
+def split_ranges(file_path: str, parts: int) -> List[Tuple[int, int]]:
+    """
+    Divide el archivo en rangos de bytes que empiezan al inicio de una línea.
+
+    Cada frontera nominal se mueve hasta después del siguiente salto de
+    línea, así ninguna línea queda partida entre dos bloques.
+    """
+    size = os.path.getsize(file_path)
+    boundaries = [0]
+    with open(file_path, 'rb') as file:
+        for i in range(1, parts):
+            position = size * i // parts
+            if position <= boundaries[-1]:
+                continue
+            file.seek(position - 1)
+            file.readline()
+            position = file.tell()
+            if position >= size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    boundaries.append(size)
+    return [(boundaries[i], boundaries[i + 1]) for i in range(len(boundaries) - 1)]
+
+
+
+def _parse_range(task: Tuple[str, int, int, bool, int, bool, bool]) -> ShardResult:
+    """
+    Parsea las líneas de un rango de bytes y arma su CSR local.
+
+    Se ejecuta en un proceso del pool: los diagnósticos y el counting sort
+    por origen se hacen aquí, así el proceso principal solo suma contadores
+    y copia tramos de arreglos.
+    """
+    file_path, start, end, is_directed, max_samples, track_edges, strict = task
+    shard = ShardResult()
+    diagnostics = ParseDiagnostics("silent", max_samples, track_edges)
+    builder = CSRBuilder(is_directed)
+    first_seen: Dict[int, None] = {}
+
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        position = start
+        while position < end:
+            raw = file.readline()
+            if not raw:
+                break
+            position += len(raw)
+            shard.line_count += 1
+            diagnostics.lines_read += 1
+
+            line = raw.decode('utf-8')
+            edge, problem = parse_edge_line(line)
+            if problem is not None:
+                diagnostics.report_problem(problem, shard.line_count, line.strip())
+                if len(shard.malformed) < max_samples:
+                    shard.malformed.append((shard.line_count, problem, line.strip()))
+                if strict:
+                    break  # el proceso principal lanza al llegar a este bloque
+            if edge is not None:
+                from_vertex, to_vertex, weight = edge
+                diagnostics.observe_edge(from_vertex, to_vertex, weight, shard.line_count)
+                builder.add_edge(from_vertex, to_vertex, weight)
+                if track_edges:
+                    key = _edge_key(from_vertex, to_vertex)
+                    if key not in first_seen:
+                        first_seen[key] = None
+                        shard.edge_keys.append(key)
+                        shard.edge_texts.append(
+                            (shard.line_count, f"{from_vertex} {to_vertex} {weight:g}"))
+
+    diagnostics.finish()
+    graph = builder.build()
+    shard.labels = graph.labels
+    shard.offsets, shard.targets, shard.weights = graph.offsets, graph.targets, graph.weights
+    shard.diagnostics = diagnostics
+    return shard
+
+
+def _merge_diagnostics(diagnostics: ParseDiagnostics, shard: ShardResult, first_line: int,
+                       seen_keys: Set[int]):
+    """
+    Suma los diagnósticos de un bloque con números de línea globales.
+
+    Las duplicadas dentro del bloque ya vienen contadas; las que repiten una
+    arista de un bloque anterior se detectan con operaciones de conjuntos y
+    se intercalan por número de línea con el resto de la muestra del bloque,
+    así la muestra queda en el mismo orden que en una pasada secuencial.
+    """
+    offset = first_line - 1
+    if diagnostics.track_edges:
+        keys = set(shard.edge_keys)
+        repeated = keys & seen_keys
+        if repeated:
+            local = shard.diagnostics
+            duplicates = [(line_num, DUPLICATE, text)
+                          for key, (line_num, text) in zip(shard.edge_keys, shard.edge_texts)
+                          if key in repeated]
+            local.counts[DUPLICATE] += len(duplicates)
+            # Orden estable: en una misma línea el lazo va antes que la duplicada
+            local.samples = sorted(local.samples + duplicates,
+                                   key=lambda sample: sample[0])[:local.max_samples]
+        seen_keys |= keys
+    diagnostics.merge(shard.diagnostics, offset, shard.malformed)
+
+
+def _place_task(task) -> None:
+    """
+    Remapea un bloque a ids globales y copia sus aristas a su lugar del CSR
+    global, en memoria compartida (se ejecuta en un proceso del pool).
+    """
+    offsets, targets, weights, remap, starts, handle = task
+    out = SharedArrays.attach(*handle)
+    global_targets, global_weights = out["targets"], out["weights"]
+    remapped = array('i', map(remap.__getitem__, targets))
+    for start, low, high in zip(starts, offsets, offsets[1:]):
+        if high > low:
+            end = start + high - low
+            global_targets[start:end] = remapped[low:high]
+            global_weights[start:end] = weights[low:high]
+    del global_targets, global_weights
+    out.close()
+
+
+def _merge_csr(shards: List[ShardResult], is_directed: bool,
+               pool: Optional[ProcessPoolExecutor] = None) -> CSRGraph:
+    """
+    Une los CSR locales en uno global sin recorrer las aristas en este proceso.
+
+    Aquí solo se trabaja por vértice de cada bloque: ids globales (en orden
+    de primera aparición, igual que el cargador secuencial), grados y la
+    posición donde empieza cada tramo. Los procesos del pool remapean los
+    destinos y copian sus tramos a continuación de los de bloques
+    anteriores, así el orden de vecinos es el del archivo. Sin pool (la
+    lectura se cortó y el pool ya no está) la copia se hace aquí.
+    """
+    ids: Dict[str, int] = {}
+    labels: List[str] = []
+    remaps = []
+    for shard in shards:
+        # Ids nuevos en orden de aparición del bloque; el resto ya existe
+        new = [label for label in shard.labels if label not in ids]
+        ids.update(zip(new, range(len(labels), len(labels) + len(new))))
+        labels.extend(new)
+        remaps.append(array('i', map(ids.__getitem__, shard.labels)))
+
+    num_vertices = len(labels)
+    degrees = array('q', bytes(8 * num_vertices))
+    for shard, remap in zip(shards, remaps):
+        local = shard.offsets
+        for vid, low, high in zip(remap, local, local[1:]):
+            degrees[vid] += high - low
+    offsets = array('q', [0])
+    offsets.extend(accumulate(degrees))
+
+    # Posición global donde empieza el tramo de cada vértice de cada bloque
+    cursor = offsets[:-1]
+    starts = []
+    for shard, remap in zip(shards, remaps):
+        local = shard.offsets
+        shard_starts = array('q', map(cursor.__getitem__, remap))
+        for vid, low, high in zip(remap, local, local[1:]):
+            cursor[vid] += high - low
+        starts.append(shard_starts)
+
+    num_edges = offsets[-1]
+    block = SharedArrays.create([("targets", 'i', num_edges), ("weights", 'd', num_edges)])
+    try:
+        handle = block.handle()
+        mapper = pool.map if pool is not None else map
+        list(mapper(_place_task, [(shard.offsets, shard.targets, shard.weights, remap,
+                                     shard_starts, handle)
+                                    for shard, remap, shard_starts in zip(shards, remaps, starts)]))
+        targets = array('i', block["targets"])
+        weights = array('d', block["weights"])
+    finally:
+        block.unlink()
+
+    graph = CSRGraph(labels, offsets, targets, weights, is_directed)
+    graph._ids = ids
+    return graph
+
+
+def load_graph_parallel(file_path: str, is_directed: bool = True, compact: bool = False,
+                        workers: Optional[int] = None,
+                        min_parallel_bytes: int = MIN_PARALLEL_BYTES,
+                        mode: str = "lenient",
+                        diagnostics: Optional[ParseDiagnostics] = None) -> Graph:
+    """
+    Carga un grafo repartiendo el parseo entre varios procesos.
+
+    Produce el mismo resultado que load_graph (mismas aristas, mismo orden de
+    vecinos, mismos diagnósticos con los mismos números de línea): cada
+    proceso parsea un rango de líneas, lleva sus propios diagnósticos y arma
+    un CSR local; aquí se suman los contadores y se calcula dónde va cada
+    tramo, y con compact=True los mismos procesos remapean los ids locales a
+    globales y copian sus aristas al CSR final en memoria compartida.
+
+    Args:
+        file_path: Ruta al archivo de aristas
+        is_directed: True para grafo dirigido, False para no dirigido
+        compact: True para devolver un CSRGraph
+        workers: Número de procesos (por defecto, os.cpu_count())
+        min_parallel_bytes: Tamaño mínimo para no usar el cargador secuencial
+        mode: 'strict', 'lenient' o 'silent' (ver ParseDiagnostics)
+        diagnostics: Objeto donde acumular los diagnósticos del parseo
+
+    Returns:
+        Diccionario con lista de adyacencia, o CSRGraph si compact=True
+    """
+    workers = workers or os.cpu_count() or 1
+    if (workers <= 1 or not os.path.exists(file_path)
+            or os.path.getsize(file_path) < min_parallel_bytes):
+        return load_graph(file_path, is_directed, compact=compact, mode=mode,
+                          diagnostics=diagnostics)
+
+    if diagnostics is None:
+        diagnostics = ParseDiagnostics(mode)
+
+    ranges = split_ranges(file_path, workers * CHUNKS_PER_WORKER)
+    tasks = [(file_path, start, end, is_directed, diagnostics.max_samples,
+              diagnostics.track_edges, diagnostics.mode == "strict") for start, end in ranges]
+
+    shards: List[ShardResult] = []
+    adjacency_list = defaultdict(list)
+    seen_keys: Set[int] = set()
+    first_line = 1
+
+    graph = None
+    if compact:
+        # Los workers deben heredar el rastreador de memoria compartida del
+        # proceso principal; si lo arrancara cada uno, al adjuntarse al
+        # bloque del CSR lo darían por filtrado al terminar
+        resource_tracker.ensure_running()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for shard in pool.map(_parse_range, tasks):
+                _merge_diagnostics(diagnostics, shard, first_line, seen_keys)
+                first_line += shard.line_count
+
+                if compact:
+                    shards.append(shard)
+                    continue
+
+                labels, offsets, targets, weights = \
+                    shard.labels, shard.offsets, shard.targets, shard.weights
+                for u, label in enumerate(labels):
+                    low, high = offsets[u], offsets[u + 1]
+                    if high > low:
+                        adjacency_list[label].extend(
+                            zip(map(labels.__getitem__, targets[low:high]), weights[low:high]))
+            if compact:
+                graph = _merge_csr(shards, is_directed, pool)
+    except GraphParseError:
+        raise
+    except Exception as e:
+        print(f"❌ Error inesperado al leer '{file_path}': {e}")
+        diagnostics.read_error = str(e)
+    diagnostics.finish()
+
+    if compact:
+        # Si la lectura se cortó, se unen en este proceso los bloques leídos
+        return graph if graph is not None else _merge_csr(shards, is_directed)
+    return dict(adjacency_list)
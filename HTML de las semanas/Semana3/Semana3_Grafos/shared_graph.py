@@ -0,0 +1,527 @@
+# -*- coding: utf-8 -*-
+"""
+Análisis multiproceso con memoria compartida - Semana 3
+Publica los arreglos CSR en shared_memory y reparte rangos de vértices entre procesos
+"""
+
+import argparse
+import heapq
+import os
+import random
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from analyze_graph import (DEGREE_CRITERIA, DegreeIndex, Graph, UndirectedDegreeIndex,
+                           load_graph)
+from csr_graph import CSRGraph, as_csr
+from graph_cache import LabelTable
+from traversal import iter_frontiers
+
+# (nombre, typecode, cantidad de elementos) de cada arreglo de un segmento
+ArraySpec = Tuple[str, str, int]
+
+# Rangos de vértices por proceso, para repartir mejor la carga entre workers
+SHARDS_PER_WORKER = 4
+
+DEFAULT_TRAVERSAL_SOURCES = 16
+
+
+class SharedArrays:
+    """
+    Varios arreglos tipados dentro de un solo segmento de memoria compartida.
+
+    Cada arreglo empieza alineado a 8 bytes y se expone como un memoryview
+    con su typecode, así los procesos que se adjuntan leen y escriben los
+    mismos bytes sin copiarlos ni serializarlos. Quien lo crea lo libera con
+    unlink(); los demás solo llaman close().
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, specs: Sequence[ArraySpec]):
+        self.memory = memory
+        self.specs = list(specs)
+        self.views: Dict[str, memoryview] = {}
+        buffer = memory.buf
+        position = 0
+        for name, typecode, count in self.specs:
+            size = array(typecode).itemsize * count
+            self.views[name] = buffer[position:position + size].cast(typecode)
+            position += size + (-size % 8)
+
+    @staticmethod
+    def nbytes(specs: Sequence[ArraySpec]) -> int:
+        sizes = (array(typecode).itemsize * count for _, typecode, count in specs)
+        return sum(size + (-size % 8) for size in sizes)
+
+    @classmethod
+    def create(cls, specs: Sequence[ArraySpec]) -> 'SharedArrays':
+        """Reserva un segmento nuevo (inicializado en ceros) para los arreglos."""
+        memory = shared_memory.SharedMemory(create=True, size=max(1, cls.nbytes(specs)))
+        return cls(memory, specs)
+
+    @classmethod
+    def attach(cls, name: str, specs: Sequence[ArraySpec]) -> 'SharedArrays':
+        """Se adjunta a un segmento existente por nombre, sin copiar."""
+        return cls(shared_memory.SharedMemory(name=name), specs)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def handle(self) -> Tuple[str, List[ArraySpec]]:
+        """Lo que necesita otro proceso para adjuntarse: (nombre, specs)."""
+        return self.memory.name, self.specs
+
+    def __getitem__(self, name: str) -> memoryview:
+        return self.views[name]
+
+    def close(self):
+        """Suelta las vistas y desmapea el segmento en este proceso."""
+        for view in self.views.values():
+            view.release()
+        self.views.clear()
+        self.memory.close()
+
+    def unlink(self):
+        """Cierra y elimina el segmento (solo el proceso que lo creó)."""
+        self.close()
+        self.memory.unlink()
+
+
+def publish_graph(graph: Graph, is_directed: bool = True) -> SharedArrays:
+    """
+    Copia un grafo a memoria compartida en formato CSR.
+
+    Guarda offsets, destinos, pesos y las etiquetas como UTF-8 con sus
+    offsets, igual que la caché binaria. Los grafos no dirigidos se
+    publican con ambos sentidos, que es lo que necesitan los recorridos.
+    """
+    graph = as_csr(graph, is_directed)
+    encoded = [label.encode('utf-8') for label in graph.labels]
+    label_offsets = array('q', [0])
+    for label in encoded:
+        label_offsets.append(label_offsets[-1] + len(label))
+
+    num_vertices, num_edges = graph.num_vertices, graph.num_edges
+    shared = SharedArrays.create([
+        ("offsets", 'q', num_vertices + 1),
+        ("targets", 'i', num_edges),
+        ("weights", 'd', num_edges),
+        ("label_offsets", 'q', num_vertices + 1),
+        ("labels", 'B', label_offsets[-1]),
+        ("flags", 'q', 1),
+    ])
+    shared["offsets"][:] = memoryview(array('q', graph.offsets))
+    shared["targets"][:] = memoryview(array('i', graph.targets))
+    shared["weights"][:] = memoryview(array('d', graph.weights))
+    shared["label_offsets"][:] = memoryview(label_offsets)
+    shared["labels"][:] = b"".join(encoded)
+    shared["flags"][0] = 1 if graph.is_directed else 0
+    return shared
+
+
+def graph_from_shared(shared: SharedArrays) -> CSRGraph:
+    """CSRGraph que lee directamente los arreglos del segmento (sin copia)."""
+    labels = LabelTable(shared["label_offsets"], shared["labels"])
+    graph = CSRGraph(labels, shared["offsets"], shared["targets"], shared["weights"],
+                     bool(shared["flags"][0]))
+    graph._shared = shared  # mantiene el segmento mapeado mientras viva el grafo
+    return graph
+
+
+def vertex_ranges(offsets: Sequence[int], parts: int) -> List[Tuple[int, int]]:
+    """
+    Divide los vértices en rangos contiguos con un número parecido de aristas.
+
+    Las fronteras se buscan con bisect sobre offsets, así un vértice con
+    muchas aristas no deja desbalanceado a un solo proceso.
+    """
+    num_vertices = len(offsets) - 1
+    num_edges = offsets[-1]
+    boundaries = [0]
+    for i in range(1, parts):
+        vid = min(num_vertices, bisect_left(offsets, num_edges * i // parts))
+        if vid > boundaries[-1]:
+            boundaries.append(vid)
+    if num_vertices > boundaries[-1] or num_vertices == 0:
+        boundaries.append(num_vertices)
+    return [(boundaries[i], boundaries[i + 1]) for i in range(len(boundaries) - 1)]
+
+
+# --- Tareas de los workers (se ejecutan en los procesos del pool) ---
+
+# Grafo adjuntado por el inicializador de cada proceso
+_worker_graph: Optional[CSRGraph] = None
+
+
+def _attach_worker(handle: Tuple[str, List[ArraySpec]]):
+    global _worker_graph
+    _worker_graph = graph_from_shared(SharedArrays.attach(*handle))
+
+
+def worker_graph() -> CSRGraph:
+    """Grafo compartido del proceso actual (solo dentro de tareas de SharedAnalytics.map)."""
+    if _worker_graph is None:
+        raise RuntimeError("Este proceso no está adjuntado a un grafo compartido")
+    return _worker_graph
+
+
+def _degree_task(task) -> None:
+    """
+    Map: recorre las aristas de un rango de vértices.
+
+    Escribe la suma de pesos de salida de su rango en ``weighted_out``. Si
+    recibe ``base`` (grafos dirigidos) deja además sus conteos de entrada
+    como pares dispersos (vértice, aristas, peso) ordenados por vértice, en
+    su tramo de ``pair_*`` a partir de ``base``; _reduce_task los suma
+    después.
+    """
+    (start, end), row, base, handle = task
+    graph = _worker_graph
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    directed = base is not None
+    in_counts: Dict[int, int] = {}
+    in_weights: Dict[int, float] = {}
+    weighted_out = array('d', bytes(8 * (end - start)))
+
+    for u in range(start, end):
+        total = 0.0
+        for i in range(offsets[u], offsets[u + 1]):
+            weight = weights[i]
+            total += weight
+            if directed:
+                v = targets[i]
+                in_counts[v] = in_counts.get(v, 0) + 1
+                in_weights[v] = in_weights.get(v, 0.0) + weight
+        weighted_out[u - start] = total
+
+    out = SharedArrays.attach(*handle)
+    out["weighted_out"][start:end] = memoryview(weighted_out)
+    if directed:
+        ids = array('i', sorted(in_counts))
+        size = len(ids)
+        out["pair_ids"][base:base + size] = memoryview(ids)
+        out["pair_counts"][base:base + size] = memoryview(array('q', map(in_counts.__getitem__, ids)))
+        out["pair_weights"][base:base + size] = memoryview(array('d', map(in_weights.__getitem__, ids)))
+        out["pair_sizes"][row] = size
+    out.close()
+
+
+def _reduce_task(task) -> None:
+    """
+    Reduce: suma los pares de entrada de un rango de vértices destino.
+
+    Los pares de cada tarea map están ordenados, así que el tramo del rango
+    se ubica con bisect y solo se recorren los pares que le tocan.
+    """
+    (start, end), bases, handle = task
+    out = SharedArrays.attach(*handle)
+    pair_ids, pair_counts, pair_weights = out["pair_ids"], out["pair_counts"], out["pair_weights"]
+    sizes = out["pair_sizes"]
+    in_degrees, weighted_in = out["in_degrees"], out["weighted_in"]
+    for row, base in enumerate(bases):
+        ids = pair_ids[base:base + sizes[row]]
+        low = bisect_left(ids, start)
+        high = bisect_left(ids, end, low)
+        for j in range(low, high):
+            vid = ids[j]
+            in_degrees[vid] += pair_counts[base + j]
+            weighted_in[vid] += pair_weights[base + j]
+        ids.release()
+    out.close()
+
+
+def _top_k_task(task) -> List[Tuple[str, float]]:
+    """Top-k local de un rango de vértices; se fusiona luego con los demás rangos."""
+    (start, end), k, criterion, handle = task
+    graph = _worker_graph
+    offsets, labels = graph.offsets, graph.labels
+    out = SharedArrays.attach(*handle)
+    in_degrees, weighted_in, weighted_out = out["in_degrees"], out["weighted_in"], out["weighted_out"]
+    directed = graph.is_directed
+
+    def score(vid: int) -> float:
+        out_degree = offsets[vid + 1] - offsets[vid]
+        if criterion == "weighted":
+            return weighted_out[vid] + (weighted_in[vid] if directed else 0.0)
+        if not directed or criterion == "out":
+            return out_degree
+        if criterion == "in":
+            return in_degrees[vid]
+        return out_degree + in_degrees[vid]
+
+    candidates = ((labels[vid], score(vid)) for vid in range(start, end)
+                  if offsets[vid + 1] > offsets[vid] or in_degrees[vid])
+    best = heapq.nsmallest(k, candidates, key=lambda item: (-item[1], item[0]))
+    out.close()
+    return best
+
+
+def _traversal_task(sources: List[int]) -> List[Tuple[int, int, int, int]]:
+    """BFS desde cada origen: (origen, alcanzados, excentricidad, suma de saltos)."""
+    graph = _worker_graph
+    results = []
+    for vid in sources:
+        reached = eccentricity = total = 0
+        for depth, frontier in iter_frontiers(graph, (graph.labels[vid],)):
+            reached += len(frontier)
+            eccentricity = depth
+            total += depth * len(frontier)
+        results.append((vid, reached, eccentricity, total))
+    return results
+
+
+# --- Lado del proceso principal ---
+
+class VertexStats:
+    """Grados y sumas de pesos por vértice calculados por SharedAnalytics."""
+
+    def __init__(self, labels: Sequence[str], is_directed: bool, out_degrees: array,
+                 in_degrees: array, weighted_out: array, weighted_in: array):
+        self.labels = labels
+        self.is_directed = is_directed
+        self.out_degrees = out_degrees
+        self.in_degrees = in_degrees
+        self.weighted_out = weighted_out
+        self.weighted_in = weighted_in
+
+    def degree_index(self) -> DegreeIndex:
+        """
+        Índice de grados compatible con analyze_graph.
+
+        En un grafo no dirigido cada arista cuenta una vez por extremo, como
+        el UndirectedDegreeIndex de load_graph(single_copy=True).
+        """
+        labels = self.labels
+        out_degrees = {labels[vid]: degree for vid, degree in enumerate(self.out_degrees) if degree}
+        if not self.is_directed:
+            return UndirectedDegreeIndex(out_degrees, sum(self.out_degrees) // 2)
+        in_degrees = {labels[vid]: degree for vid, degree in enumerate(self.in_degrees) if degree}
+        return DegreeIndex(out_degrees, in_degrees, sum(self.out_degrees))
+
+
+class SharedAnalytics:
+    """
+    Pool de procesos que analiza un grafo publicado en memoria compartida.
+
+    El grafo se copia una sola vez a un segmento de shared_memory y cada
+    worker se adjunta al arrancar, sin serializar la lista de adyacencia.
+    El trabajo se reparte en rangos de vértices balanceados por aristas y
+    los resultados se combinan estilo map-reduce: los workers escriben
+    conteos parciales dispersos en otro segmento compartido, otros rangos
+    los suman y el top-k se fusiona a partir de los top-k locales.
+
+    Uso:
+        with SharedAnalytics(load_graph("edges_directed.txt", compact=True)) as analytics:
+            stats = analytics.vertex_stats()
+            print(analytics.top_k(10, "weighted"))
+    """
+
+    def __init__(self, graph: Graph, is_directed: Optional[bool] = None,
+                 workers: Optional[int] = None, shards_per_worker: int = SHARDS_PER_WORKER):
+        """
+        Args:
+            graph: Grafo cargado (dict, CSRGraph o UndirectedCSRGraph)
+            is_directed: Si es None se toma del grafo (True para un dict)
+            workers: Número de procesos (por defecto, os.cpu_count())
+            shards_per_worker: Rangos de vértices por proceso
+        """
+        if is_directed is None:
+            is_directed = getattr(graph, 'is_directed', True)
+        self.graph = graph
+        self.is_directed = is_directed
+        self.workers = workers or os.cpu_count() or 1
+        self.shards_per_worker = shards_per_worker
+        self._shared: Optional[SharedArrays] = None
+        self._stats_block: Optional[SharedArrays] = None
+        self._stats: Optional[VertexStats] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'SharedAnalytics':
+        self._shared = publish_graph(self.graph, self.is_directed)
+        self.csr = graph_from_shared(self._shared)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_attach_worker,
+                                         initargs=(self._shared.handle(),))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._pool.shutdown()
+        if self._stats_block is not None:
+            self._stats_block.unlink()
+            self._stats_block = None
+        # El CSRGraph del proceso principal también mira el segmento
+        self.csr = None
+        self._shared.unlink()
+        self._shared = None
+
+    def map(self, function: Callable, tasks: Iterable) -> Iterator:
+        """
+        Ejecuta function(task) en el pool, en orden; dentro de la tarea el
+        grafo compartido se obtiene con worker_graph().
+        """
+        return self._pool.map(function, tasks)
+
+    def ranges(self, parts: Optional[int] = None) -> List[Tuple[int, int]]:
+        return vertex_ranges(self.csr.offsets, parts or self.workers * self.shards_per_worker)
+
+    def vertex_stats(self) -> VertexStats:
+        """
+        Grados de entrada y salida y sumas de pesos de todos los vértices.
+
+        Map: cada proceso recorre un rango de vértices y deja sus conteos de
+        entrada como pares dispersos (vértice, conteo, peso); cada tramo de
+        pares tiene lugar para min(aristas del rango, V), así el bloque
+        ocupa a lo sumo min(E, procesos × V) pares. Reduce: otros rangos de
+        vértices destino suman los pares que les tocan. Los grados de
+        salida salen directamente de offsets, y en no dirigidos (el CSR
+        compartido tiene ambos sentidos) la entrada es igual a la salida.
+        """
+        if self._stats is not None:
+            return self._stats
+        csr = self.csr
+        num_vertices, offsets = csr.num_vertices, csr.offsets
+        map_ranges = self.ranges(self.workers)
+        bases = [0]
+        if self.is_directed:
+            for start, end in map_ranges:
+                bases.append(bases[-1] + min(offsets[end] - offsets[start], num_vertices))
+        capacity = bases[-1]
+        block = SharedArrays.create([
+            ("pair_ids", 'i', capacity),
+            ("pair_counts", 'q', capacity),
+            ("pair_weights", 'd', capacity),
+            ("pair_sizes", 'q', len(map_ranges)),
+            ("in_degrees", 'q', num_vertices),
+            ("weighted_in", 'd', num_vertices),
+            ("weighted_out", 'd', num_vertices),
+        ])
+        self._stats_block = block
+        handle = block.handle()
+
+        list(self._pool.map(_degree_task, [(span, row, bases[row] if self.is_directed else None,
+                                            handle) for row, span in enumerate(map_ranges)]))
+        out_degrees = array('q', (offsets[vid + 1] - offsets[vid] for vid in range(num_vertices)))
+        if self.is_directed:
+            reduce_ranges = _even_ranges(num_vertices, self.workers * self.shards_per_worker)
+            list(self._pool.map(_reduce_task, [(span, bases[:-1], handle)
+                                               for span in reduce_ranges]))
+        else:
+            block["in_degrees"][:] = memoryview(out_degrees)
+            block["weighted_in"][:] = block["weighted_out"]
+
+        self._stats = VertexStats(list(csr.labels), self.is_directed, out_degrees,
+                                  array('q', block["in_degrees"]),
+                                  array('d', block["weighted_out"]),
+                                  array('d', block["weighted_in"]))
+        return self._stats
+
+    def top_k(self, k: int = 10, criterion: str = "total") -> List[Tuple[str, float]]:
+        """
+        Los k vértices de mayor grado, con los criterios de top_k_vertices.
+
+        Cada rango calcula su top-k local con un heap acotado y aquí se
+        fusionan; los empates se resuelven por etiqueta, igual que en
+        analyze_graph. En no dirigidos 'in', 'out' y 'total' son el grado.
+        """
+        if criterion not in DEGREE_CRITERIA:
+            raise ValueError(f"Criterio '{criterion}' inválido; use uno de {DEGREE_CRITERIA}")
+        if k <= 0:
+            return []
+        self.vertex_stats()
+        handle = self._stats_block.handle()
+        local = self._pool.map(_top_k_task, [(span, k, criterion, handle) for span in self.ranges()])
+        merged = (item for best in local for item in best)
+        return heapq.nsmallest(k, merged, key=lambda item: (-item[1], item[0]))
+
+    def traversal_metrics(self, sources: Optional[Iterable[str]] = None,
+                          num_sources: int = DEFAULT_TRAVERSAL_SOURCES,
+                          seed: int = 0) -> List[Dict[str, object]]:
+        """
+        Métricas de BFS desde varios orígenes, repartidos entre los procesos.
+
+        Por cada origen devuelve los vértices alcanzados, la excentricidad en
+        saltos y la distancia media en saltos a los alcanzados. Sin
+        ``sources`` se toma una muestra de ``num_sources`` vértices con
+        aristas de salida.
+
+        Returns:
+            Una entrada por origen, en el orden de los orígenes
+        """
+        csr = self.csr
+        if sources is not None:
+            ids = []
+            for vertex in sources:
+                vid = csr.vertex_id(vertex)
+                if vid < 0:
+                    raise KeyError(f"El vértice '{vertex}' no existe en el grafo")
+                ids.append(vid)
+        else:
+            candidates = [vid for vid in range(csr.num_vertices) if csr.out_degree_of(vid)]
+            ids = random.Random(seed).sample(candidates, min(num_sources, len(candidates)))
+
+        chunks = [ids[i::self.workers] for i in range(self.workers) if ids[i::self.workers]]
+        by_source = {}
+        for results in self._pool.map(_traversal_task, chunks):
+            for vid, reached, eccentricity, total in results:
+                by_source[vid] = {"vertex": csr.labels[vid], "reached": reached,
+                                  "eccentricity": eccentricity,
+                                  "mean_hops": total / (reached - 1) if reached > 1 else 0.0}
+        return [by_source[vid] for vid in ids]
+
+
+def _even_ranges(count: int, parts: int) -> List[Tuple[int, int]]:
+    parts = max(1, min(parts, count))
+    bounds = [count * i // parts for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(parts) if bounds[i + 1] > bounds[i]]
+
+
+def print_shared_report(analytics: SharedAnalytics, graph_type: str, top_n: int = 10,
+                        num_sources: int = DEFAULT_TRAVERSAL_SOURCES):
+    """Muestra grados, top-k y métricas de recorridos con el formato de analyze_graph."""
+    stats = analytics.vertex_stats()
+    index = stats.degree_index()
+    print(f"\n{'='*60}")
+    print(f"🧵 Análisis multiproceso del Grafo {graph_type} ({analytics.workers} procesos)")
+    print(f"{'='*60}")
+    print(f"📊 Estadísticas generales:")
+    print(f"   • Vértices: {len(index.vertices())}")
+    print(f"   • Aristas: {index.num_edges}")
+    weight = sum(stats.weighted_out) / (1 if analytics.is_directed else 2)
+    print(f"   • Peso total: {weight:.1f} km")
+
+    for criterion in ("total", "weighted"):
+        print(f"\n🏆 Top {top_n} vértices por grado {criterion}:")
+        for rank, (vertex, score) in enumerate(analytics.top_k(top_n, criterion), 1):
+            print(f"   {rank}. {vertex}: {score:g}")
+
+    metrics = analytics.traversal_metrics(num_sources=num_sources)
+    if metrics:
+        print(f"\n🧭 Recorridos BFS desde {len(metrics)} orígenes:")
+        print(f"   • Alcance medio: {sum(m['reached'] for m in metrics) / len(metrics):.1f} vértices")
+        print(f"   • Excentricidad máxima: {max(m['eccentricity'] for m in metrics)} saltos")
+        print(f"   • Saltos medios: {sum(m['mean_hops'] for m in metrics) / len(metrics):.2f}")
+
+
+def main():
+    """Punto de entrada para el análisis multiproceso de un archivo de aristas."""
+    parser = argparse.ArgumentParser(description="Análisis de grafos con memoria compartida")
+    parser.add_argument("file", help="Archivo de aristas (formato edges_*.txt)")
+    parser.add_argument("--undirected", action="store_true", help="Tratar el grafo como no dirigido")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Procesos (por defecto, os.cpu_count())")
+    parser.add_argument("--top", type=int, default=10, help="Vértices a mostrar en cada ranking")
+    parser.add_argument("--sources", type=int, default=DEFAULT_TRAVERSAL_SOURCES,
+                        help="Orígenes de BFS para las métricas de recorrido")
+    args = parser.parse_args()
+
+    is_directed = not args.undirected
+    graph = load_graph(args.file, is_directed, compact=True)
+    with SharedAnalytics(graph, is_directed, args.workers) as analytics:
+        print_shared_report(analytics, "DIRIGIDO" if is_directed else "NO DIRIGIDO",
+                            args.top, args.sources)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Caminos más cortos - Semana 3
+Dijkstra con heap binario sobre los grafos de load_graph
+"""
+
+import heapq
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from analyze_graph import Graph
+from csr_graph import CSRGraph, as_csr
+
+INFINITY = float('inf')
+
+
+class ShortestPathTree:
+    """Distancias y predecesores desde uno o varios orígenes."""
+
+    def __init__(self, graph: CSRGraph, distances: array, predecessors: array):
+        self._graph = graph
+        self._distances = distances
+        self._predecessors = predecessors
+
+    def distance(self, vertex: str) -> float:
+        """Distancia más corta hasta el vértice (inf si no es alcanzable)."""
+        vid = self._graph.vertex_id(vertex)
+        return self._distances[vid] if vid >= 0 else INFINITY
+
+    def path_to(self, vertex: str) -> List[str]:
+        """Camino desde el origen más cercano hasta el vértice ([] si no hay)."""
+        vid = self._graph.vertex_id(vertex)
+        if vid < 0 or self._distances[vid] == INFINITY:
+            return []
+        return _reconstruct(self._graph, self._predecessors, vid)
+
+    @property
+    def distance_array(self) -> array:
+        """Distancias indexadas por id de vértice (inf si no es alcanzable)."""
+        return self._distances
+
+    def distances(self) -> Dict[str, float]:
+        """Distancias de todos los vértices alcanzables."""
+        labels = self._graph.labels
+        return {labels[vid]: dist for vid, dist in enumerate(self._distances)
+                if dist != INFINITY}
+
+
+def _reconstruct(graph: CSRGraph, predecessors: array, vid: int) -> List[str]:
+    path = []
+    while vid >= 0:
+        path.append(graph.labels[vid])
+        vid = predecessors[vid]
+    path.reverse()
+    return path
+
+
+class DijkstraEngine:
+    """
+    Motor de Dijkstra reutilizable sobre un grafo cargado.
+
+    Trabaja sobre ids internados y arreglos tipados de distancias y
+    predecesores, con un heap binario y borrado perezoso (las entradas
+    obsoletas se descartan al salir del heap). Entre consultas solo se
+    reinician los vértices tocados, así una consulta punto a punto con
+    salida temprana no paga O(V).
+    """
+
+    def __init__(self, graph: Graph, is_directed: bool = True):
+        """
+        Args:
+            graph: Dict de adyacencia o CSRGraph (los dict se convierten una vez)
+            is_directed: Solo informativo al convertir un dict
+        """
+        self.graph = as_csr(graph, is_directed)
+        if any(weight < 0 for weight in self.graph.weights):
+            raise ValueError("Dijkstra no admite pesos negativos")
+        num_vertices = self.graph.num_vertices
+        self._distances = array('d', [INFINITY]) * num_vertices
+        self._predecessors = array('i', [-1]) * num_vertices
+        self._touched: List[int] = []
+
+    def _ids(self, vertices: Iterable[str]) -> List[int]:
+        ids = []
+        for vertex in vertices:
+            vid = self.graph.vertex_id(vertex)
+            if vid < 0:
+                raise KeyError(f"El vértice '{vertex}' no existe en el grafo")
+            ids.append(vid)
+        return ids
+
+    def _run(self, sources: List[int], target: int = -1):
+        """Ejecuta Dijkstra desde los orígenes; se detiene al fijar target."""
+        offsets, targets, weights = self.graph.offsets, self.graph.targets, self.graph.weights
+        dist, pred, touched = self._distances, self._predecessors, self._touched
+
+        heap = []
+        for vid in sources:
+            if dist[vid] != 0.0:
+                dist[vid] = 0.0
+                touched.append(vid)
+                heap.append((0.0, vid))
+        heapq.heapify(heap)
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue  # entrada obsoleta
+            if u == target:
+                return
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                candidate = d + weights[i]
+                if candidate < dist[v]:
+                    if dist[v] == INFINITY:
+                        touched.append(v)
+                    dist[v] = candidate
+                    pred[v] = u
+                    heapq.heappush(heap, (candidate, v))
+
+    def _reset(self):
+        dist, pred = self._distances, self._predecessors
+        for vid in self._touched:
+            dist[vid] = INFINITY
+            pred[vid] = -1
+        self._touched.clear()
+
+    def _snapshot(self) -> ShortestPathTree:
+        tree = ShortestPathTree(self.graph, array('d', self._distances),
+                                array('i', self._predecessors))
+        self._reset()
+        return tree
+
+    def shortest_path(self, source: str, target: str) -> Tuple[float, List[str]]:
+        """
+        Camino más corto entre dos vértices, con salida temprana.
+
+        Returns:
+            (distancia, camino); (inf, []) si target no es alcanzable
+        """
+        source_id, target_id = self._ids((source, target))
+        self._run([source_id], target_id)
+        distance = self._distances[target_id]
+        path = [] if distance == INFINITY else \
+            _reconstruct(self.graph, self._predecessors, target_id)
+        self._reset()
+        return distance, path
+
+    def single_source(self, source: str) -> ShortestPathTree:
+        """Árbol de caminos más cortos desde un origen a todos los vértices."""
+        self._run(self._ids((source,)))
+        return self._snapshot()
+
+    def multi_source(self, sources: Iterable[str]) -> ShortestPathTree:
+        """Distancia de cada vértice al origen más cercano del conjunto."""
+        self._run(self._ids(sources))
+        return self._snapshot()
+
+    def batch_shortest_paths(self, pairs: Iterable[Tuple[str, str]]) -> List[Tuple[float, List[str]]]:
+        """
+        Resuelve muchas consultas (origen, destino).
+
+        Las consultas se agrupan por origen: un origen con un solo destino usa
+        salida temprana; uno con varios destinos calcula el árbol una vez.
+        """
+        pairs = list(pairs)
+        by_source: Dict[str, List[int]] = defaultdict(list)
+        for position, (source, _) in enumerate(pairs):
+            by_source[source].append(position)
+
+        results: List[Optional[Tuple[float, List[str]]]] = [None] * len(pairs)
+        for source, positions in by_source.items():
+            if len(positions) == 1:
+                results[positions[0]] = self.shortest_path(source, pairs[positions[0]][1])
+                continue
+            tree = self.single_source(source)
+            for position in positions:
+                target = pairs[position][1]
+                self._ids((target,))
+                results[position] = (tree.distance(target), tree.path_to(target))
+        return results
+
+
+def dijkstra(graph: Graph, source: str, target: Optional[str] = None):
+    """
+    Atajo para una sola consulta.
+
+    Returns:
+        (distancia, camino) si se indica target; si no, el ShortestPathTree
+    """
+    engine = DijkstraEngine(graph)
+    if target is not None:
+        return engine.shortest_path(source, target)
+    return engine.single_source(source)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Vistas de subgrafos - Semana 3
+Vecindarios de k saltos, subgrafos inducidos y filtros por peso sin copiar el grafo
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from analyze_graph import Graph
+
+
+class SubgraphView(Mapping):
+    """
+    Vista perezosa de una parte de un grafo cargado.
+
+    No copia la lista de adyacencia: cada ``view[v]`` filtra en el momento
+    la lista de ``v`` del grafo base, quedándose con los vecinos dentro del
+    conjunto de vértices y con peso dentro del rango pedido. Se comporta como
+    el diccionario de load_graph (las claves son los vértices que conservan
+    alguna arista), así que analyze_graph y los helpers de grados la aceptan
+    y su costo es proporcional a la región, no al grafo completo.
+
+    El conjunto de claves se calcula la primera vez que se recorre o se mide
+    la vista y se guarda: ``len``, ``in`` y los ``view[v]`` de vértices sin
+    aristas ya no vuelven a filtrar. Por eso el grafo base no debe cambiar
+    mientras se usa la vista.
+
+    El grafo base puede ser un dict, un CSRGraph, un UndirectedCSRGraph u
+    otra vista, así que las vistas se pueden encadenar. Sobre un grafo no
+    dirigido la vista es simétrica, como la lista con ambos sentidos.
+    """
+
+    def __init__(self, graph: Graph, vertices: Optional[Iterable[str]] = None,
+                 min_weight: Optional[float] = None, max_weight: Optional[float] = None):
+        """
+        Args:
+            graph: Grafo base
+            vertices: Vértices de la vista (None para todos los del grafo base)
+            min_weight: Peso mínimo de las aristas que se conservan
+            max_weight: Peso máximo de las aristas que se conservan
+        """
+        self.graph = graph
+        # dict como conjunto ordenado: conserva el orden en que se dieron
+        self.vertices: Optional[Dict[str, None]] = \
+            dict.fromkeys(vertices) if vertices is not None else None
+        self.min_weight = min_weight
+        self.max_weight = max_weight
+        self.is_directed = getattr(graph, 'is_directed', True)
+        self._keys: Optional[Dict[str, None]] = None
+
+    def _keeps(self, neighbor: str, weight: float) -> bool:
+        if self.vertices is not None and neighbor not in self.vertices:
+            return False
+        if self.min_weight is not None and weight < self.min_weight:
+            return False
+        return self.max_weight is None or weight <= self.max_weight
+
+    def _candidates(self) -> Iterator[str]:
+        if self.vertices is None:
+            return iter(self.graph)
+        graph = self.graph
+        return (vertex for vertex in self.vertices if vertex in graph)
+
+    def _scan(self) -> Iterator[str]:
+        """Recorre los candidatos y deja los que conservan alguna arista."""
+        graph, keeps = self.graph, self._keeps
+        for vertex in self._candidates():
+            if any(keeps(neighbor, weight) for neighbor, weight in graph[vertex]):
+                yield vertex
+
+    def _kept(self) -> Dict[str, None]:
+        """Claves de la vista (se calculan una sola vez)."""
+        if self._keys is None:
+            self._keys = dict.fromkeys(self._scan())
+        return self._keys
+
+    # --- Interfaz de Mapping compatible con el diccionario de adyacencia ---
+
+    def __getitem__(self, vertex: str) -> List[Tuple[str, float]]:
+        region = self._keys if self._keys is not None else self.vertices
+        if region is not None and vertex not in region:
+            raise KeyError(vertex)
+        keeps = self._keeps
+        neighbors = [(neighbor, weight) for neighbor, weight in self.graph[vertex]
+                     if keeps(neighbor, weight)]
+        if not neighbors:
+            raise KeyError(vertex)
+        return neighbors
+
+    def __contains__(self, vertex: object) -> bool:
+        if self._keys is not None:
+            return vertex in self._keys
+        if self.vertices is not None and vertex not in self.vertices:
+            return False
+        if vertex not in self.graph:
+            return False
+        return any(self._keeps(neighbor, weight) for neighbor, weight in self.graph[vertex])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._kept())
+
+    def __len__(self) -> int:
+        return len(self._kept())
+
+    def __bool__(self) -> bool:
+        # Basta con encontrar un vértice; no hace falta calcular todas las claves
+        if self._keys is not None:
+            return bool(self._keys)
+        return next(self._scan(), None) is not None
+
+    def __repr__(self) -> str:
+        region = "todos" if self.vertices is None else len(self.vertices)
+        return (f"SubgraphView(vertices={region}, min_weight={self.min_weight}, "
+                f"max_weight={self.max_weight})")
+
+
+def k_hop_vertices(graph: Graph, sources: Union[str, Iterable[str]], k: int = 1) -> List[str]:
+    """
+    Vértices a k saltos o menos de las fuentes, en orden de descubrimiento (BFS).
+
+    Recorre solo las listas de los vértices alcanzados, siguiendo las aristas
+    de salida (en un grafo no dirigido las listas ya son simétricas).
+    """
+    if isinstance(sources, str):
+        sources = [sources]
+    seen = dict.fromkeys(sources)
+    frontier = list(seen)
+    for _ in range(k):
+        next_frontier = []
+        for vertex in frontier:
+            for neighbor, _ in graph.get(vertex, ()):
+                if neighbor not in seen:
+                    seen[neighbor] = None
+                    next_frontier.append(neighbor)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return list(seen)
+
+
+def ego_network(graph: Graph, center: Union[str, Iterable[str]], k: int = 1) -> SubgraphView:
+    """
+    Red ego de radio k: subgrafo inducido por los vértices a k saltos o menos.
+
+    Incluye las aristas entre vértices del borde, como el ego network clásico.
+
+    Args:
+        graph: Grafo base
+        center: Vértice central (o varios)
+        k: Número máximo de saltos
+    """
+    return SubgraphView(graph, k_hop_vertices(graph, center, k))
+
+
+def induced_subgraph(graph: Graph, vertices: Iterable[str]) -> SubgraphView:
+    """Subgrafo inducido: las aristas del grafo base con ambos extremos en ``vertices``."""
+    return SubgraphView(graph, vertices)
+
+
+def weight_filter(graph: Graph, min_weight: Optional[float] = None,
+                  max_weight: Optional[float] = None) -> SubgraphView:
+    """Vista con las aristas de peso en [min_weight, max_weight] (límites opcionales)."""
+    return SubgraphView(graph, min_weight=min_weight, max_weight=max_weight)
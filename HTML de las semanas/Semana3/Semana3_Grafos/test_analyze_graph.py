@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los totales de analyze_graph - Semana 3
+"""
+
+from collections import Counter
+
+import pytest
+
+from analyze_graph import (DEGREE_CRITERIA, analyze_graph, build_edge_index, calculate_total_weight,
+                           count_edges, find_most_connected_vertex, has_edge, has_edges, load_graph,
+                           top_k_vertices)
+from graph_stream import stream_graph_stats
+from graph_updates import DynamicGraph
+from shared_graph import SharedAnalytics
+
+# Incluye una arista repetida y un lazo
+EDGES = "A B 1\nB C 2\nC C 4\nA B 1\nD A 3\nC A 5\n"
+
+
+@pytest.fixture
+def edges_file(tmp_path):
+    path = tmp_path / "g.txt"
+    path.write_text(EDGES, encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize("options", [{}, {"compact": True}, {"single_copy": True}])
+def test_undirected_totals_count_each_edge_once(edges_file, options):
+    graph = load_graph(edges_file, False, **options)
+    assert count_edges(graph, False) == 6
+    assert calculate_total_weight(graph, False) == 16.0
+
+
+def test_undirected_report_matches_single_copy(edges_file, capsys):
+    analyze_graph(load_graph(edges_file, False), "X", False, mode="summary")
+    mirrored = capsys.readouterr().out
+    analyze_graph(load_graph(edges_file, False, single_copy=True), "X", False, mode="summary")
+    assert capsys.readouterr().out == mirrored
+    assert "Aristas: 6" in mirrored
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+def test_stream_totals_match_loaded_graph(edges_file, is_directed):
+    stats = stream_graph_stats(edges_file, is_directed)
+    graph = load_graph(edges_file, is_directed)
+    assert stats.num_edges == count_edges(graph, is_directed)
+    assert stats.total_weight == calculate_total_weight(graph, is_directed)
+
+
+def _expected_ranking(edges, is_directed, criterion):
+    """Ranking por definición: cada arista suma a sus dos extremos (un lazo, dos veces)."""
+    scores = Counter()
+    for line in edges.split("\n"):
+        if not line:
+            continue
+        u, v, w = line.split()
+        scores.update({u: 0, v: 0})
+        if is_directed and criterion in ("out", "in"):
+            scores[u if criterion == "out" else v] += 1
+            continue
+        amount = float(w) if criterion == "weighted" else 1
+        scores[u] += amount
+        scores[v] += amount
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+@pytest.mark.parametrize("criterion", DEGREE_CRITERIA)
+def test_directed_top_k_matches_definition(edges_file, criterion):
+    for options in ({}, {"compact": True}):
+        graph = load_graph(edges_file, **options)
+        assert top_k_vertices(graph, 10, criterion) == _expected_ranking(EDGES, True, criterion)
+
+
+@pytest.mark.parametrize("criterion", DEGREE_CRITERIA)
+def test_undirected_top_k_is_the_same_for_every_storage(edges_file, criterion):
+    expected = _expected_ranking(EDGES, False, criterion)
+    for options in ({}, {"compact": True}, {"single_copy": True}):
+        graph = load_graph(edges_file, False, **options)
+        assert top_k_vertices(graph, 10, criterion, is_directed=False) == expected
+        assert top_k_vertices(DynamicGraph(graph, False), 10, criterion) == expected
+    with SharedAnalytics(load_graph(edges_file, False, compact=True), workers=2) as analytics:
+        assert analytics.top_k(10, criterion) == expected
+    assert top_k_vertices(load_graph(edges_file, False), 2, criterion, is_directed=False) == expected[:2]
+
+
+def test_undirected_top_k_on_matrix(tmp_path):
+    # Sin aristas repetidas, que la matriz fundiría
+    edges = "A B 1\nB C 2\nC C 4\nD A 3\nC A 5\n"
+    path = tmp_path / "m.txt"
+    path.write_text(edges, encoding='utf-8')
+    graph = load_graph(str(path), False, matrix=True)
+    for criterion in DEGREE_CRITERIA:
+        assert top_k_vertices(graph, 10, criterion) == _expected_ranking(edges, False, criterion)
+    assert find_most_connected_vertex(graph) == "C"
+
+
+STORAGES = [{}, {"compact": True}, {"single_copy": True}]
+EDGE_QUERIES = [(u, v) for u in "ABCDX" for v in "ABCDX"]
+
+
+@pytest.mark.parametrize("is_directed, options", [(True, {}), (True, {"compact": True})] +
+                         [(False, options) for options in STORAGES])
+def test_has_edges_matches_edge_list(edges_file, is_directed, options):
+    stored = {tuple(line.split()[:2]) for line in EDGES.splitlines()}
+    if not is_directed:
+        stored |= {(v, u) for u, v in stored}
+    graph = load_graph(edges_file, is_directed, **options)
+    expected = [pair in stored for pair in EDGE_QUERIES]
+    assert has_edges(graph, EDGE_QUERIES) == expected
+    assert [has_edge(graph, u, v) for u, v in EDGE_QUERIES] == expected
+    index = build_edge_index(graph)
+    assert [index.contains(u, v) for u, v in EDGE_QUERIES] == expected
+    # Los vértices que no existen nunca tienen aristas
+    assert not index.contains("X", "A") and not index.contains("A", "X")
+
+
+def test_edge_index_is_cached_on_compact_graphs(edges_file):
+    graph = load_graph(edges_file, compact=True)
+    index = build_edge_index(graph)
+    assert build_edge_index(graph) is index
+    assert len(index) == graph.num_edges
+    assert build_edge_index(load_graph(edges_file)) is not build_edge_index(load_graph(edges_file))
+
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del análisis por lotes - Semana 3
+"""
+
+import io
+import json
+import os
+
+import pytest
+
+from analyze_graph import analyze_graph, load_graph
+from batch_analyze import aggregate_results, analyze_file, run_batch
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.mark.parametrize("file_name, is_directed", [
+    ("edges_directed.txt", True),
+    ("edges_directed.txt", False),
+    ("edges_undirected.txt", False),
+])
+@pytest.mark.parametrize("compact", [True, False])
+def test_summary_matches_analyze_graph_report(file_name, is_directed, compact):
+    file_path = os.path.join(HERE, file_name)
+    result = analyze_file(file_path, is_directed, compact=compact)
+    stream = io.StringIO()
+    analyze_graph(load_graph(file_path, is_directed), file_name, is_directed,
+                  mode="summary", fmt="jsonl", output=stream)
+    report = next(json.loads(line) for line in stream.getvalue().splitlines()
+                  if json.loads(line)["kind"] == "summary")
+    assert result["vertices"] == report["vertices"]
+    assert result["edges"] == report["edges"]
+    assert result["density"] == pytest.approx(report["density"])
+
+
+def test_read_errors_and_problem_counts_come_from_diagnostics(tmp_path):
+    good = tmp_path / "bueno.txt"
+    # Etiquetas y líneas con emojis no deben confundirse con errores
+    good.write_text("❌ B 1\nB C peso\nrota\n❌ ❌ 2\n", encoding='utf-8')
+    missing = tmp_path / "falta.txt"
+    jobs = [(str(good), True), (str(missing), True)]
+    results = run_batch(jobs, workers=2, verbose=False)
+
+    assert results[0]["status"] == "ok"
+    assert results[0]["edges"] == 3
+    assert results[0]["parse_counts"]["bad_weight"] == 1
+    assert results[0]["parse_counts"]["missing_vertices"] == 1
+    assert results[1]["status"] == "error"
+    assert "no existe" in results[1]["error"]
+
+    summary = aggregate_results(results, 1.0)
+    assert summary["statuses"] == {"ok": 1, "error": 1}
+    assert summary["parse_counts"]["bad_weight"] == 1
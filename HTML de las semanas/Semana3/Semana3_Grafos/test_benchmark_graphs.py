@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los generadores de benchmarks - Semana 3
+"""
+
+import pytest
+
+from analyze_graph import count_edges, load_graph
+from benchmark_graphs import (GENERATORS, benchmark_file, erdos_renyi_edges, generate_graph_file,
+                              grid_edges, power_law_edges, time_operation)
+
+SIZES = [1, 5, 13, 100, 1_000, 2_017]
+
+
+@pytest.mark.parametrize("generator", [erdos_renyi_edges, power_law_edges, grid_edges])
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_generators_yield_the_requested_edges(generator, num_edges):
+    edges = list(generator(num_edges, seed=3))
+    assert len(edges) == num_edges
+    assert edges == list(generator(num_edges, seed=3))  # deterministas por semilla
+
+
+@pytest.mark.parametrize("generator", [erdos_renyi_edges, power_law_edges])
+@pytest.mark.parametrize("average_degree", [2.0, 8.0])
+def test_random_generators_use_the_requested_vertices(generator, average_degree):
+    num_edges = 4_000
+    num_vertices = int(num_edges / average_degree)
+    edges = list(generator(num_edges, average_degree, seed=1))
+    used = {u for u, _, _ in edges} | {v for _, v, _ in edges}
+    assert max(used) < num_vertices
+    if generator is erdos_renyi_edges:
+        # Cada vértice espera 2·grado medio extremos: con 8 no queda ninguno sin tocar
+        minimum = num_vertices if average_degree == 8.0 else 0.9 * num_vertices
+        assert len(used) >= minimum
+        assert all(u != v for u, v, _ in edges)
+    else:
+        # Ley de potencia: el vértice 0 es el hub
+        degree = {}
+        for u, v, _ in edges:
+            degree[u] = degree.get(u, 0) + 1
+            degree[v] = degree.get(v, 0) + 1
+        assert max(degree, key=degree.get) == 0
+
+
+@pytest.mark.parametrize("num_edges", [12, 13, 1_000])
+def test_grid_uses_the_smallest_square_that_fits(num_edges):
+    edges = list(grid_edges(num_edges))
+    side = next(v for u, v, _ in edges if u == 0 and v != 1)  # primera calle vertical
+    # El lado más chico con 2·lado·(lado - 1) >= aristas pedidas
+    assert 2 * side * (side - 1) >= num_edges > 2 * (side - 1) * (side - 2)
+    for u, v, weight in edges:
+        assert (v == u + 1 and v % side) or v == u + side
+        assert v < side * side and 0.1 <= weight <= 2.0
+    if num_edges == 12:  # cuadrícula 3x3 completa
+        assert len({(u, v) for u, v, _ in edges}) == 12 and side == 3
+
+
+@pytest.mark.parametrize("kind", list(GENERATORS))
+def test_generated_file_loads_with_the_requested_edges(tmp_path, kind):
+    _, is_directed = GENERATORS[kind]
+    path = generate_graph_file(kind, 500, str(tmp_path), seed=2)
+    assert generate_graph_file(kind, 500, str(tmp_path), seed=2) == path  # se reutiliza
+    graph = load_graph(path, is_directed, compact=True, mode="strict")
+    assert count_edges(graph, is_directed) == 500
+    with pytest.raises(ValueError):
+        generate_graph_file("estrella", 10, str(tmp_path))
+
+
+def test_timings_have_every_operation(tmp_path):
+    calls = []
+    timing = time_operation(lambda: calls.append(1), repeat=3, warmup=2)
+    assert len(calls) == 2 + 3 + 1  # calentamiento, medidas y la pasada de memoria
+    assert timing["min"] <= timing["median"] <= timing["max"] and timing["repeat"] == 3
+    assert "peak_bytes" in timing
+
+    path = generate_graph_file("grid", 200, str(tmp_path))
+    results = benchmark_file(path, False, compact=True, repeat=1, warmup=0, measure_memory=False)
+    assert set(results) == {"load_graph", "get_in_degree", "find_most_connected_vertex",
+                            "analyze_graph"}
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la centralidad por muestreo - Semana 3
+"""
+
+import random
+
+import pytest
+
+from analyze_graph import load_graph
+from centrality import approximate_centrality, sample_size
+
+INFINITY = float('inf')
+
+
+@pytest.fixture(scope="module")
+def edges_file(tmp_path_factory):
+    rng = random.Random(3)
+    lines = [f"v{rng.randrange(14)} v{rng.randrange(14)} {rng.randint(1, 4)}" for _ in range(45)]
+    path = tmp_path_factory.mktemp("centrality") / "g.txt"
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def _brute_force(graph):
+    """Intermediación y cercanía armónica por definición, con Floyd-Warshall y conteo de caminos."""
+    labels = list(graph.labels)
+    n = len(labels)
+    dist = [[INFINITY] * n for _ in range(n)]
+    for u in range(n):
+        dist[u][u] = 0.0
+        for i in range(graph.offsets[u], graph.offsets[u + 1]):
+            v = graph.targets[i]
+            if v != u:
+                dist[u][v] = min(dist[u][v], graph.weights[i])
+    for k in range(n):
+        for i in range(n):
+            for j in range(n):
+                if dist[i][k] + dist[k][j] < dist[i][j]:
+                    dist[i][j] = dist[i][k] + dist[k][j]
+
+    # Caminos mínimos contados arista por arista (las repetidas son caminos distintos)
+    sigma = [[0] * n for _ in range(n)]
+    for s in range(n):
+        sigma[s][s] = 1
+        for v in sorted(range(n), key=lambda x: dist[s][x]):
+            if v == s or dist[s][v] == INFINITY:
+                continue
+            for u in range(n):
+                for i in range(graph.offsets[u], graph.offsets[u + 1]):
+                    if graph.targets[i] == v and u != v and dist[s][u] + graph.weights[i] == dist[s][v]:
+                        sigma[s][v] += sigma[s][u]
+
+    pairs = (n - 1) * (n - 2)
+    betweenness, closeness = {}, {}
+    for v in range(n):
+        total = 0.0
+        for s in range(n):
+            for t in range(n):
+                if len({s, t, v}) == 3 and sigma[s][t] and dist[s][v] + dist[v][t] == dist[s][t]:
+                    total += sigma[s][v] * sigma[v][t] / sigma[s][t]
+        betweenness[labels[v]] = total / pairs
+        closeness[labels[v]] = sum(1.0 / dist[s][v] for s in range(n)
+                                   if s != v and dist[s][v] < INFINITY) / (n - 1)
+    return betweenness, closeness
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+def test_exact_mode_matches_brute_force(edges_file, is_directed):
+    graph = load_graph(edges_file, is_directed, compact=True)
+    result = approximate_centrality(graph, is_directed, epsilon=0.001, workers=2)
+    assert result.exact
+    betweenness, closeness = _brute_force(graph)
+    for label in graph.labels:
+        assert result.betweenness(label) == pytest.approx(betweenness[label], abs=1e-9)
+        assert result.closeness(label) == pytest.approx(closeness[label], abs=1e-9)
+
+
+def test_sampled_estimate_within_error_bound(tmp_path):
+    rng = random.Random(5)
+    lines = [f"v{rng.randrange(200)} v{rng.randrange(200)} {rng.randint(1, 9)}" for _ in range(800)]
+    path = tmp_path / "g.txt"
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    graph = load_graph(str(path), compact=True)
+    exact = approximate_centrality(graph, epsilon=0.001, workers=2)
+    epsilon = 0.3
+    sampled = approximate_centrality(graph, epsilon=epsilon, workers=2, seed=1)
+    assert exact.exact and not sampled.exact
+    assert sampled.samples == sample_size(graph.num_vertices, epsilon)
+    assert max(abs(sampled.betweenness(label) - exact.betweenness(label))
+               for label in graph.labels) <= epsilon
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de componentes y ciclos - Semana 3
+"""
+
+import random
+
+import pytest
+
+from analyze_graph import load_graph
+from components import (has_cycle, strongly_connected_components, structure_summary,
+                        weakly_connected_components)
+
+
+def _write(tmp_path, lines, name="g.txt"):
+    path = tmp_path / name
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def _reachable(graph, source):
+    seen, stack = {source}, [source]
+    while stack:
+        for neighbor, _ in graph.get(stack.pop(), ()):
+            if neighbor not in seen:
+                seen.add(neighbor)
+                stack.append(neighbor)
+    return seen
+
+
+def _partition(components):
+    return sorted(sorted(group) for group in components.members())
+
+
+@pytest.fixture
+def random_file(tmp_path):
+    rng = random.Random(9)
+    return _write(tmp_path, [f"v{rng.randrange(40)} v{rng.randrange(40)} 1" for _ in range(55)])
+
+
+def test_scc_matches_mutual_reachability(random_file):
+    graph = load_graph(random_file, compact=True)
+    reach = {vertex: _reachable(graph, vertex) for vertex in graph.labels}
+    expected = {frozenset(v for v in graph.labels if u in reach[v] and v in reach[u])
+                for u in graph.labels}
+    assert _partition(strongly_connected_components(graph)) == \
+        sorted(sorted(group) for group in expected)
+
+
+def test_wcc_matches_undirected_reachability(random_file):
+    directed = load_graph(random_file, compact=True)
+    undirected = load_graph(random_file, False)
+    expected = {frozenset(_reachable(undirected, vertex)) for vertex in undirected}
+    assert _partition(weakly_connected_components(directed)) == \
+        sorted(sorted(group) for group in expected)
+    single = load_graph(random_file, False, single_copy=True)
+    assert _partition(weakly_connected_components(single)) == \
+        _partition(weakly_connected_components(directed))
+
+
+@pytest.mark.parametrize("lines, directed_cycle, undirected_cycle", [
+    (["A B 1", "B C 1", "A C 1"], False, True),
+    (["A B 1", "B C 1", "C A 1"], True, True),
+    (["A B 1", "B C 1", "C D 1"], False, False),
+    (["A B 1", "B B 1"], True, True),
+    (["A B 1", "A B 2"], False, True),
+])
+def test_has_cycle(tmp_path, lines, directed_cycle, undirected_cycle):
+    file_path = _write(tmp_path, lines)
+    assert has_cycle(load_graph(file_path, compact=True)) == directed_cycle
+    for options in ({}, {"compact": True}, {"single_copy": True}):
+        graph = load_graph(file_path, False, **options)
+        assert has_cycle(graph, False) == undirected_cycle
+        assert structure_summary(graph, False)["has_cycle"] == undirected_cycle
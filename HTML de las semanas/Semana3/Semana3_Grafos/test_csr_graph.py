@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los grafos en arreglos tipados - Semana 3
+"""
+
+from analyze_graph import load_graph
+from csr_graph import as_csr
+
+EDGES = "A B 1\nB C 2\nC C 4\nA B 1\nD A 3\nC A 5\n"
+
+
+def _write(tmp_path, text=EDGES):
+    path = tmp_path / "g.txt"
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_mirrored_csr_matches_neighbor_views(tmp_path):
+    single = load_graph(_write(tmp_path), False, single_copy=True)
+    mirrored = single.to_csr()
+    assert dict(mirrored) == dict(single)
+    full = load_graph(_write(tmp_path), False, compact=True)
+    assert {v: sorted(n) for v, n in mirrored.items()} == {v: sorted(n) for v, n in full.items()}
+
+
+def test_mirrored_csr_is_cached(tmp_path):
+    single = load_graph(_write(tmp_path), False, single_copy=True)
+    assert as_csr(single, False) is single.to_csr()
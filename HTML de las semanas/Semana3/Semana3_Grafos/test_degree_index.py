@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del índice de grados - Semana 3
+"""
+
+from collections import Counter
+
+import pytest
+
+from analyze_graph import (DegreeIndex, UndirectedDegreeIndex, build_degree_index, get_in_degree,
+                           get_out_degree, load_graph)
+
+# Sin aristas repetidas (la matriz las fundiría); con un lazo y un vértice que solo recibe
+EDGES = [("A", "B"), ("B", "C"), ("C", "C"), ("A", "C"), ("D", "A"), ("C", "E")]
+VERTICES = ["A", "B", "C", "D", "E", "no-existe"]
+
+
+@pytest.fixture
+def edges_file(tmp_path):
+    path = tmp_path / "g.txt"
+    path.write_text("".join(f"{u} {v} 1\n" for u, v in EDGES), encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize("options", [{}, {"compact": True}, {"matrix": True}])
+def test_directed_degrees_match_edge_list(edges_file, options):
+    graph = load_graph(edges_file, **options)
+    index = DegreeIndex.from_graph(graph)
+    out_degrees = Counter(u for u, _ in EDGES)
+    in_degrees = Counter(v for _, v in EDGES)
+    for vertex in VERTICES:
+        assert index.out_degree(vertex) == out_degrees[vertex]
+        assert index.in_degree(vertex) == in_degrees[vertex]
+        assert index.total_degree(vertex) == out_degrees[vertex] + in_degrees[vertex]
+        assert get_out_degree(graph, vertex) == out_degrees[vertex]
+        assert get_in_degree(graph, vertex) == in_degrees[vertex]
+        assert get_in_degree(graph, vertex, index) == in_degrees[vertex]
+    assert index.num_edges == len(EDGES)
+    assert sorted(index.vertices()) == ["A", "B", "C", "D", "E"]
+
+
+@pytest.mark.parametrize("options", [{}, {"compact": True}, {"single_copy": True}])
+def test_undirected_degrees_count_incident_edges(edges_file, options):
+    graph = load_graph(edges_file, False, **options)
+    index = build_degree_index(graph)
+    # Un lazo cuenta dos veces en el grado de su vértice
+    degrees = Counter(u for u, _ in EDGES) + Counter(v for _, v in EDGES)
+    for vertex in VERTICES:
+        assert index.out_degree(vertex) == degrees[vertex]
+        assert index.in_degree(vertex) == degrees[vertex]
+    if isinstance(index, UndirectedDegreeIndex):
+        assert index.num_edges == len(EDGES)
+        assert all(index.total_degree(vertex) == degrees[vertex] for vertex in VERTICES)
+    else:
+        # La lista en ambos sentidos guarda cada arista dos veces
+        assert index.num_edges == 2 * len(EDGES)
+
+
+def test_index_is_cached_only_on_immutable_graphs(edges_file):
+    compact = load_graph(edges_file, compact=True)
+    assert build_degree_index(compact) is build_degree_index(compact)
+    assert get_in_degree(compact, "C") == 3  # ya usa el índice guardado
+
+    graph = load_graph(edges_file)
+    index = build_degree_index(graph)
+    graph["E"] = [("A", 1.0)]
+    assert build_degree_index(graph) is not index
+    assert build_degree_index(graph).in_degree("A") == 2
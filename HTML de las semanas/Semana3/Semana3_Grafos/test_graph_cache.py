@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la caché binaria - Semana 3
+"""
+
+import os
+
+import pytest
+
+from analyze_graph import load_graph
+from graph_cache import cache_path_for, is_snapshot_fresh, source_stamp, write_snapshot
+
+
+def _write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_snapshot_matches_parsed_graph(tmp_path):
+    file_path = _write(tmp_path / "g.txt", "A B 1.5\nB C 2\nC A 3\n")
+    built = load_graph(file_path, compact=True)
+    cached = load_graph(file_path, cache=True)
+    assert os.path.exists(cache_path_for(file_path, True))
+    reopened = load_graph(file_path, cache=True)
+    assert dict(cached) == dict(built) == dict(reopened)
+
+
+def test_snapshot_is_rebuilt_when_file_changes(tmp_path):
+    file_path = _write(tmp_path / "g.txt", "A B 1\n")
+    load_graph(file_path, cache=True)
+    _write(tmp_path / "g.txt", "A B 1\nB C 2\n")
+    assert not is_snapshot_fresh(file_path, cache_path_for(file_path, True))
+    graph = load_graph(file_path, cache=True)
+    assert dict(graph) == {"A": [("B", 1.0)], "B": [("C", 2.0)]}
+
+
+def test_touch_without_content_change_keeps_snapshot(tmp_path):
+    file_path = _write(tmp_path / "g.txt", "A B 1\n")
+    load_graph(file_path, cache=True)
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert is_snapshot_fresh(file_path, cache_path_for(file_path, True))
+
+
+def test_incomplete_parse_is_not_cached(tmp_path):
+    path = tmp_path / "g.txt"
+    path.write_bytes(b"A B 1\nB C 2\n\xff\xfe roto\n")
+    load_graph(str(path), cache=True, mode="silent")
+    assert not os.path.exists(cache_path_for(str(path), True))
+
+
+def test_truncated_snapshot_falls_back_to_parsing(tmp_path, capsys):
+    file_path = _write(tmp_path / "g.txt", "A B 1\nB C 2\nC A 3\n")
+    load_graph(file_path, cache=True)
+    snapshot = cache_path_for(file_path, True)
+    stamp = os.stat(snapshot)
+    for size in (os.path.getsize(snapshot) - 5, 120, 10):
+        with open(snapshot, 'r+b') as f:
+            f.truncate(size)
+        os.utime(snapshot, ns=(stamp.st_atime_ns, stamp.st_mtime_ns))
+        graph = load_graph(file_path, cache=True)
+        assert dict(graph) == {"A": [("B", 1.0)], "B": [("C", 2.0)], "C": [("A", 3.0)]}
+    assert "truncada" in capsys.readouterr().out
+
+
+def test_failed_write_removes_temporary_file(tmp_path, monkeypatch):
+    file_path = _write(tmp_path / "g.txt", "A B 1\n")
+    graph = load_graph(file_path, compact=True)
+    snapshot = cache_path_for(file_path, True)
+
+    def fail(src, dst):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        write_snapshot(graph, snapshot, source_stamp(file_path))
+    assert os.listdir(tmp_path) == ["g.txt"]
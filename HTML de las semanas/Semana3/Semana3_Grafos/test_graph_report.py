@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la escritura de reportes - Semana 3
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from analyze_graph import analyze_graph, load_graph
+from graph_report import TextReportWriter, open_report, page_bounds
+
+
+class CountingStream(io.StringIO):
+    """StringIO que cuenta las llamadas a write."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+@pytest.fixture
+def edges_file(tmp_path):
+    path = tmp_path / "g.txt"
+    path.write_text("".join(f"v{i:02d} v{(i * 3) % 23:02d} {i % 5 + 1}\n" for i in range(23)),
+                    encoding='utf-8')
+    return str(path)
+
+
+def _vertex_records(graph, **options):
+    stream = io.StringIO()
+    analyze_graph(graph, "X", fmt="jsonl", output=stream, **options)
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    return [record["vertex"] for record in records if record["kind"] == "vertex"]
+
+
+def test_page_bounds():
+    assert page_bounds(10, 1, 4) == range(0, 4)
+    assert page_bounds(10, 3, 4) == range(8, 10)
+    assert page_bounds(10, 4, 4) is None
+    assert page_bounds(0, 1, 4) is None
+    for page, page_size in ((0, 4), (1, 0)):
+        with pytest.raises(ValueError):
+            page_bounds(10, page, page_size)
+
+
+@pytest.mark.parametrize("page_size", [1, 5, 23, 50])
+def test_pages_cover_every_vertex_once(edges_file, page_size):
+    graph = load_graph(edges_file, compact=True)
+    everything = _vertex_records(graph, mode="full")
+    assert everything == sorted(graph.keys())
+    pages = -(-len(everything) // page_size)
+    paged = []
+    for page in range(1, pages + 1):
+        chunk = _vertex_records(graph, mode="paged", page=page, page_size=page_size)
+        assert 0 < len(chunk) <= page_size
+        paged += chunk
+    assert paged == everything
+    assert _vertex_records(graph, mode="paged", page=pages + 1, page_size=page_size) == []
+
+
+def test_out_of_range_page_is_reported_in_text(edges_file):
+    stream = io.StringIO()
+    analyze_graph(load_graph(edges_file), "X", mode="paged", page=9, page_size=10, output=stream)
+    text = stream.getvalue()
+    assert "página 9 de 3" in text
+    assert "(sin vértices en esta página)" in text
+
+
+def test_lines_are_written_in_blocks():
+    stream = CountingStream()
+    report = TextReportWriter(stream, buffer_lines=3)
+    for i in range(7):
+        report.text(f"línea {i}")
+    assert stream.writes == 2
+    assert stream.getvalue() == "".join(f"línea {i}\n" for i in range(6))
+    report.close()
+    assert stream.writes == 3
+    assert stream.getvalue() == "".join(f"línea {i}\n" for i in range(7))
+    assert not stream.closed  # el stream es del llamador
+
+
+def test_formats_keep_only_their_own_lines(tmp_path):
+    for fmt in ("text", "jsonl", "csv"):
+        path = tmp_path / f"reporte.{fmt}"
+        with open_report(fmt, str(path), buffer_lines=2) as report:
+            report.text("solo texto")
+            report.record("summary", {"vertices": 3, "edges": 2})
+            report.record("vertex", {"vertex": "A", "out_degree": 1, "in_degree": 0,
+                                     "neighbors": [["B", 2.5]]})
+        lines = path.read_text(encoding='utf-8').splitlines()
+        if fmt == "text":
+            assert lines == ["solo texto"]
+        elif fmt == "jsonl":
+            assert [json.loads(line)["kind"] for line in lines] == ["summary", "vertex"]
+        else:
+            rows = list(csv.DictReader(lines))
+            assert [(row["kind"], row["metric"]) for row in rows] == \
+                [("summary", "vertices"), ("summary", "edges"), ("vertex", "")]
+            assert rows[2]["neighbors"] == "B:2.5"
+    with pytest.raises(ValueError):
+        open_report("xml")
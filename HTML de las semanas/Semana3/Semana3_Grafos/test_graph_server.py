@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del servidor de consultas - Semana 3
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from graph_server import GraphEntry, GraphServer, load_state
+
+
+def _edges_file(tmp_path, text="A B 1\nB C 2\nC A 4\n"):
+    path = tmp_path / "g.txt"
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+async def _request(server, method, target, body=b"", length=None):
+    listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        length = len(body) if length is None else length
+        writer.write(f"{method} {target} HTTP/1.1\r\nContent-Length: {length}\r\n"
+                     f"Connection: close\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    finally:
+        listener.close()
+        await listener.wait_closed()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def test_undirected_indices_are_built_at_load(tmp_path):
+    state = load_state(_edges_file(tmp_path), is_directed=False)
+    assert state.graph._reverse is not None
+    assert state.graph._mirrored is not None
+    assert state.engine().graph is state.graph.to_csr()
+
+
+def test_negative_weights_only_fail_path_queries(tmp_path):
+    server = GraphServer([GraphEntry("g", _edges_file(tmp_path, "A B -1\nB C 2\n"), True)])
+
+    async def scenario():
+        await server.load_all()
+        degree = await server.query({"graph": "g", "op": "degree", "vertex": "B"})
+        path = await server.query({"graph": "g", "op": "shortest_path", "from": "A", "to": "C"})
+        return degree, path
+
+    degree, path = asyncio.run(scenario())
+    assert degree == {"ok": True, "result": {"out": 1, "in": 1, "total": 2}}
+    assert not path["ok"] and "negativos" in path["error"]
+
+
+def test_unexpected_error_returns_500(tmp_path, capsys):
+    server = GraphServer([GraphEntry("g", _edges_file(tmp_path), True)])
+
+    async def broken_route(method, target, body):
+        raise RuntimeError("falla interna")
+
+    server._route = broken_route
+    status, payload = asyncio.run(_request(server, "GET", "/graphs"))
+    assert status == 500
+    assert payload["ok"] is False
+    assert "falla interna" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1.5"])
+def test_invalid_content_length_returns_400(tmp_path, length):
+    server = GraphServer([GraphEntry("g", _edges_file(tmp_path), True)])
+    status, payload = asyncio.run(_request(server, "POST", "/query", b"{}", length))
+    assert status == 400
+    assert "Content-Length" in payload["error"]
+
+
+def test_non_finite_weights_are_rejected_at_load(tmp_path):
+    with pytest.raises(ValueError):
+        load_state(_edges_file(tmp_path, "A B nan\nB C 2\n"), is_directed=True)
+
+    server = GraphServer([GraphEntry("g", _edges_file(tmp_path, "A B 1\nB C inf\n"), True)])
+
+    async def scenario():
+        await server.load_all()
+        return await _request(server, "GET", "/query?graph=g&op=total_weight")
+
+    status, payload = asyncio.run(scenario())
+    assert status == 200
+    assert not payload["ok"] and "no está cargado" in payload["error"]
+
+
+def test_unserializable_result_returns_500(tmp_path, capsys):
+    server = GraphServer([GraphEntry("g", _edges_file(tmp_path), True)])
+
+    async def nan_route(method, target, body):
+        return 200, {"ok": True, "result": float("nan")}
+
+    server._route = nan_route
+    status, payload = asyncio.run(_request(server, "GET", "/graphs"))
+    assert status == 500
+    assert payload["ok"] is False
+
+
+def test_info_reports_vertex_count_from_load(tmp_path):
+    state = load_state(_edges_file(tmp_path, "A B 1\nB C 2\nD D 1\n"), is_directed=False)
+    assert state.num_vertices == 4
+    entry = GraphEntry("g", _edges_file(tmp_path), True)
+    asyncio.run(entry.reload(force=True))
+    assert entry.info()["vertices"] == 3
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los sketches - Semana 3
+"""
+
+import math
+import random
+
+import pytest
+
+from analyze_graph import calculate_total_weight, count_edges, load_graph
+from graph_sketch import QuantileSketch, sketch_graph_stats
+
+EDGES = "A B 1\nB C 2\nC C 4\nA B 1\nD A 3\nC A 5\n"
+
+
+def _exact_quantile(values, q):
+    """Interpolación lineal sobre q(n - 1), como np.percentile."""
+    ordered = sorted(values)
+    rank = q * (len(ordered) - 1)
+    lower = math.floor(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+def test_totals_match_analyze_graph(tmp_path, is_directed):
+    path = tmp_path / "g.txt"
+    path.write_text(EDGES, encoding='utf-8')
+    stats = sketch_graph_stats(str(path), is_directed)
+    graph = load_graph(str(path), is_directed)
+    assert stats.num_edges == count_edges(graph, is_directed)
+    assert stats.total_weight == calculate_total_weight(graph, is_directed)
+
+
+@pytest.mark.parametrize("count", [1, 2, 7, 1000])
+def test_quantiles_follow_exact_rank_convention(count):
+    rng = random.Random(count)
+    values = [rng.uniform(0.5, 100.0) for _ in range(count)]
+    sketch = QuantileSketch(error=0.01)
+    for value in values:
+        sketch.add(value)
+    for q in (0.0, 0.25, 0.5, 0.9, 0.99, 1.0):
+        exact = _exact_quantile(values, q)
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+
+
+def test_quantile_interpolates_between_neighbors():
+    sketch = QuantileSketch(error=0.001)
+    for value in (1.0, 3.0):
+        sketch.add(value)
+    assert sketch.quantile(0.5) == pytest.approx(2.0, rel=0.001)
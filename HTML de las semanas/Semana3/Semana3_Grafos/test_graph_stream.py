@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de las estadísticas en streaming - Semana 3
+"""
+
+import io
+import json
+import os
+
+import pytest
+
+from analyze_graph import (analyze_graph, build_degree_index, calculate_total_weight,
+                           find_most_connected_vertex, load_graph)
+from graph_stream import stream_graph_stats
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _report_summary(graph, is_directed):
+    stream = io.StringIO()
+    analyze_graph(graph, "X", is_directed, mode="summary", fmt="jsonl", output=stream)
+    return next(record for record in map(json.loads, stream.getvalue().splitlines())
+                if record["kind"] == "summary")
+
+
+def _degree_summary(values):
+    return min(values), max(values), sum(values) / len(values)
+
+
+@pytest.mark.parametrize("file_name, is_directed", [
+    ("edges_directed.txt", True),
+    ("edges_directed.txt", False),
+    ("edges_undirected.txt", False),
+])
+@pytest.mark.parametrize("max_vertices, fan_in", [(1_000_000, 64), (2, 2), (3, 4)])
+def test_stream_matches_analyze_graph(tmp_path, file_name, is_directed, max_vertices, fan_in):
+    file_path = os.path.join(HERE, file_name)
+    stats = stream_graph_stats(file_path, is_directed, max_vertices_in_memory=max_vertices,
+                               spill_dir=str(tmp_path), merge_fan_in=fan_in)
+    graph = load_graph(file_path, is_directed, single_copy=not is_directed, compact=is_directed)
+    report = _report_summary(graph, is_directed)
+
+    assert stats.num_vertices == report["vertices"]
+    assert stats.num_edges == report["edges"]
+    assert stats.density == pytest.approx(report["density"])
+    assert stats.total_weight == calculate_total_weight(graph, is_directed)
+    assert stats.most_connected == find_most_connected_vertex(graph, is_directed)
+
+    index = build_degree_index(graph)
+    vertices = index.vertices()
+    for summary, degree_of in ((stats.out_degree, index.out_degree),
+                               (stats.in_degree, index.in_degree),
+                               (stats.total_degree, index.total_degree)):
+        expected = _degree_summary([degree_of(vertex) for vertex in vertices])
+        assert (summary.minimum, summary.maximum) == expected[:2]
+        assert summary.mean == pytest.approx(expected[2])
+
+    assert (stats.spilled_runs > 0) == (max_vertices < stats.num_vertices)
+    assert os.listdir(tmp_path) == []
+
+
+def test_detail_file_is_the_same_with_and_without_spilling(tmp_path):
+    file_path = os.path.join(HERE, "edges_directed.txt")
+    in_memory, spilled = tmp_path / "a.tsv", tmp_path / "b.tsv"
+    stream_graph_stats(file_path, detail_path=str(in_memory))
+    stats = stream_graph_stats(file_path, detail_path=str(spilled), max_vertices_in_memory=1,
+                               merge_fan_in=2)
+    assert stats.spilled_runs > 2
+    assert spilled.read_text(encoding='utf-8') == in_memory.read_text(encoding='utf-8')
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de las actualizaciones incrementales - Semana 3
+"""
+
+import os
+import random
+
+import pytest
+
+from analyze_graph import (DegreeIndex, GraphParseError, ParseDiagnostics,
+                           calculate_total_weight, count_edges, find_most_connected_vertex,
+                           load_graph)
+from graph_updates import DynamicGraph
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _write(tmp_path, lines, name="g.txt"):
+    path = tmp_path / name
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize("options", [{}, {"compact": True}, {"single_copy": True}, {"matrix": True}])
+def test_undirected_totals_count_each_edge_once(options):
+    file_path = os.path.join(HERE, "edges_undirected.txt")
+    graph = DynamicGraph(load_graph(file_path, False, **options), False)
+    single = load_graph(file_path, False, single_copy=True)
+    assert graph.num_edges == count_edges(single) == 7
+    assert graph.total_weight == calculate_total_weight(single) == 23.0
+
+
+@pytest.mark.parametrize("options", [{}, {"compact": True}, {"single_copy": True}, {"matrix": True}])
+def test_undirected_self_loops(tmp_path, options):
+    file_path = _write(tmp_path, ["A B 1", "A A 2", "B C 3"])
+    graph = DynamicGraph(load_graph(file_path, False, **options), False)
+    assert graph.num_edges == 3
+    assert graph.total_weight == calculate_total_weight(load_graph(file_path, False), False) == 6.0
+
+    graph.set_weight("A", "A", 5)
+    assert graph.total_weight == 9.0
+    assert sorted(graph["A"]) == [("A", 5), ("A", 5), ("B", 1)]
+    assert graph.remove_edge("A", "A")
+    assert (graph.num_edges, graph.total_weight) == (2, 4.0)
+    assert graph["A"] == [("B", 1)]
+
+
+def _assert_matches_recompute(graph, is_directed):
+    """Compara las estadísticas mantenidas con un recálculo completo sobre una copia."""
+    snapshot = {vertex: list(neighbors) for vertex, neighbors in graph.items()}
+    index = DegreeIndex.from_graph(snapshot)
+    for vertex in index.vertices():
+        assert graph.out_degree(vertex) == index.out_degree(vertex)
+        assert graph.in_degree(vertex) == index.in_degree(vertex)
+    assert graph.num_edges == count_edges(snapshot, is_directed)
+    assert graph.total_weight == pytest.approx(calculate_total_weight(snapshot, is_directed))
+    max_possible_edges = len(snapshot) * (len(snapshot) - 1) // (1 if is_directed else 2)
+    expected_density = graph.num_edges / max_possible_edges if max_possible_edges else 0.0
+    assert graph.density == pytest.approx(expected_density)
+    assert graph.most_connected() == find_most_connected_vertex(snapshot, is_directed)
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+def test_random_updates_match_full_recompute(is_directed):
+    rng = random.Random(17)
+    graph = DynamicGraph({}, is_directed)
+    edges = []
+    for step in range(400):
+        action = rng.random()
+        if action < 0.5 or not edges:
+            edge = (f"v{rng.randrange(15)}", f"v{rng.randrange(15)}")
+            graph.add_edge(*edge, rng.randint(1, 9))
+            edges.append(edge)
+        elif action < 0.8:
+            edge = edges.pop(rng.randrange(len(edges)))
+            assert graph.remove_edge(*edge)
+        else:
+            assert graph.set_weight(*rng.choice(edges), rng.randint(1, 9))
+        if step % 20 == 0:
+            _assert_matches_recompute(graph, is_directed)
+    _assert_matches_recompute(graph, is_directed)
+    assert not graph.remove_edge("v0", "no-existe")
+    assert not graph.set_weight("no-existe", "v0", 1)
+
+
+def _delta_file(tmp_path, bad_lines=0):
+    lines = ["+ A D 4", "- A B", "= B C 7", "- X Y", "= A Z 1", "E F"]
+    lines += [f"rota{i}" for i in range(bad_lines)]
+    return _write(tmp_path, lines, "delta.txt")
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+def test_delta_file_applies_operations(tmp_path, is_directed, capsys):
+    graph = DynamicGraph.from_file(_write(tmp_path, ["A B 1", "B C 2", "C A 3"]), is_directed)
+    applied = graph.apply_delta_file(_delta_file(tmp_path), mode="silent")
+    assert applied == {"added": 2, "removed": 1, "reweighted": 1, "skipped": 2}
+    assert capsys.readouterr().out == ""
+    assert graph.total_weight == 4 + 7 + 3 + 1
+    _assert_matches_recompute(graph, is_directed)
+
+
+def test_delta_file_warnings_are_bounded(tmp_path, capsys):
+    graph = DynamicGraph.from_file(_write(tmp_path, ["A B 1", "B C 2"]))
+    diagnostics = ParseDiagnostics("lenient", max_samples=3)
+    graph.apply_delta_file(_delta_file(tmp_path, bad_lines=10), diagnostics=diagnostics)
+    output = capsys.readouterr().out.splitlines()
+    assert len(output) == 4
+    assert "no existe" in output[0] and "9 avisos más" in output[-1]
+    assert diagnostics.counts["missing_edge"] == 2
+    assert diagnostics.counts["missing_vertices"] == 10
+    assert len(diagnostics.samples) == 3
+
+
+def test_delta_file_strict_mode_raises(tmp_path):
+    graph = DynamicGraph.from_file(_write(tmp_path, ["A B 1", "B C 2"]))
+    with pytest.raises(GraphParseError) as error:
+        graph.apply_delta_file(_delta_file(tmp_path), mode="strict")
+    assert error.value.line_num == 4
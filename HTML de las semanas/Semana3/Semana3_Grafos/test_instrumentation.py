@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la instrumentación por fases - Semana 3
+"""
+
+import json
+import time
+
+import pytest
+
+from analyze_graph import analyze_graph, load_graph
+from instrumentation import Instrumentation, count, phase, timed_phase
+
+
+@pytest.fixture
+def edges_file(tmp_path):
+    path = tmp_path / "g.txt"
+    path.write_text("A B 1\nB C 2\nrota\nC A 3\n", encoding='utf-8')
+    return str(path)
+
+
+@timed_phase("recursiva")
+def _recursive(depth):
+    with phase("paso"):
+        time.sleep(0.001)
+    return _recursive(depth - 1) if depth else 0
+
+
+def test_phases_nest_and_record_time():
+    events = []
+    with Instrumentation(callback=lambda *event: events.append(event)) as metrics:
+        with phase("externa"):
+            time.sleep(0.02)
+            for _ in range(3):
+                with phase("interna"):
+                    time.sleep(0.005)
+        count("filas", 2)
+        count("filas")
+
+    assert list(metrics.phases) == ["externa", "externa/interna"]
+    outer, inner = metrics.phases["externa"], metrics.phases["externa/interna"]
+    assert (outer.calls, inner.calls) == (1, 3)
+    assert inner.seconds >= 0.015 and outer.seconds >= inner.seconds + 0.02
+    assert outer.peak_bytes is None  # sin trace_memory
+    assert metrics.counters == {"filas": 3}
+    # El callback recibe cada cierre, primero las fases internas
+    assert [name for name, _, _ in events] == ["externa/interna"] * 3 + ["externa"]
+    assert json.loads(json.dumps(metrics.summary()))["counters"] == {"filas": 3}
+
+
+def test_memory_peaks_are_relative_to_the_phase():
+    with Instrumentation(trace_memory=True) as metrics:
+        with phase("externa"):
+            with phase("reserva"):
+                block = bytearray(4 * 2**20)
+                del block
+            small = bytearray(1024)
+    assert metrics.phases["externa/reserva"].peak_bytes >= 4 * 2**20
+    # El pico de la fase interna también cuenta para la externa
+    assert metrics.phases["externa"].peak_bytes >= metrics.phases["externa/reserva"].peak_bytes
+    assert small
+
+
+def test_recursive_calls_keep_one_phase():
+    with Instrumentation() as metrics:
+        _recursive(2)
+    assert list(metrics.phases) == ["recursiva", "recursiva/paso"]
+    assert metrics.phases["recursiva"].calls == 1
+    assert metrics.phases["recursiva/paso"].calls == 3
+
+
+@pytest.mark.parametrize("options, inner", [
+    ({}, ["parse", "build"]),
+    ({"single_copy": True}, ["parse", "build"]),
+    ({"matrix": True}, ["parse", "build", "matrix"]),
+    ({"cache": True}, ["cache", "cache/parse", "cache/build"]),
+])
+def test_load_graph_phase_names(edges_file, capsys, options, inner):
+    with Instrumentation() as metrics:
+        load_graph(edges_file, False, **options)
+    assert list(metrics.phases) == ["load_graph"] + [f"load_graph/{name}" for name in inner]
+    assert metrics.phases["load_graph"].calls == 1
+    assert metrics.counters["lines_parsed"] == 4
+
+    metrics.print_summary()
+    assert "load_graph/load_graph" not in capsys.readouterr().out
+
+
+def test_analysis_phases_and_inactive_hooks(edges_file):
+    graph = load_graph(edges_file, compact=True, mode="silent")
+    # Sin instrumentación activa las funciones no miden nada
+    with phase("suelta"):
+        count("nada")
+    with Instrumentation() as metrics, open(edges_file + ".out", 'w', encoding='utf-8') as out:
+        analyze_graph(graph, "X", output=out)
+    assert {"analyze_graph", "analyze_graph/degrees", "analyze_graph/structure",
+            "analyze_graph/vertices"} <= set(metrics.phases)
+    assert metrics.counters["vertices_reported"] == 3
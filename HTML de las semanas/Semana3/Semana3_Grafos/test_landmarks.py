@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los landmarks (ALT) - Semana 3
+"""
+
+import os
+import random
+
+import pytest
+
+from analyze_graph import load_graph
+from landmarks import LandmarkIndex, landmark_path_for
+from shortest_paths import DijkstraEngine
+
+
+@pytest.fixture
+def edges_file(tmp_path):
+    rng = random.Random(21)
+    lines = [f"v{rng.randrange(40)} v{rng.randrange(40)} {rng.randint(1, 9)}" for _ in range(120)]
+    lines += ["x y 2", "y z 3"]  # otra componente
+    path = tmp_path / "g.txt"
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+def test_alt_matches_dijkstra(edges_file, is_directed):
+    graph = load_graph(edges_file, is_directed, compact=True)
+    index = LandmarkIndex.build(graph, num_landmarks=4, is_directed=is_directed)
+    engine = DijkstraEngine(graph)
+    labels = list(graph.labels)
+    for i in range(60):
+        source, target = labels[i % len(labels)], labels[(i * 7 + 3) % len(labels)]
+        distance, path = index.shortest_path(source, target)
+        assert distance == engine.shortest_path(source, target)[0]
+        if path:
+            assert path[0] == source and path[-1] == target
+
+
+def test_lower_bounds_never_overestimate(edges_file):
+    graph = load_graph(edges_file, compact=True)
+    index = LandmarkIndex.build(graph, num_landmarks=4)
+    engine = DijkstraEngine(graph)
+    for source in range(0, graph.num_vertices, 5):
+        tree = engine.single_source(graph.labels[source])
+        for target in range(graph.num_vertices):
+            assert index.lower_bound(source, target) <= tree.distance(graph.labels[target])
+
+
+def test_saved_tables_are_reused_until_file_changes(edges_file):
+    graph = load_graph(edges_file, compact=True)
+    built = LandmarkIndex.load_or_build(edges_file, graph, num_landmarks=3)
+    path = landmark_path_for(edges_file, True)
+    assert os.path.exists(path)
+    reopened = LandmarkIndex.load_or_build(edges_file, graph, num_landmarks=3)
+    assert reopened.landmarks == built.landmarks
+    assert [list(table) for table in reopened.from_tables] == \
+        [list(table) for table in built.from_tables]
+
+    with open(edges_file, 'a', encoding='utf-8') as f:
+        f.write("z v0 1\n")
+    changed = load_graph(edges_file, compact=True)
+    rebuilt = LandmarkIndex.load_or_build(edges_file, changed, num_landmarks=3)
+    assert rebuilt.shortest_path("x", "v0")[0] == DijkstraEngine(changed).shortest_path("x", "v0")[0]
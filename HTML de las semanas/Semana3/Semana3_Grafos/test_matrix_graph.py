@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la matriz de adyacencia de bits - Semana 3
+"""
+
+import os
+
+import pytest
+
+from analyze_graph import calculate_total_weight, count_edges, load_graph
+from csr_graph import CSRGraph
+from matrix_graph import MatrixGraph, csr_nbytes
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _complete_graph(tmp_path, num_vertices, weighted):
+    lines = [f"V{u} V{v} {(u + v) % 5 + 1 if weighted else 1}"
+             for u in range(num_vertices) for v in range(num_vertices) if u != v]
+    path = tmp_path / "complete.txt"
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+def test_auto_keeps_parallel_edges(is_directed):
+    file_path = os.path.join(HERE, "edges_directed.txt")
+    graph = load_graph(file_path, is_directed, matrix="auto")
+    assert isinstance(graph, CSRGraph)
+    assert count_edges(graph, is_directed) == 19
+    assert calculate_total_weight(graph, is_directed) == 61.0
+
+
+def test_forced_matrix_reports_merged_edges():
+    graph = load_graph(os.path.join(HERE, "edges_directed.txt"), matrix=True)
+    assert isinstance(graph, MatrixGraph)
+    assert graph.merged_edges == 1
+    assert count_edges(graph) == 18
+
+
+@pytest.mark.parametrize("weighted", [True, False])
+def test_auto_picks_matrix_when_smaller(tmp_path, weighted):
+    file_path = _complete_graph(tmp_path, 20, weighted)
+    csr = load_graph(file_path, compact=True)
+    graph = load_graph(file_path, matrix="auto")
+    assert isinstance(graph, MatrixGraph)
+    assert graph.nbytes <= csr_nbytes(csr)
+    assert dict(graph) == dict(csr)
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+def test_self_loop_is_not_a_merged_edge(tmp_path, is_directed):
+    path = tmp_path / "loop.txt"
+    path.write_text("A B 1\nA A 2\nB C 3\n", encoding='utf-8')
+    graph = load_graph(str(path), is_directed, matrix=True)
+    assert graph.merged_edges == 0
+    assert graph.weight("A", "A") == 2
+    assert count_edges(graph, is_directed) == 3
+    assert calculate_total_weight(graph, is_directed) == 6.0
+
+
+def test_auto_picks_matrix_for_undirected_graph_with_loop(tmp_path):
+    path = tmp_path / "loop.txt"
+    path.write_text("".join(f"V{u} V{v} 1\n" for u in range(20) for v in range(u + 1, 20))
+                    + "V0 V0 1\n", encoding='utf-8')
+    graph = load_graph(str(path), False, matrix="auto")
+    assert isinstance(graph, MatrixGraph)
+    assert graph.merged_edges == 0
+
+
+def test_auto_keeps_csr_for_sparse_weighted_graph(tmp_path):
+    path = tmp_path / "sparse.txt"
+    path.write_text("".join(f"V{i} V{i + 1} 2.5\n" for i in range(50)), encoding='utf-8')
+    assert isinstance(load_graph(str(path), matrix="auto"), CSRGraph)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del backend vectorizado - Semana 3
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from analyze_graph import calculate_total_weight, count_edges, load_graph
+from numpy_backend import vectorized_report
+
+EDGES = "A B 1\nB C 2\nC C 4\nD A 3\nC A 5\nE E 2\n"
+
+
+@pytest.fixture
+def edges_file(tmp_path):
+    path = tmp_path / "g.txt"
+    path.write_text(EDGES, encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+@pytest.mark.parametrize("options", [{}, {"compact": True}, {"single_copy": True}, {"matrix": True}])
+def test_report_matches_analyze_graph(edges_file, is_directed, options):
+    if is_directed and "single_copy" in options:
+        pytest.skip("single_copy es solo para grafos no dirigidos")
+    graph = load_graph(edges_file, is_directed, **options)
+    report = vectorized_report(graph, is_directed=is_directed)
+    reference = load_graph(edges_file, is_directed)
+    assert report["edges"] == count_edges(reference, is_directed)
+    assert report["total_weight"] == calculate_total_weight(reference, is_directed)
+    assert report == vectorized_report(reference, is_directed=is_directed)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del cargador paralelo - Semana 3
+"""
+
+import pytest
+
+from analyze_graph import GraphParseError, ParseDiagnostics, load_graph
+from parallel_load import load_graph_parallel
+
+
+def _sample_file(tmp_path):
+    lines = []
+    for i in range(400):
+        lines.append(f"V{i % 37} V{(i * 7) % 53} {i % 9 + 1}")
+        if i % 50 == 10:
+            lines.append("rota")
+        if i % 90 == 45:
+            lines.append(f"V{i % 37} V1 peso")
+        if i % 60 == 20:
+            lines.append(f"V{i % 37} V{i % 37} 1")
+    lines.append("V0 V7 1")  # duplicada de una arista de otro bloque
+    path = tmp_path / "g.txt"
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+@pytest.mark.parametrize("compact", [True, False])
+def test_parallel_matches_serial(tmp_path, is_directed, compact):
+    file_path = _sample_file(tmp_path)
+    serial = load_graph(file_path, is_directed, compact=compact, mode="silent")
+    parallel = load_graph_parallel(file_path, is_directed, compact=compact, workers=3,
+                                   min_parallel_bytes=0, mode="silent")
+    assert dict(parallel) == dict(serial)
+    if compact:
+        assert list(parallel.labels) == list(serial.labels)
+
+
+def test_parallel_diagnostics_match_serial(tmp_path, capsys):
+    file_path = _sample_file(tmp_path)
+    serial = ParseDiagnostics("lenient", max_samples=3, track_edges=True)
+    load_graph(file_path, compact=True, diagnostics=serial)
+    serial_output = capsys.readouterr().out
+    parallel = ParseDiagnostics("lenient", max_samples=3, track_edges=True)
+    load_graph_parallel(file_path, compact=True, workers=3, min_parallel_bytes=0,
+                        diagnostics=parallel)
+    assert capsys.readouterr().out == serial_output
+    assert parallel.counts == serial.counts
+    assert parallel.samples == serial.samples
+    assert parallel.lines_read == serial.lines_read
+
+
+def test_parallel_samples_keep_line_order(tmp_path):
+    file_path = _sample_file(tmp_path)
+    serial = ParseDiagnostics("silent", max_samples=200, track_edges=True)
+    load_graph(file_path, compact=True, diagnostics=serial)
+    parallel = ParseDiagnostics("silent", max_samples=200, track_edges=True)
+    load_graph_parallel(file_path, compact=True, workers=3, min_parallel_bytes=0,
+                        diagnostics=parallel)
+    assert parallel.samples == serial.samples
+    assert [line for line, _, _ in parallel.samples] == \
+        sorted(line for line, _, _ in parallel.samples)
+
+
+def test_parallel_strict_reports_global_line(tmp_path):
+    file_path = _sample_file(tmp_path)
+    with pytest.raises(GraphParseError) as serial:
+        load_graph(file_path, mode="strict")
+    with pytest.raises(GraphParseError) as parallel:
+        load_graph_parallel(file_path, workers=3, min_parallel_bytes=0, mode="strict")
+    assert parallel.value.line_num == serial.value.line_num
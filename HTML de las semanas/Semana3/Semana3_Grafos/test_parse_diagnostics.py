@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los diagnósticos del parser - Semana 3
+"""
+
+import pytest
+
+from analyze_graph import (BAD_WEIGHT, DUPLICATE, MISSING_EDGE, MISSING_VERTICES, SELF_LOOP,
+                           GraphParseError, ParseDiagnostics, load_graph_with_diagnostics)
+
+# 12 líneas: 4 sin destino, 3 con peso inválido, un lazo, una duplicada y un comentario
+LINES = ["A B 1", "solo", "B C x", "# comentario", "C C 2", "uno", "A B 3",
+         "dos", "D E ?", "tres", "E F peso", "cuatro y"]
+MISSING = [2, 6, 8, 10]
+BAD = [3, 9, 11]
+
+
+@pytest.fixture
+def edges_file(tmp_path):
+    path = tmp_path / "g.txt"
+    path.write_text("\n".join(LINES) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def _problem_lines(samples):
+    return [line_num for line_num, _, _ in samples]
+
+
+@pytest.mark.parametrize("options", [{}, {"compact": True}])
+def test_strict_stops_at_first_malformed_line(edges_file, options):
+    with pytest.raises(GraphParseError) as error:
+        load_graph_with_diagnostics(edges_file, mode="strict", **options)
+    assert (error.value.line_num, error.value.category, error.value.line) == \
+        (2, MISSING_VERTICES, "solo")
+
+
+@pytest.mark.parametrize("is_directed, options", [(True, {}), (True, {"compact": True}),
+                                                 (False, {"single_copy": True})])
+def test_lenient_prints_up_to_the_limit(edges_file, capsys, is_directed, options):
+    _, diagnostics = load_graph_with_diagnostics(edges_file, is_directed, mode="lenient",
+                                                 max_samples=3, **options)
+    out = capsys.readouterr().out.splitlines()
+    warnings = [line for line in out if line.startswith("⚠️  Línea")]
+    assert [int(line.split()[2].rstrip(":")) for line in warnings] == [2, 3, 6]
+    assert out[-1] == "⚠️  ... 4 avisos más no mostrados (7 líneas con problemas en total)"
+
+    # Los contadores no se cortan en el límite; la muestra sí
+    assert diagnostics.counts[MISSING_VERTICES] == len(MISSING)
+    assert diagnostics.counts[BAD_WEIGHT] == len(BAD)
+    assert diagnostics.malformed_lines == 7
+    assert _problem_lines(diagnostics.samples) == [2, 3, 6]
+    assert diagnostics.lines_read == len(LINES)
+    assert diagnostics.edges_parsed == 7
+
+
+def test_silent_counts_without_printing(edges_file, capsys):
+    _, diagnostics = load_graph_with_diagnostics(edges_file, mode="silent", max_samples=50,
+                                                 track_edges=True)
+    assert capsys.readouterr().out == ""
+    assert diagnostics.counts == {MISSING_VERTICES: 4, BAD_WEIGHT: 3, DUPLICATE: 1, SELF_LOOP: 1,
+                                  MISSING_EDGE: 0}
+    assert sorted(_problem_lines(diagnostics.samples)) == sorted(MISSING + BAD + [5, 7])
+    summary = diagnostics.summary()
+    assert summary["mode"] == "silent" and summary["counts"][DUPLICATE] == 1
+
+
+def test_zero_limit_and_invalid_mode(edges_file, capsys):
+    _, diagnostics = load_graph_with_diagnostics(edges_file, max_samples=0)
+    out = capsys.readouterr().out.splitlines()
+    assert out == ["⚠️  ... 7 avisos más no mostrados (7 líneas con problemas en total)"]
+    assert diagnostics.samples == [] and diagnostics.malformed_lines == 7
+    with pytest.raises(ValueError):
+        ParseDiagnostics("ruidoso")
+
+
+def test_merge_shifts_lines_and_keeps_the_cap(capsys):
+    total = ParseDiagnostics("lenient", max_samples=2)
+    for offset in (0, 100):
+        block = ParseDiagnostics("silent", max_samples=2)
+        block.lines_read = 10
+        for line_num in (1, 4):
+            block.report_problem(MISSING_VERTICES, line_num, "x")
+        total.merge(block, offset, block.samples)
+    total.finish()
+    assert total.counts[MISSING_VERTICES] == 4 and total.lines_read == 20
+    assert _problem_lines(total.samples) == [1, 4]
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == 3 and "2 avisos más" in out[-1]
+
+    strict = ParseDiagnostics("strict")
+    with pytest.raises(GraphParseError) as error:
+        strict.merge(block, 100, block.samples)
+    assert error.value.line_num == 101
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del análisis con memoria compartida - Semana 3
+"""
+
+import random
+
+import pytest
+
+from analyze_graph import DEGREE_CRITERIA, build_degree_index, load_graph, top_k_vertices
+from shared_graph import SharedAnalytics
+
+
+@pytest.fixture(scope="module")
+def edges_file(tmp_path_factory):
+    rng = random.Random(7)
+    lines = [f"V{rng.randrange(60)} V{rng.randrange(60)} {rng.randint(1, 9)}" for _ in range(400)]
+    path = tmp_path_factory.mktemp("shared") / "g.txt"
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def test_directed_stats_match_degree_index(edges_file):
+    graph = load_graph(edges_file, compact=True)
+    index = build_degree_index(graph)
+    with SharedAnalytics(graph, workers=3) as analytics:
+        stats = analytics.vertex_stats()
+        rankings = {criterion: analytics.top_k(8, criterion) for criterion in DEGREE_CRITERIA}
+    for vid, label in enumerate(stats.labels):
+        assert stats.out_degrees[vid] == index.out_degree(label)
+        assert stats.in_degrees[vid] == index.in_degree(label)
+    for criterion, ranking in rankings.items():
+        assert ranking == top_k_vertices(graph, 8, criterion)
+
+
+def test_undirected_stats_match_single_copy(edges_file):
+    single = load_graph(edges_file, False, single_copy=True)
+    with SharedAnalytics(load_graph(edges_file, False, compact=True), workers=2) as analytics:
+        stats = analytics.vertex_stats()
+        rankings = {criterion: analytics.top_k(8, criterion) for criterion in ("total", "weighted")}
+    assert stats.in_degrees == stats.out_degrees
+    assert stats.degree_index().num_edges == single.num_edges
+    for criterion, ranking in rankings.items():
+        assert ranking == top_k_vertices(single, 8, criterion)
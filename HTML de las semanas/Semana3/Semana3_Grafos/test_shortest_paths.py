@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de Dijkstra - Semana 3
+"""
+
+import random
+
+import pytest
+
+from analyze_graph import load_graph
+from shortest_paths import INFINITY, DijkstraEngine, dijkstra
+
+
+@pytest.fixture(scope="module")
+def edges_file(tmp_path_factory):
+    rng = random.Random(11)
+    lines = [f"v{rng.randrange(30)} v{rng.randrange(30)} {rng.randint(1, 20) / 2}" for _ in range(90)]
+    lines.append("aislado solo 1")
+    path = tmp_path_factory.mktemp("paths") / "g.txt"
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def _bellman_ford(graph, source):
+    """Distancias de referencia relajando todas las aristas V - 1 veces."""
+    dist = {vertex: INFINITY for vertex in graph.labels}
+    dist[source] = 0.0
+    edges = [(u, v, w) for u in graph for v, w in graph[u]]
+    for _ in range(len(dist) - 1):
+        for u, v, w in edges:
+            if dist[u] + w < dist[v]:
+                dist[v] = dist[u] + w
+    return dist
+
+
+def _path_length(graph, path):
+    return sum(min(w for neighbor, w in graph[u] if neighbor == v) for u, v in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+def test_single_source_matches_bellman_ford(edges_file, is_directed):
+    graph = load_graph(edges_file, is_directed, compact=True)
+    engine = DijkstraEngine(graph)
+    for source in list(graph.labels)[:8]:
+        tree = engine.single_source(source)
+        assert tree.distances() == {vertex: d for vertex, d in _bellman_ford(graph, source).items()
+                                    if d < INFINITY}
+
+
+@pytest.mark.parametrize("is_directed", [True, False])
+def test_paths_are_valid_and_batches_agree(edges_file, is_directed):
+    graph = load_graph(edges_file, is_directed, compact=True)
+    engine = DijkstraEngine(graph)
+    labels = list(graph.labels)
+    pairs = [(labels[i % 7], labels[(i * 5) % len(labels)]) for i in range(40)]
+    batch = engine.batch_shortest_paths(pairs)
+    for (source, target), (distance, path) in zip(pairs, batch):
+        assert engine.shortest_path(source, target) == (distance, path)
+        if distance == INFINITY:
+            assert path == []
+        else:
+            assert path[0] == source and path[-1] == target
+            assert _path_length(graph, path) == pytest.approx(distance)
+
+
+def test_unreachable_target_and_dict_input(edges_file):
+    graph = load_graph(edges_file)
+    assert dijkstra(graph, "v0", "aislado") == (INFINITY, [])
+    assert dijkstra(graph, "aislado", "solo") == (1.0, ["aislado", "solo"])
+    with pytest.raises(KeyError):
+        dijkstra(graph, "v0", "no-existe")
+
+
+def test_negative_weights_are_rejected(tmp_path):
+    path = tmp_path / "neg.txt"
+    path.write_text("A B 1\nB C -2\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        DijkstraEngine(load_graph(str(path), compact=True))
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de las vistas de subgrafos - Semana 3
+"""
+
+import random
+
+import pytest
+
+from analyze_graph import count_edges, load_graph
+from subgraph_views import SubgraphView, ego_network, induced_subgraph, k_hop_vertices, weight_filter
+
+STORAGES = [(True, {}), (True, {"compact": True}),
+            (False, {}), (False, {"compact": True}), (False, {"single_copy": True})]
+
+
+@pytest.fixture(scope="module")
+def edges_file(tmp_path_factory):
+    rng = random.Random(17)
+    lines = [f"v{rng.randrange(30)} v{rng.randrange(30)} {rng.randint(1, 9)}" for _ in range(70)]
+    lines += ["x y 2", "y x 5"]  # otra componente
+    path = tmp_path_factory.mktemp("views") / "g.txt"
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def _as_dict(graph):
+    return {vertex: sorted(graph[vertex]) for vertex in graph}
+
+
+def _expected(graph, keep):
+    """Lista de adyacencia filtrada a mano, sin los vértices que se quedan sin aristas."""
+    result = {}
+    for vertex in graph:
+        neighbors = sorted((v, w) for v, w in graph[vertex] if keep(vertex, v, w))
+        if neighbors:
+            result[vertex] = neighbors
+    return result
+
+
+def _hops(graph, source):
+    """Distancia en saltos desde source por BFS directo."""
+    distance, frontier = {source: 0}, [source]
+    while frontier:
+        next_frontier = []
+        for vertex in frontier:
+            for neighbor, _ in graph.get(vertex, ()):
+                if neighbor not in distance:
+                    distance[neighbor] = distance[vertex] + 1
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return distance
+
+
+@pytest.mark.parametrize("is_directed, options", STORAGES)
+@pytest.mark.parametrize("k", [0, 1, 2])
+def test_k_hop_and_ego_network(edges_file, is_directed, options, k):
+    graph = load_graph(edges_file, is_directed, **options)
+    source = next(iter(graph))
+    hops = _hops(graph, source)
+    region = k_hop_vertices(graph, source, k)
+    assert region[0] == source
+    assert set(region) == {vertex for vertex, d in hops.items() if d <= k}
+    assert [hops[vertex] for vertex in region] == sorted(hops[vertex] for vertex in region)
+
+    view = ego_network(graph, source, k)
+    inside = set(region)
+    assert _as_dict(view) == _expected(graph, lambda u, v, w: u in inside and v in inside)
+
+
+@pytest.mark.parametrize("is_directed, options", STORAGES)
+def test_induced_and_weight_filter(edges_file, is_directed, options):
+    graph = load_graph(edges_file, is_directed, **options)
+    chosen = {f"v{i}" for i in range(0, 30, 2)} | {"x", "no-existe"}
+    induced = induced_subgraph(graph, chosen)
+    assert _as_dict(induced) == _expected(graph, lambda u, v, w: u in chosen and v in chosen)
+
+    heavy = weight_filter(graph, min_weight=3, max_weight=7)
+    assert _as_dict(heavy) == _expected(graph, lambda u, v, w: 3 <= w <= 7)
+
+    # Las vistas se encadenan
+    both = weight_filter(induced, min_weight=3, max_weight=7)
+    assert _as_dict(both) == _expected(graph, lambda u, v, w: u in chosen and v in chosen
+                                       and 3 <= w <= 7)
+    assert count_edges(both, is_directed) == count_edges(
+        {vertex: list(neighbors) for vertex, neighbors in _as_dict(both).items()}, is_directed)
+
+
+def test_keys_len_bool_and_missing_vertices(edges_file):
+    graph = load_graph(edges_file, compact=True)
+    view = SubgraphView(graph, ["x", "y", "v0", "no-existe"], min_weight=3)
+    assert "no-existe" not in view and "x" not in view
+    with pytest.raises(KeyError):
+        view["x"]  # solo tiene una arista de peso 2
+    with pytest.raises(KeyError):
+        view["no-existe"]
+    assert view["y"] == [("x", 5.0)]
+    assert bool(view)
+
+    keys = list(view)
+    assert len(view) == len(keys) and "y" in keys
+    assert all(vertex in view for vertex in keys)
+    assert view.get("x") is None
+
+    assert not weight_filter(graph, min_weight=100)
+    assert len(weight_filter(graph, min_weight=100)) == 0
+    assert len(weight_filter(graph)) == len(graph)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los recorridos BFS y DFS - Semana 3
+"""
+
+import random
+from collections import deque
+
+import pytest
+
+from analyze_graph import load_graph
+from traversal import (Traversal, bfs, bfs_levels, dfs, hop_distances, is_reachable,
+                       iter_frontiers)
+
+
+@pytest.fixture(scope="module")
+def edges_file(tmp_path_factory):
+    rng = random.Random(13)
+    lines = [f"v{rng.randrange(30)} v{rng.randrange(30)} 1" for _ in range(60)]
+    lines += ["x y 1", "y z 1"]  # otra componente
+    path = tmp_path_factory.mktemp("traversal") / "g.txt"
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def _reference_bfs(adjacency, source, max_depth=None):
+    depth = {source: 0}
+    order, queue = [source], deque([source])
+    while queue:
+        u = queue.popleft()
+        if max_depth is not None and depth[u] >= max_depth:
+            continue
+        for v, _ in adjacency.get(u, ()):
+            if v not in depth:
+                depth[v] = depth[u] + 1
+                order.append(v)
+                queue.append(v)
+    return order, depth
+
+
+def _reference_dfs(adjacency, vertex, seen=None):
+    seen = [] if seen is None else seen
+    seen.append(vertex)
+    for neighbor, _ in adjacency.get(vertex, ()):
+        if neighbor not in seen:
+            _reference_dfs(adjacency, neighbor, seen)
+    return seen
+
+
+@pytest.mark.parametrize("is_directed, options", [
+    (True, {}), (True, {"compact": True}),
+    (False, {}), (False, {"compact": True}), (False, {"single_copy": True}),
+])
+def test_orders_match_reference(edges_file, is_directed, options):
+    graph = load_graph(edges_file, is_directed, **options)
+    adjacency = dict(graph.items())
+    traversal = Traversal(graph, is_directed)
+    for source in ("v0", "v7", "x"):
+        order, depth = _reference_bfs(adjacency, source)
+        assert traversal.bfs(source) == bfs(graph, source) == order
+        assert traversal.hop_distances(source) == depth
+        assert traversal.dfs(source) == dfs(graph, source) == _reference_dfs(adjacency, source)
+
+
+@pytest.mark.parametrize("max_depth", [0, 1, 2])
+def test_depth_limit(edges_file, max_depth):
+    graph = load_graph(edges_file)
+    order, depth = _reference_bfs(graph, "v0", max_depth)
+    assert bfs(graph, "v0", max_depth) == order
+    assert hop_distances(graph, "v0", max_depth) == depth
+    levels = bfs_levels(graph, "v0", max_depth)
+    assert len(levels) <= max_depth + 1
+    assert [vertex for level in levels for vertex in level] == order
+
+
+def test_reachability(edges_file):
+    graph = load_graph(edges_file)
+    traversal = Traversal(graph)
+    reachable = set(_reference_bfs(graph, "v0")[0])
+    for vertex in ("v1", "v5", "v12", "v29", "x", "z"):
+        assert traversal.is_reachable("v0", vertex) == (vertex in reachable)
+        assert is_reachable(graph, "v0", vertex) == (vertex in reachable)
+    assert traversal.is_reachable("x", "z") and not traversal.is_reachable("z", "x")
+    assert not traversal.is_reachable("v0", "no-existe")
+
+
+def test_dict_is_converted_once(edges_file):
+    traversal = Traversal(load_graph(edges_file))
+    converted = traversal.graph
+    traversal.bfs("v0")
+    traversal.is_reachable("v0", "x")
+    assert traversal.graph is converted
+    compact = load_graph(edges_file, compact=True)
+    assert Traversal(compact).graph is compact
+
+
+def test_unknown_source_raises(edges_file):
+    graph = load_graph(edges_file)
+    with pytest.raises(KeyError):
+        bfs(graph, "no-existe")
+    with pytest.raises(KeyError):
+        list(iter_frontiers(graph, ["v0", "no-existe"]))
+    with pytest.raises(KeyError):
+        dfs(graph, "no-existe")
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Recorridos BFS y DFS - Semana 3
+Versiones iterativas sobre ids internados, sin límite de recursión
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from analyze_graph import Graph
+from csr_graph import CSRGraph, as_csr
+
+
+def _source_ids(graph: CSRGraph, sources: Iterable[str]) -> List[int]:
+    ids = []
+    for vertex in sources:
+        vid = graph.vertex_id(vertex)
+        if vid < 0:
+            raise KeyError(f"El vértice '{vertex}' no existe en el grafo")
+        ids.append(vid)
+    return ids
+
+
+def _frontiers(graph: CSRGraph, sources: Iterable[int],
+               max_depth: Optional[int] = None) -> Iterator[Tuple[int, array]]:
+    """BFS por niveles sobre ids de un CSRGraph ya convertido."""
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(graph.num_vertices)
+
+    frontier = array('i')
+    for vid in sources:
+        if not visited[vid]:
+            visited[vid] = 1
+            frontier.append(vid)
+
+    depth = 0
+    while frontier:
+        yield depth, frontier
+        if max_depth is not None and depth >= max_depth:
+            return
+        next_frontier = array('i')
+        for u in frontier:
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if not visited[v]:
+                    visited[v] = 1
+                    next_frontier.append(v)
+        frontier = next_frontier
+        depth += 1
+
+
+class Traversal:
+    """
+    Recorridos repetidos sobre un grafo cargado.
+
+    El grafo se convierte a CSR una sola vez al crear el objeto (un dict
+    cuesta O(V + E); un CSRGraph o UndirectedCSRGraph no se copia), así cada
+    consulta paga solo su propio recorrido. Las funciones del módulo son
+    atajos para una consulta suelta y convierten el grafo en cada llamada.
+    """
+
+    def __init__(self, graph: Graph, is_directed: bool = True):
+        """
+        Args:
+            graph: Dict de adyacencia, CSRGraph o UndirectedCSRGraph
+            is_directed: Solo informativo al convertir un dict
+        """
+        self.graph = as_csr(graph, is_directed)
+
+    def iter_frontiers(self, sources: Iterable[str],
+                       max_depth: Optional[int] = None) -> Iterator[Tuple[int, array]]:
+        """
+        BFS por niveles: produce (profundidad, frontera de ids) nivel a nivel.
+
+        Cada nivel se expande completo antes del siguiente; los visitados se
+        marcan en un bytearray de un byte por vértice.
+        """
+        return _frontiers(self.graph, _source_ids(self.graph, sources), max_depth)
+
+    def iter_bfs(self, source: str,
+                 max_depth: Optional[int] = None) -> Iterator[Tuple[str, int]]:
+        """Recorre en anchura produciendo (vértice, distancia en saltos)."""
+        labels = self.graph.labels
+        for depth, frontier in self.iter_frontiers((source,), max_depth):
+            for vid in frontier:
+                yield labels[vid], depth
+
+    def bfs(self, source: str, max_depth: Optional[int] = None) -> List[str]:
+        """Orden de visita BFS completo como lista."""
+        return [vertex for vertex, _ in self.iter_bfs(source, max_depth)]
+
+    def bfs_levels(self, source: str, max_depth: Optional[int] = None) -> List[List[str]]:
+        """Vértices agrupados por distancia en saltos desde el origen."""
+        labels = self.graph.labels
+        return [[labels[vid] for vid in frontier]
+                for _, frontier in self.iter_frontiers((source,), max_depth)]
+
+    def hop_distances(self, source: str, max_depth: Optional[int] = None) -> Dict[str, int]:
+        """Distancia en saltos a cada vértice alcanzable."""
+        return dict(self.iter_bfs(source, max_depth))
+
+    def is_reachable(self, source: str, target: str) -> bool:
+        """Indica si target es alcanzable desde source (se detiene al encontrarlo)."""
+        target_id = self.graph.vertex_id(target)
+        if target_id < 0:
+            return False
+        return any(target_id in frontier for _, frontier in self.iter_frontiers((source,)))
+
+    def iter_dfs(self, source: str) -> Iterator[str]:
+        """
+        Recorre en profundidad (preorden) sin recursión.
+
+        Visita los vecinos en el mismo orden que un DFS recursivo: la pila
+        guarda (vértice, posición de la siguiente arista por explorar).
+        """
+        graph = self.graph
+        offsets, targets, labels = graph.offsets, graph.targets, graph.labels
+        visited = bytearray(graph.num_vertices)
+
+        start = _source_ids(graph, (source,))[0]
+        visited[start] = 1
+        yield labels[start]
+        stack = [(start, offsets[start])]
+
+        while stack:
+            u, position = stack[-1]
+            end = offsets[u + 1]
+            while position < end and visited[targets[position]]:
+                position += 1
+            if position == end:
+                stack.pop()
+                continue
+            stack[-1] = (u, position + 1)
+            v = targets[position]
+            visited[v] = 1
+            yield labels[v]
+            stack.append((v, offsets[v]))
+
+    def dfs(self, source: str) -> List[str]:
+        """Orden de visita DFS completo como lista."""
+        return list(self.iter_dfs(source))
+
+
+# --- Atajos para una consulta (un dict se convierte en cada llamada) ---
+
+def iter_frontiers(graph: Graph, sources: Iterable[str],
+                   max_depth: Optional[int] = None) -> Iterator[Tuple[int, array]]:
+    """BFS por niveles; ver Traversal.iter_frontiers."""
+    return Traversal(graph).iter_frontiers(sources, max_depth)
+
+
+def iter_bfs(graph: Graph, source: str,
+             max_depth: Optional[int] = None) -> Iterator[Tuple[str, int]]:
+    """Recorre en anchura produciendo (vértice, distancia en saltos)."""
+    return Traversal(graph).iter_bfs(source, max_depth)
+
+
+def bfs(graph: Graph, source: str, max_depth: Optional[int] = None) -> List[str]:
+    """Orden de visita BFS completo como lista."""
+    return Traversal(graph).bfs(source, max_depth)
+
+
+def bfs_levels(graph: Graph, source: str,
+               max_depth: Optional[int] = None) -> List[List[str]]:
+    """Vértices agrupados por distancia en saltos desde el origen."""
+    return Traversal(graph).bfs_levels(source, max_depth)
+
+
+def hop_distances(graph: Graph, source: str,
+                  max_depth: Optional[int] = None) -> Dict[str, int]:
+    """Distancia en saltos a cada vértice alcanzable."""
+    return Traversal(graph).hop_distances(source, max_depth)
+
+
+def is_reachable(graph: Graph, source: str, target: str) -> bool:
+    """Indica si target es alcanzable desde source (se detiene al encontrarlo)."""
+    return Traversal(graph).is_reachable(source, target)
+
+
+def iter_dfs(graph: Graph, source: str) -> Iterator[str]:
+    """Recorre en profundidad (preorden) sin recursión."""
+    return Traversal(graph).iter_dfs(source)
+
+
+def dfs(graph: Graph, source: str) -> List[str]:
+    """Orden de visita DFS completo como lista."""
+    return Traversal(graph).dfs(source)